@@ -0,0 +1,80 @@
+import io
+import itertools
+import threading
+
+import pyarrow.parquet as pq
+from google.api_core.exceptions import NotFound
+
+
+class FakeLoadJob:
+    def __init__(self, job_id: str, output_rows: int):
+        self.job_id = job_id
+        self.output_rows = output_rows
+
+    def result(self):
+        return self
+
+
+class FakeQueryJob:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def result(self):
+        return iter(self._rows)
+
+
+class FakeBigQueryClient:
+    """
+    In-process stand-in for bigquery.Client covering what BigQueryService
+    calls. Loads do the client-side work of the real client (DataFrames are
+    serialized to Parquet, files are read back) and keep row counts only;
+    queries return `query_rows`.
+    """
+
+    def __init__(self, project: str = "bench", query_rows=None):
+        self.project = project
+        self.query_rows = query_rows or []
+        self.rows = {}
+        self.datasets = set()
+        self.tables = set()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def _job(self, destination, rows: int) -> FakeLoadJob:
+        key = f"{destination.dataset_id}.{destination.table_id}"
+        with self._lock:
+            self.tables.add(key)
+            self.rows[key] = self.rows.get(key, 0) + rows
+            return FakeLoadJob(f"bench-job-{next(self._ids)}", rows)
+
+    def load_table_from_dataframe(self, df, destination, job_config=None, location=None):
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False)
+        return self._job(destination, len(df))
+
+    def load_table_from_file(self, file_obj, destination, job_config=None, location=None):
+        return self._job(destination, pq.ParquetFile(file_obj).metadata.num_rows)
+
+    def query(self, query, job_config=None):
+        return FakeQueryJob(self.query_rows)
+
+    def get_dataset(self, ref):
+        if ref.dataset_id not in self.datasets:
+            raise NotFound(ref.dataset_id)
+        return ref
+
+    def create_dataset(self, dataset):
+        self.datasets.add(dataset.dataset_id)
+        return dataset
+
+    def get_table(self, ref):
+        if f"{ref.dataset_id}.{ref.table_id}" not in self.tables:
+            raise NotFound(ref.table_id)
+        return ref
+
+    def create_table(self, table):
+        self.tables.add(f"{table.dataset_id}.{table.table_id}")
+        return table
+
+    def delete_table(self, ref, not_found_ok=False):
+        self.tables.discard(f"{ref.dataset_id}.{ref.table_id}")
@@ -0,0 +1,109 @@
+import json
+import multiprocessing
+import socket
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_UFS = [
+    (11, "RO", "Rondônia", 1, "N", "Norte"),
+    (29, "BA", "Bahia", 2, "NE", "Nordeste"),
+    (35, "SP", "São Paulo", 3, "SE", "Sudeste"),
+    (41, "PR", "Paraná", 4, "S", "Sul"),
+    (53, "DF", "Distrito Federal", 5, "CO", "Centro-Oeste"),
+]
+
+
+def ibge_record(index: int) -> dict:
+    """
+    IBGE-shaped state record (localidades/estados) with a unique id.
+    """
+    _, sigla, nome, regiao_id, regiao_sigla, regiao_nome = _UFS[index % len(_UFS)]
+    return {
+        "id": index,
+        "sigla": sigla,
+        "nome": nome,
+        "regiao": {"id": regiao_id, "sigla": regiao_sigla, "nome": regiao_nome},
+    }
+
+
+def ibge_records(count: int, start: int = 0) -> list:
+    return [ibge_record(i) for i in range(start, start + count)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    total = 0
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", [str(self.total)])[0])
+        ndjson = query.get("format", [""])[0] == "ndjson"
+        if self.latency:
+            time.sleep(self.latency)
+        body = _render(offset, max(0, min(limit, self.total - offset)), ndjson)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson" if ndjson else "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@lru_cache(maxsize=64)
+def _render(offset: int, count: int, ndjson: bool) -> bytes:
+    records = ibge_records(count, start=offset)
+    if ndjson:
+        return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8")
+    return json.dumps(records, ensure_ascii=False).encode("utf-8")
+
+
+def _serve(port: int, total: int, latency: float) -> None:
+    _Handler.total = total
+    _Handler.latency = latency
+    ThreadingHTTPServer(("127.0.0.1", port), _Handler).serve_forever()
+
+
+class FakeSource:
+    """
+    Local HTTP source serving `total` IBGE-shaped records, as a whole JSON
+    array or NDJSON (?format=ndjson), or in offset/limit pages, after
+    `latency` seconds per request. It runs in a separate process so that
+    serving doesn't compete with the code under test for the GIL.
+    """
+
+    def __init__(self, total: int, latency: float = 0.0):
+        self.total = total
+        self.latency = latency
+        self._process = None
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/estados"
+
+    def __enter__(self) -> "FakeSource":
+        self._process = multiprocessing.Process(target=_serve, args=(self.port, self.total, self.latency), daemon=True)
+        self._process.start()
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.2).close()
+                return self
+            except OSError:
+                time.sleep(0.05)
+        self.__exit__()
+        raise RuntimeError("Servidor fake não iniciou")
+
+    def __exit__(self, *exc) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
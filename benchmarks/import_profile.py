@@ -0,0 +1,51 @@
+"""
+Import-time profile of a module, from `python -X importtime` in a fresh
+interpreter (nothing cached in sys.modules):
+
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile src.etl.pipeline --top 30
+
+Prints the total import time and the slowest imports by cumulative time.
+"""
+import argparse
+import subprocess
+import sys
+from typing import List, Tuple
+
+
+def profile_imports(module: str) -> List[Tuple[str, int, int]]:
+    """
+    (module, self_us, cumulative_us) for every import triggered by importing
+    `module`, in import order.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {module}: {proc.stderr.strip().splitlines()[-1]}")
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("module", nargs="?", default="src.cloud_function_handler")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    entries = profile_imports(args.module)
+    total = next((cumulative for name, _, cumulative in entries if name == args.module), 0)
+    print(f"{args.module}: {total / 1000:.1f} ms ({len(entries)} módulos)")
+    for name, self_us, cumulative_us in sorted(entries, key=lambda e: e[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>9.1f} ms  {self_us / 1000:>8.1f} ms  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Offline benchmarks for Extractor, Transformer, Loader and the Pipeline,
+against a local fake HTTP source and an in-process fake BigQuery client
+(no network, no GCP credentials).
+
+    python -m benchmarks.run --sizes 10000,100000,1000000
+    python -m benchmarks.run --scenarios transform_pandas,load_arrow --sizes 10000000
+    python -m benchmarks.run --update-baseline
+
+Transforms are typed against IBGE_STATE_SCHEMA, as config_transformer
+does in production. Each scenario reports rows/sec, wall time, peak RSS
+and the stage metrics of src.core.metrics. Results are compared with
+benchmarks/baseline.json; a scenario slower than the baseline by more
+than --tolerance is a regression, and the command exits with status 1. A
+missing baseline file exits with status 2 (create it with
+--update-baseline).
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from benchmarks.fake_bigquery import FakeBigQueryClient
+from benchmarks.fake_source import FakeSource, ibge_records
+from src.core.metrics import metrics, peak_rss_mb
+from src.etl.extractor import Extractor
+from src.etl.loader import Loader
+from src.etl.pagination import Pagination
+from src.etl.parallel_transform import ParallelTransformer
+from src.etl.pipeline import Pipeline
+from src.etl.transformer import Transformer
+from src.models.schema_definition import IBGE_STATE_SCHEMA
+from src.services.metadata_cache import MetadataCache
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+BATCH_SIZE = 5000
+
+
+def _repeated_batches(size: int) -> Iterator[list]:
+    # one batch reused over and over keeps memory flat even at 10M rows
+    batch = ibge_records(min(size, BATCH_SIZE))
+    for offset in range(0, size, BATCH_SIZE):
+        yield batch[:min(BATCH_SIZE, size - offset)]
+
+
+def _loader() -> Loader:
+    loader = Loader(project_id="bench", client=FakeBigQueryClient())
+    loader.bq.metadata_cache = MetadataCache()
+    return loader
+
+
+def extract_pages(size: int, latency: float) -> Tuple[Callable[[], int], Callable[[], None]]:
+    source = FakeSource(size, latency=latency).__enter__()
+    extractor = Extractor(base_url=source.url, max_workers=4)
+    pagination = Pagination(strategy="offset", page_size=BATCH_SIZE)
+    return (lambda: sum(len(page) for page in extractor.iter_pages(pagination=pagination))), source.__exit__
+
+
+def extract_stream(size: int, latency: float) -> Tuple[Callable[[], int], Callable[[], None]]:
+    source = FakeSource(size, latency=latency).__enter__()
+    extractor = Extractor(base_url=source.url)
+    return (lambda: sum(len(batch) for batch in extractor.stream_batches(batch_size=BATCH_SIZE))), source.__exit__
+
+
+def _transform(output_format: str, parallel: bool = False):
+    def scenario(size: int, latency: float):
+        transformer = Transformer(output_format=output_format, schema=IBGE_STATE_SCHEMA)
+        if parallel:
+            # every available CPU; the pool is started before the clock runs
+            transformer = ParallelTransformer(transformer)
+            transformer.run(ibge_records(BATCH_SIZE))
+        teardown = transformer.close if parallel else None
+        return (lambda: sum(len(transformer.run(batch)) for batch in _repeated_batches(size))), teardown
+    return scenario
+
+
+def _load(output_format: str):
+    def scenario(size: int, latency: float):
+        transformer = Transformer(output_format=output_format, schema=IBGE_STATE_SCHEMA)
+        frame = transformer.run(ibge_records(min(size, BATCH_SIZE)))
+        loader = _loader()
+
+        def run() -> int:
+            rows = 0
+            for offset in range(0, size, BATCH_SIZE):
+                chunk = frame.slice(0, min(BATCH_SIZE, size - offset)) if output_format == "arrow" \
+                    else frame.iloc[:min(BATCH_SIZE, size - offset)]
+                loader.load(df=chunk, dataset_id="bench", table_id="estados", create_dataset=False)
+                rows += len(chunk)
+            return rows
+        return run, None
+    return scenario
+
+
+def pipeline(size: int, latency: float) -> Tuple[Callable[[], int], Callable[[], None]]:
+    source = FakeSource(size, latency=latency).__enter__()
+    extractor = Extractor(base_url=source.url)
+    runner = Pipeline(Transformer(output_format="arrow", schema=IBGE_STATE_SCHEMA), _loader())
+
+    def run() -> int:
+        batches = extractor.stream_batches(batch_size=BATCH_SIZE)
+        return runner.run(batches, dataset_id="bench", table_id="estados")["records"]
+    return run, source.__exit__
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "extract_pages": extract_pages,
+    "extract_stream": extract_stream,
+    "transform_pandas": _transform("pandas"),
+    "transform_arrow": _transform("arrow"),
+    "transform_parallel": _transform("pandas", parallel=True),
+    "load_pandas": _load("pandas"),
+    "load_arrow": _load("arrow"),
+    "pipeline": pipeline,
+}
+
+
+def run_scenario(name: str, size: int, latency: float) -> Dict:
+    run, teardown = SCENARIOS[name](size, latency)
+    try:
+        metrics.reset()
+        started = time.perf_counter()
+        rows = run()
+        wall = time.perf_counter() - started
+    finally:
+        if teardown:
+            teardown()
+    stages = metrics.summary()["stages"]
+    return {
+        "scenario": name,
+        "size": size,
+        "rows": rows,
+        "wall_s": round(wall, 3),
+        "rows_per_s": round(rows / wall, 1) if wall else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": stages,
+    }
+
+
+def compare(results: List[Dict], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    regressions = []
+    for result in results:
+        key = f"{result['scenario']}@{result['size']}"
+        expected = baseline.get(key)
+        result["baseline_rows_per_s"] = expected
+        if expected and result["rows_per_s"] < expected * (1 - tolerance):
+            regressions.append(f"{key}: {result['rows_per_s']:.0f} rows/s < {expected:.0f} (baseline)")
+    return regressions
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000", help="comma-separated record counts")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated scenario names")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake source latency per request (s)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown vs the baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="also write the results as JSON here")
+    parser.add_argument("--verbose", action="store_true", help="keep the pipeline's INFO logs")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        # without it nothing can be flagged as a regression: don't pass silently
+        print(f"baseline ausente: {args.baseline} (gere com --update-baseline)", file=sys.stderr)
+        return 2
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    names = [name.strip() for name in args.scenarios.split(",")]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"cenários desconhecidos: {', '.join(unknown)}")
+
+    results = []
+    for name in names:
+        for size in sizes:
+            result = run_scenario(name, size, args.latency)
+            results.append(result)
+            print(f"{name:<18} {size:>10} rows  {result['wall_s']:>9.3f}s  {result['rows_per_s']:>12.0f} rows/s"
+                  f"  peak RSS {result['peak_rss_mb']} MiB", flush=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+    regressions = compare(results, baseline, args.tolerance)
+    missing = [f"{r['scenario']}@{r['size']}" for r in results if r["baseline_rows_per_s"] is None]
+    if missing and not args.update_baseline:
+        print(f"sem baseline (não comparados): {', '.join(missing)}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    if args.update_baseline:
+        baseline.update({f"{r['scenario']}@{r['size']}": r["rows_per_s"] for r in results})
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(baseline, fh, indent=2, sort_keys=True)
+        print(f"baseline atualizado: {args.baseline}")
+        return 0
+
+    for regression in regressions:
+        print(f"REGRESSÃO {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,146 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
 from flask import jsonify, Request  # flask provided in Cloud Functions runtime
-from src.core.logger import logger
+from src.core.logger import logger, flush_logs
 from src.core.config import Config
-from src.core.exceptions import ExtractError, TransformError, LoadError
+from src.core.exceptions import ConfigError, ExtractError, TransformError, LoadError
+
+# Built on the first request and kept for the life of the instance, so warm
+# invocations reuse the BigQuery client, HTTP pool and caches.
+_COMPONENTS: Optional[Dict[str, Any]] = None
+_COMPONENTS_LOCK = threading.Lock()
+# kept apart from the components: ETL_JOBS runs only need the client
+_BQ_CLIENT = None
+_BQ_CLIENT_LOCK = threading.Lock()
+
+
+def get_bigquery_client():
+    """
+    Process-wide BigQuery client, created once per instance.
+    """
+    global _BQ_CLIENT
+    if _BQ_CLIENT is None:
+        with _BQ_CLIENT_LOCK:
+            if _BQ_CLIENT is None:
+                from google.cloud import bigquery
 
-from src.etl.extractor import Extractor
-from src.etl.transformer import Transformer
-from src.etl.loader import Loader
+                _BQ_CLIENT = bigquery.Client(project=Config.PROJECT_ID)
+    return _BQ_CLIENT
+
+
+def _build_components() -> Dict[str, Any]:
+    # pandas, pyarrow and google-cloud-bigquery load here rather than at module import
+    from src.etl.extractor import config_extractor
+    from src.etl.transformer import config_transformer
+    from src.etl.loader import Loader
+    from src.etl.pipeline import Pipeline
+    from src.models.schema_definition import IBGE_STATE_SCHEMA
+    from src.models.schema_validator import SchemaValidator
+    from src.services.dead_letter_service import DeadLetterService
+
+    extractor = config_extractor()
+    transformer = config_transformer()
+    loader = Loader(
+        project_id=Config.PROJECT_ID,
+        location=Config.BQ_LOCATION,
+        mode=Config.LOAD_MODE,
+        stream_type=Config.BQ_STREAM_TYPE,
+        merge_keys=Config.MERGE_KEYS,
+        client=get_bigquery_client(),
+    )
+    validator = SchemaValidator(IBGE_STATE_SCHEMA) if Config.VALIDATE_RECORDS else None
+    pipeline = Pipeline(
+        transformer,
+        loader,
+        queue_size=Config.PIPELINE_QUEUE_SIZE,
+        validator=validator,
+        dead_letter=DeadLetterService(Config.DEAD_LETTER_PATH, source=Config.API_URL),
+    )
+    return {"extractor": extractor, "loader": loader, "pipeline": pipeline}
+
+
+def get_components() -> Dict[str, Any]:
+    """
+    Process-wide Extractor/Loader/Pipeline, created once per instance.
+    """
+    global _COMPONENTS
+    if _COMPONENTS is None:
+        with _COMPONENTS_LOCK:
+            if _COMPONENTS is None:
+                started = time.perf_counter()
+                _COMPONENTS = _build_components()
+                logger.info({"event": "cloud_function_init",
+                             "init_ms": round((time.perf_counter() - started) * 1000, 1)})
+    return _COMPONENTS
+
+
+def _run_jobs():
+    from src.etl.jobs import load_job_specs, run_jobs
+
+    # thread workers share the instance's BigQuery client; process workers build their own
+    result = run_jobs(
+        load_job_specs(Config.ETL_JOBS),
+        max_workers=Config.JOB_MAX_WORKERS,
+        executor=Config.JOB_EXECUTOR,
+        client=get_bigquery_client(),
+    )
+    logger.info({"event": "cloud_function_end", "status": result["status"], "jobs": len(result["jobs"])})
+    return jsonify(result), 200 if result["status"] == "success" else 500
 
 
 def main(request: Request):
     """
     Cloud Functions HTTP entrypoint. Returns JSON response.
     """
-    logger.info({"event": "cloud_function_start", "message": "Execution started."})
+    logger.info({"event": "cloud_function_start", "message": "Execution started.", "cold_start": _COMPONENTS is None})
+    checkpoint = None
     try:
         Config.validate()
-        extractor = Extractor(base_url=Config.API_URL)
-        transformer = Transformer()
-        loader = Loader(project_id=Config.PROJECT_ID, location=Config.BQ_LOCATION)
-
-        raw = extractor.fetch_data()
-        df = transformer.run(raw)
-        result = loader.load(
-            df=df,
+        if Config.ETL_JOBS:
+            # each job builds its own extractor/transformer/pipeline: the single-job components aren't needed
+            return _run_jobs()
+        components = get_components()
+
+        from src.etl.change_detection import config_change_detector
+        from src.etl.checkpoint import config_checkpoint
+        from src.etl.incremental import config_watermark
+        from src.etl.pipeline import config_batches
+
+        # per-run state: read fresh on every invocation
+        watermark = config_watermark(components["loader"].bq)
+        changes = config_change_detector(components["loader"].bq)
+        checkpoint = config_checkpoint(trackers=(watermark, changes))
+
+        result = components["pipeline"].run(
+            config_batches(components["extractor"], watermark=watermark, changes=changes),
             dataset_id=Config.DATASET,
             table_id=Config.TABLE,
             write_disposition="WRITE_APPEND",
             create_dataset=True,
-            create_table=False
+            create_table=False,
+            checkpoint=checkpoint,
         )
 
+        # advance the watermark and fingerprints only once everything up to them is loaded
+        if watermark is not None:
+            watermark.commit()
+        if changes is not None:
+            changes.commit()
+
         logger.info({"event": "cloud_function_end", "status": "success", "load_result": result})
         return jsonify({"status": "success", "load_result": result}), 200
-    except (ExtractError, TransformError, LoadError) as e:
+    except (ExtractError, TransformError, LoadError, ConfigError) as e:
         logger.error({"event": "cloud_function_etl_error", "error": str(e)})
-        return jsonify({"status": "error", "message": str(e)}), 500
+        body = {"status": "error", "message": str(e)}
+        if checkpoint is not None:
+            # a retry resumes from here
+            body["checkpoint"] = checkpoint.progress()
+        return jsonify(body), 500
     except Exception as e:
         logger.error({"event": "cloud_function_unexpected_error", "error": str(e)})
         return jsonify({"status": "error", "message": str(e)}), 500
+    finally:
+        # the instance may be throttled once the response is sent
+        flush_logs()
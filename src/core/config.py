@@ -19,12 +19,102 @@ class Config:
         "https://servicodados.ibge.gov.br/api/v1/localidades/estados"
     )
 
+    # Pagination: "", "offset", "page", "cursor" or "link" ("" = single request)
+    API_PAGINATION = os.getenv("API_PAGINATION", "")
+    API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "100"))
+    EXTRACT_MAX_WORKERS = int(os.getenv("EXTRACT_MAX_WORKERS", "4"))
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+    # Conditional requests (ETag/Last-Modified) against an on-disk response cache ("" disables)
+    HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", "")
+    HTTP_CACHE_MAX_MB = int(os.getenv("HTTP_CACHE_MAX_MB", "256"))
+    # Client-side throttling: requests/second with bursts of API_RATE_BURST (0 = unlimited), and
+    # AIMD concurrency (up to EXTRACT_MAX_WORKERS) backing off on 429/503 or latency above the target
+    API_RATE_LIMIT = float(os.getenv("API_RATE_LIMIT", "0"))
+    API_RATE_BURST = float(os.getenv("API_RATE_BURST", "1"))
+    API_ADAPTIVE_CONCURRENCY = os.getenv("API_ADAPTIVE_CONCURRENCY", "false").lower() == "true"
+    API_LATENCY_TARGET_MS = int(os.getenv("API_LATENCY_TARGET_MS", "0"))
+
+    # Comma-separated endpoints appended to API_URL and fetched concurrently (async client)
+    API_ENDPOINTS = [e.strip() for e in os.getenv("API_ENDPOINTS", "").split(",") if e.strip()]
+    API_PER_HOST_LIMIT = int(os.getenv("API_PER_HOST_LIMIT", "10"))
+
+    # "", "json" or "ndjson": parse the response body incrementally instead of buffering it
+    API_STREAM_FORMAT = os.getenv("API_STREAM_FORMAT", "")
+
+    # Batch pipeline: records per batch and batches buffered between stages
+    BATCH_SIZE = int(os.getenv("BATCH_SIZE", "5000"))
+    PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "2"))
+
+    # "pandas" or "arrow": Arrow tables are loaded to BigQuery as Parquet, without pandas
+    TRANSFORM_OUTPUT = os.getenv("TRANSFORM_OUTPUT", "pandas")
+    # Transform processes per batch (1 = inline, the default; 0 = every available CPU); batches under
+    # 2 * TRANSFORM_MIN_SHARD_ROWS records are always transformed inline
+    TRANSFORM_WORKERS = int(os.getenv("TRANSFORM_WORKERS", "1"))
+    TRANSFORM_MIN_SHARD_ROWS = int(os.getenv("TRANSFORM_MIN_SHARD_ROWS", "1000"))
+
+    # Check rows against the BigQuery schema before load; failures go to DEAD_LETTER_PATH (NDJSON)
+    VALIDATE_RECORDS = os.getenv("VALIDATE_RECORDS", "false").lower() == "true"
+    DEAD_LETTER_PATH = os.getenv("DEAD_LETTER_PATH", "/tmp/etl_dead_letter.ndjson")
+
+    # "batch" (load jobs) or "stream" (Storage Write API; BQ_STREAM_TYPE COMMITTED or PENDING)
+    LOAD_MODE = os.getenv("LOAD_MODE", "batch")
+    BQ_STREAM_TYPE = os.getenv("BQ_STREAM_TYPE", "COMMITTED")
+    # Comma-separated key columns (e.g. "id"): batch loads become MERGE upserts through a staging table
+    MERGE_KEYS = [k.strip() for k in os.getenv("MERGE_KEYS", "").split(",") if k.strip()]
+
+    # Incremental extraction: "" (full), "timestamp" or "id" (high mark of INCREMENTAL_FIELD,
+    # sent as INCREMENTAL_PARAM) or "etag" (conditional request)
+    INCREMENTAL_MODE = os.getenv("INCREMENTAL_MODE", "")
+    INCREMENTAL_FIELD = os.getenv("INCREMENTAL_FIELD", "")
+    INCREMENTAL_PARAM = os.getenv("INCREMENTAL_PARAM", "")
+    # Watermark store: "file" (JSON), "sqlite" (both at STATE_PATH) or "bigquery" (STATE_TABLE in DATASET)
+    STATE_BACKEND = os.getenv("STATE_BACKEND", "file")
+    STATE_PATH = os.getenv("STATE_PATH", "/tmp/etl_state.json")
+    STATE_TABLE = os.getenv("STATE_TABLE", "etl_state")
+
+    # Content-hash change detection: skip records (by CHANGE_KEY_FIELD) whose content was already loaded;
+    # requires MERGE_KEYS, so the changed records replace their old versions
+    CHANGE_DETECTION = os.getenv("CHANGE_DETECTION", "false").lower() == "true"
+    CHANGE_KEY_FIELD = os.getenv("CHANGE_KEY_FIELD", "id")
+
+    # Spill transformed batches to Parquet under CHECKPOINT_DIR with a run manifest, so a retried run
+    # resumes its loads instead of extracting again ("" disables); older spills are discarded
+    CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", "")
+    CHECKPOINT_MAX_AGE_H = float(os.getenv("CHECKPOINT_MAX_AGE_H", "24"))
+
+    # Seconds a known dataset/table is trusted before its existence is checked again (0 disables)
+    BQ_METADATA_TTL = float(os.getenv("BQ_METADATA_TTL", "300"))
+    # Client-side cache of read-only run_query results (memory, plus disk under QUERY_CACHE_DIR if set);
+    # keyed on SQL, parameters and the last-modified time of every referenced table. Opt-in: queries
+    # reading unqualified table names or views are never cached
+    QUERY_CACHE = os.getenv("QUERY_CACHE", "false").lower() == "true"
+    QUERY_CACHE_DIR = os.getenv("QUERY_CACHE_DIR", "")
+    QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "600"))
+    QUERY_CACHE_MEMORY_MB = int(os.getenv("QUERY_CACHE_MEMORY_MB", "64"))
+    QUERY_CACHE_DISK_MB = int(os.getenv("QUERY_CACHE_DISK_MB", "512"))
+
+    # Multi-job runs: ETL_JOBS is a JSON job spec (or a path to one, see src.etl.jobs); independent
+    # jobs run in parallel on JOB_MAX_WORKERS "thread" or "process" workers (JOB_EXECUTOR)
+    ETL_JOBS = os.getenv("ETL_JOBS", "")
+    JOB_MAX_WORKERS = int(os.getenv("JOB_MAX_WORKERS", "4"))
+    JOB_EXECUTOR = os.getenv("JOB_EXECUTOR", "thread")
+
+    # Logging: level, background writer thread, and sampling of per-request/per-batch events
+    # (fraction kept, and max records per event name per second; 0 = unlimited)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() == "true"
+    LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+    LOG_EVENT_RATE_LIMIT = int(os.getenv("LOG_EVENT_RATE_LIMIT", "50"))
+
     FUNCTION_REGION = os.getenv("FUNCTION_REGION", "southamerica-east1")
     BQ_LOCATION = os.getenv("BIGQUERY_LOCATION", "US")
 
     @classmethod
     def validate(cls):
         required = ["GCP_PROJECT_ID", "BIGQUERY_DATASET", "BIGQUERY_TABLE"]
+        if cls.ETL_JOBS:
+            # each job names its own table
+            required.remove("BIGQUERY_TABLE")
         missing = [var for var in required if os.getenv(var) is None]
 
         if missing:
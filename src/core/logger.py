@@ -1,25 +1,165 @@
+import atexit
 import logging
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, Iterable, Optional
+
 from pythonjsonlogger import jsonlogger
 
+from src.core.config import Config
+
+# per-request/per-batch events: sampled and rate limited; everything else is always kept
+HOT_EVENTS = frozenset({
+    "api_request_start",
+    "api_request_success",
+    "api_cache_hit",
+    "extract_page",
+    "extract_batch",
+    "transform_start",
+    "transform_clean_columns",
+    "transform_normalize",
+    "transform_dataframe_success",
+    "transform_arrow_success",
+    "pipeline_batch_loaded",
+    "incremental_filtered",
+})
+
+
+class CompactJsonFormatter(jsonlogger.JsonFormatter):
+    """
+    Single-line JSON with Cloud Logging's "severity" and "time" keys.
+    Callable field values are lazy: they are only evaluated here, when (and
+    if) the record is written, so they must not depend on state that changes
+    after the call.
+    """
+
+    def __init__(self):
+        super().__init__(
+            fmt="%(levelname)s %(message)s",
+            rename_fields={"levelname": "severity"},
+            timestamp="time",
+            json_ensure_ascii=False,
+        )
+
+    def process_log_record(self, log_data: Dict[str, Any]) -> Dict[str, Any]:
+        for key, value in log_data.items():
+            if callable(value):
+                try:
+                    log_data[key] = value()
+                except Exception as e:
+                    log_data[key] = f"<erro ao avaliar campo: {e}>"
+        if not log_data.get("message"):
+            log_data.pop("message", None)
+        return log_data
+
+
+class EventSampler(logging.Filter):
+    """
+    Thins out high-frequency INFO/DEBUG events: keeps a `sample_rate`
+    fraction of them and at most `max_per_second` per event name. The next
+    kept record of an event carries the number suppressed before it.
+    Warnings and errors always pass.
+    """
+
+    def __init__(self, events: Iterable[str] = HOT_EVENTS, sample_rate: float = 1.0, max_per_second: int = 0,
+                 clock: Callable[[], float] = time.monotonic, rng: Callable[[], float] = random.random):
+        super().__init__()
+        self.events = frozenset(events)
+        self.sample_rate = sample_rate
+        self.max_per_second = max_per_second
+        self._clock = clock
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._windows: Dict[str, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not isinstance(record.msg, dict):
+            return True
+        event = record.msg.get("event")
+        if event not in self.events:
+            return True
+        with self._lock:
+            window = self._windows.setdefault(event, [0.0, 0, 0])  # start, kept, suppressed
+            now = self._clock()
+            if now - window[0] >= 1.0:
+                window[0], window[1] = now, 0
+            keep = (self.sample_rate >= 1.0 or self._rng() < self.sample_rate) and \
+                (not self.max_per_second or window[1] < self.max_per_second)
+            if not keep:
+                window[2] += 1
+                return False
+            window[1] += 1
+            suppressed, window[2] = window[2], 0
+        if suppressed:
+            record.msg = {**record.msg, "suppressed": suppressed}
+        return True
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Enqueues records as they are: formatting (and lazy fields) happen on the
+    listener thread instead of the caller's.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_listener: Optional[QueueListener] = None
+_queue: Optional[queue.Queue] = None
+
+
+def flush_logs(timeout: float = 5.0) -> None:
+    """
+    Waits until queued records are written, e.g. before a Cloud Function
+    returns and its CPU is throttled.
+    """
+    if _queue is None:
+        return
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def configure_logger():
     """
-    Configure structured JSON logging.
+    Configure structured JSON logging: compact records written by a
+    background thread (LOG_ASYNC), with hot events sampled
+    (LOG_SAMPLE_RATE, LOG_EVENT_RATE_LIMIT).
     """
+    global _listener, _queue
     logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
+    logger.setLevel(Config.LOG_LEVEL)
 
     handler = logging.StreamHandler()
+    handler.setFormatter(CompactJsonFormatter())
+    sampler = EventSampler(sample_rate=Config.LOG_SAMPLE_RATE, max_per_second=Config.LOG_EVENT_RATE_LIMIT)
 
-    formatter = jsonlogger.JsonFormatter(
-        fmt="%(levelname)s %(asctime)s %(message)s",
-        json_indent=2
-    )
-
-    handler.setFormatter(formatter)
-    logger.handlers = [handler]
+    _stop_listener()
+    if Config.LOG_ASYNC:
+        _queue = queue.Queue()
+        front = _DeferredQueueHandler(_queue)
+        _listener = QueueListener(_queue, handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        _queue = None
+        front = handler
+    front.addFilter(sampler)
+    logger.handlers = [front]
 
     return logger
 
 
+atexit.register(_stop_listener)
+
 logger = configure_logger()
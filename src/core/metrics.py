@@ -0,0 +1,136 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def peak_rss_mb() -> float | None:
+    """
+    Peak resident set size of the process so far, in MiB.
+    """
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+# collectors opened with Metrics.scope() in the current context; threads see them via copy_context()
+_SCOPES: ContextVar[Tuple["Metrics", ...]] = ContextVar("metrics_scopes", default=())
+
+
+class StageRun:
+    """
+    One timed execution of a stage; the caller fills in the volumes, and
+    `cpu_s` with CPU time spent for it outside the running thread (e.g. in
+    worker processes).
+    """
+
+    __slots__ = ("rows", "bytes_in", "bytes_out", "cpu_s")
+
+    def __init__(self, rows: int = 0, bytes_in: int = 0, bytes_out: int = 0):
+        self.rows = rows
+        self.bytes_in = bytes_in
+        self.bytes_out = bytes_out
+        self.cpu_s = 0.0
+
+
+class Metrics:
+    """
+    Per-run stage instrumentation: wall time, CPU time (of the thread
+    running the stage, plus what it reports in StageRun.cpu_s), rows,
+    bytes in/out and call counts, aggregated per stage name. Thread-safe,
+    so concurrent requests and pipeline stages can record into the same
+    collector.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages: Dict[str, Dict[str, float]] = {}
+            self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0, bytes_in: int = 0) -> Iterator[StageRun]:
+        run = StageRun(rows=rows, bytes_in=bytes_in)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield run
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start + run.cpu_s
+            self._record(name, wall, cpu, run)
+            for scoped in _SCOPES.get():
+                if scoped is not self:
+                    scoped._record(name, wall, cpu, run)
+
+    def _record(self, name: str, wall: float, cpu: float, run: StageRun) -> None:
+        with self._lock:
+            stats = self._stages.setdefault(
+                name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "rows": 0, "bytes_in": 0, "bytes_out": 0}
+            )
+            stats["calls"] += 1
+            stats["wall_s"] += wall
+            stats["cpu_s"] += cpu
+            stats["rows"] += run.rows
+            stats["bytes_in"] += run.bytes_in
+            stats["bytes_out"] += run.bytes_out
+
+    @contextmanager
+    def scope(self) -> Iterator["Metrics"]:
+        """
+        A fresh collector that also gets every stage recorded in this
+        context until exit, while this one keeps its totals. Threads only
+        share it when started through contextvars.copy_context(), which
+        keeps concurrent runs' figures apart.
+        """
+        scoped = Metrics()
+        token = _SCOPES.set(_SCOPES.get() + (scoped,))
+        try:
+            yield scoped
+        finally:
+            _SCOPES.reset(token)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current totals, for a later summary(since=...) of what was recorded in between.
+        """
+        with self._lock:
+            stages = {name: dict(stats) for name, stats in self._stages.items()}
+        return {"started": time.perf_counter(), "stages": stages}
+
+    def summary(self, since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Stage totals since the last reset, or since a snapshot(). Stages can
+        nest (a load includes its job wait) or overlap across threads, so
+        their wall times need not add up to the run's.
+        """
+        with self._lock:
+            stages = {name: dict(stats) for name, stats in self._stages.items()}
+            wall = time.perf_counter() - (since["started"] if since else self._started)
+        if since:
+            for name, before in since["stages"].items():
+                stats = stages.get(name)
+                if stats is None:  # a reset happened in between
+                    continue
+                for field, value in before.items():
+                    stats[field] -= value
+            stages = {name: stats for name, stats in stages.items() if stats["calls"] > 0}
+        for stats in stages.values():
+            throughput = stats["wall_s"] and stats["rows"]
+            stats["rows_per_s"] = round(stats["rows"] / stats["wall_s"], 1) if throughput else None
+            stats["wall_s"] = round(stats["wall_s"], 4)
+            stats["cpu_s"] = round(stats["cpu_s"], 4)
+        return {"wall_s": round(wall, 4), "peak_rss_mb": peak_rss_mb(), "stages": stages}
+
+
+metrics = Metrics()
@@ -0,0 +1,139 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.core.config import Config
+from src.core.exceptions import ConfigError
+from src.core.logger import logger
+from src.services.state_store import StateStore, create_state_store
+
+# per-record digests are truncated: they only have to tell versions of one record apart
+_RECORD_DIGEST_CHARS = 16
+
+
+def fingerprint(value: Any) -> str:
+    """
+    SHA-256 of the value as normalized JSON (sorted keys, no whitespace),
+    so key order and formatting don't change the hash.
+    """
+    normalized = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ChangeDetector:
+    """
+    Skips records whose content was already loaded, using fingerprints kept
+    in a StateStore.
+
+    With `key_field`, a record is changed when its fingerprint differs from
+    the one stored for its key. Without it, any record whose fingerprint
+    wasn't in the last payload is new. A fingerprint of the whole payload is
+    kept too, to report runs where the source didn't change at all.
+
+    The fingerprints seen in a run are only persisted by commit(), after the
+    load succeeded.
+    """
+
+    def __init__(self, store: StateStore, source: str, key_field: Optional[str] = None):
+        self.store = store
+        self.source = source
+        self.key_field = key_field
+        state = store.get(source) or {}
+        self._previous_payload = state.get("payload")
+        self._previous: Dict[str, str] = state.get("records", {})
+        self._seen: Dict[str, str] = {}
+        self._payload = hashlib.sha256()
+        self._restored_payload: Optional[str] = None
+        self.changed = 0
+        self.unchanged = 0
+
+    def _key(self, record: Any, digest: str) -> str:
+        if self.key_field and isinstance(record, dict) and record.get(self.key_field) is not None:
+            return str(record[self.key_field])
+        return digest
+
+    def filter(self, records: Iterable[Any]) -> List[Any]:
+        kept = []
+        for record in records:
+            digest = fingerprint(record)[:_RECORD_DIGEST_CHARS]
+            self._payload.update(digest.encode("ascii"))
+            key = self._key(record, digest)
+            self._seen[key] = digest
+            if self._previous.get(key) == digest:
+                self.unchanged += 1
+            else:
+                self.changed += 1
+                kept.append(record)
+        return kept
+
+    @property
+    def payload_fingerprint(self) -> str:
+        return self._restored_payload or self._payload.hexdigest()
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """
+        This run's uncommitted fingerprints, for a RunCheckpoint to carry
+        over to a resumed run that doesn't read the source again.
+        """
+        return {"payload": self.payload_fingerprint, "seen": self._seen,
+                "changed": self.changed, "unchanged": self.unchanged}
+
+    def restore_checkpoint_state(self, state: Dict[str, Any]) -> None:
+        self._restored_payload = state["payload"]
+        self._seen = dict(state["seen"])
+        self.changed = state["changed"]
+        self.unchanged = state["unchanged"]
+
+    @property
+    def payload_unchanged(self) -> bool:
+        return self._previous_payload == self.payload_fingerprint
+
+    def commit(self) -> bool:
+        """
+        Persists this run's fingerprints; returns False when the payload was
+        identical to the last committed one.
+        """
+        logger.info({"event": "change_detection_summary", "source": self.source, "changed": self.changed,
+                     "unchanged": self.unchanged, "payload_unchanged": self.payload_unchanged})
+        if self.payload_unchanged:
+            return False
+        # keyed records not in this payload keep their fingerprints (partial extracts)
+        records = {**self._previous, **self._seen} if self.key_field else self._seen
+        self.store.set(self.source, {
+            "payload": self.payload_fingerprint,
+            "records": records,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        })
+        self._previous_payload, self._previous = self.payload_fingerprint, records
+        return True
+
+
+def config_change_detector(bigquery_service=None, source: Optional[str] = None,
+                           merge_keys: Optional[List[str]] = None) -> Optional[ChangeDetector]:
+    """
+    ChangeDetector described by Config (CHANGE_DETECTION, CHANGE_KEY_FIELD,
+    STATE_BACKEND), or None when change detection is off. `source` names its
+    state like config_watermark's.
+
+    Only changed records reach the load, so it must upsert them on
+    `merge_keys` (default MERGE_KEYS): an append would keep the old version
+    next to the new one, a truncate would leave only the changed rows.
+    """
+    if not Config.CHANGE_DETECTION:
+        return None
+    if not (Config.MERGE_KEYS if merge_keys is None else merge_keys):
+        raise ConfigError("CHANGE_DETECTION requer MERGE_KEYS (carga por upsert)")
+    store = create_state_store(
+        Config.STATE_BACKEND,
+        Config.STATE_PATH,
+        bigquery_service=bigquery_service,
+        dataset_id=Config.DATASET,
+        table_id=Config.STATE_TABLE,
+    )
+    source = source or f"{Config.API_URL} -> {Config.DATASET}.{Config.TABLE}"
+    return ChangeDetector(
+        store,
+        source=f"{source}#content",
+        key_field=Config.CHANGE_KEY_FIELD or None,
+    )
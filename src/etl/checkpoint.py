@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.core.config import Config
+from src.core.exceptions import LoadError
+from src.core.logger import logger
+from src.utils.serializers import arrow_to_pandas
+
+_MANIFEST = "manifest.json"
+
+
+class RunCheckpoint:
+    """
+    Spill directory and manifest of one pipeline run, so a retry after a
+    failure resumes where it stopped instead of extracting again.
+
+    Every transformed batch is written to Parquet before it is loaded, and
+    the manifest records which batches are spilled, which are loaded and
+    whether extraction finished. On resume, spilled batches not yet loaded
+    are loaded first; if extraction had finished the source isn't read at
+    all, otherwise the source batches already consumed (spilled, or
+    dropped whole by validation) are skipped from the new extraction (the
+    source must yield them in the same order).
+
+    `trackers` (Watermark, ChangeDetector) get their uncommitted state saved
+    once extraction finishes and restored on resume, so they can still be
+    committed after a run that never re-reads the source. complete() removes
+    the directory; a manifest older than `max_age_seconds`, or from another
+    `run_key`, is discarded.
+    """
+
+    def __init__(self, directory: str, run_key: str, trackers: Iterable[Any] = (),
+                 max_age_seconds: float = 24 * 3600, clock=time.time):
+        self.run_key = run_key
+        self.path = os.path.join(directory, hashlib.sha256(run_key.encode("utf-8")).hexdigest()[:16])
+        self.trackers = [tracker for tracker in trackers if tracker is not None]
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.manifest = self._read_manifest(max_age_seconds)
+        self.resumed = bool(self.manifest["batches"])
+        if self.manifest["extracted"]:
+            self._restore_trackers()
+        if self.resumed:
+            logger.info({"event": "checkpoint_resume", "run": run_key, **self.progress()})
+
+    def _new_manifest(self) -> Dict[str, Any]:
+        return {"run_key": self.run_key, "created_at": self._clock(), "extracted": False, "consumed": 0,
+                "batches": [], "trackers": {}}
+
+    def _read_manifest(self, max_age_seconds: float) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.path, _MANIFEST), encoding="utf-8") as fh:
+                manifest = json.load(fh)
+        except FileNotFoundError:
+            return self._new_manifest()
+        except (OSError, ValueError) as e:
+            logger.warning({"event": "checkpoint_manifest_invalid", "path": self.path, "error": str(e)})
+            manifest = None
+        if manifest is None or manifest.get("run_key") != self.run_key or \
+                self._clock() - manifest.get("created_at", 0) > max_age_seconds:
+            logger.info({"event": "checkpoint_discarded", "path": self.path})
+            shutil.rmtree(self.path, ignore_errors=True)
+            return self._new_manifest()
+        return manifest
+
+    def _write_manifest(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = os.path.join(self.path, f"{_MANIFEST}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(self.manifest, fh, ensure_ascii=False, default=str)
+        os.replace(tmp_path, os.path.join(self.path, _MANIFEST))
+
+    @property
+    def extracted(self) -> bool:
+        return self.manifest["extracted"]
+
+    @property
+    def consumed(self) -> int:
+        # source batches already taken from the source, spilled or not
+        return self.manifest["consumed"]
+
+    @property
+    def spilled(self) -> int:
+        return len(self.manifest["batches"])
+
+    @property
+    def loaded(self) -> int:
+        return sum(1 for batch in self.manifest["batches"] if batch["loaded"])
+
+    def spill(self, frame: pd.DataFrame | pa.Table) -> int:
+        """
+        Writes a transformed batch to Parquet and records it; returns its index.
+        """
+        with self._lock:
+            index = len(self.manifest["batches"])
+            name = f"batch-{index:06d}.parquet"
+            try:
+                os.makedirs(self.path, exist_ok=True)
+                tmp_path = os.path.join(self.path, f"{name}.tmp")
+                if isinstance(frame, pa.Table):
+                    pq.write_table(frame, tmp_path)
+                else:
+                    frame.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, os.path.join(self.path, name))
+                self.manifest["batches"].append({
+                    "file": name,
+                    "format": "arrow" if isinstance(frame, pa.Table) else "pandas",
+                    "records": len(frame),
+                    "loaded": False,
+                })
+                self.manifest["consumed"] += 1
+                self._write_manifest()
+            except (OSError, ValueError, pa.ArrowException) as e:
+                logger.error({"event": "checkpoint_spill_error", "path": self.path, "error": str(e)})
+                raise LoadError(f"Erro ao gravar checkpoint em {self.path}: {e}")
+        return index
+
+    def skip(self) -> None:
+        """
+        Records a source batch that left nothing to spill (every record rejected).
+        """
+        with self._lock:
+            self.manifest["consumed"] += 1
+            try:
+                self._write_manifest()
+            except OSError as e:
+                logger.error({"event": "checkpoint_spill_error", "path": self.path, "error": str(e)})
+                raise LoadError(f"Erro ao gravar checkpoint em {self.path}: {e}")
+
+    def unloaded(self) -> List[int]:
+        with self._lock:
+            return [index for index, batch in enumerate(self.manifest["batches"]) if not batch["loaded"]]
+
+    def read(self, index: int) -> pd.DataFrame | pa.Table:
+        batch = self.manifest["batches"][index]
+        path = os.path.join(self.path, batch["file"])
+        table = pq.read_table(path)
+        return table if batch["format"] == "arrow" else arrow_to_pandas(table)
+
+    def iter_unloaded(self, indexes: List[int]) -> Iterator[Tuple[int, pd.DataFrame | pa.Table]]:
+        for index in indexes:
+            yield index, self.read(index)
+
+    def mark_loaded(self, index: int, result: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            batch = self.manifest["batches"][index]
+            batch["loaded"] = True
+            if result and result.get("job_id"):
+                batch["job_id"] = result["job_id"]
+            self._write_manifest()
+
+    def mark_extracted(self) -> None:
+        """
+        Extraction (and transform) finished: every batch is spilled, and the
+        trackers' pending state is final.
+        """
+        with self._lock:
+            self.manifest["extracted"] = True
+            self.manifest["trackers"] = {tracker.source: tracker.checkpoint_state() for tracker in self.trackers}
+            self.manifest["extracted_at"] = datetime.now(timezone.utc).isoformat()
+            self._write_manifest()
+
+    def _restore_trackers(self) -> None:
+        for tracker in self.trackers:
+            state = self.manifest["trackers"].get(tracker.source)
+            if state is not None:
+                tracker.restore_checkpoint_state(state)
+
+    def progress(self) -> Dict[str, Any]:
+        return {"consumed": self.consumed, "spilled": self.spilled, "loaded": self.loaded, "extracted": self.extracted}
+
+    def complete(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+        logger.info({"event": "checkpoint_completed", "run": self.run_key})
+
+
+def config_checkpoint(run_key: Optional[str] = None, trackers: Iterable[Any] = ()) -> Optional[RunCheckpoint]:
+    """
+    RunCheckpoint under CHECKPOINT_DIR, or None when checkpointing is off.
+    `run_key` names the run (by default "API_URL -> DATASET.TABLE"), so
+    that its retries find the same spill.
+    """
+    if not Config.CHECKPOINT_DIR:
+        return None
+    run_key = run_key or f"{Config.API_URL} -> {Config.DATASET}.{Config.TABLE}"
+    return RunCheckpoint(Config.CHECKPOINT_DIR, run_key, trackers=trackers,
+                         max_age_seconds=Config.CHECKPOINT_MAX_AGE_H * 3600)
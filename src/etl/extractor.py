@@ -1,4 +1,14 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List
+
 from src.services.api_service import APIService
+from src.services.http_cache import HTTPCache
+from src.services.rate_limit import AdaptiveConcurrency, TokenBucket
+from src.etl.pagination import Pagination
+from src.etl.incremental import Watermark
+from src.utils.json_stream import iter_json_array, iter_ndjson, batched
+from src.core.config import Config
 from src.core.logger import logger
 from src.core.exceptions import ExtractError
 
@@ -8,13 +18,21 @@ class Extractor:
     Extractor now uses APIService for robust HTTP calls.
     """
 
-    def __init__(self, base_url: str, timeout: int = 10):
-        self.service = APIService(base_url=base_url, timeout=timeout)
+    def __init__(self, base_url: str, timeout: int = 10, max_workers: int = 4, pool_size: int = 10,
+                 http_cache: HTTPCache | None = None, rate_limiter: TokenBucket | None = None,
+                 concurrency: AdaptiveConcurrency | None = None):
+        self.max_workers = max(1, max_workers)
+        # the pool must hold at least one connection per concurrent page request
+        self.service = APIService(base_url=base_url, timeout=timeout, pool_size=max(pool_size, self.max_workers),
+                                  cache=http_cache, rate_limiter=rate_limiter, concurrency=concurrency)
 
-    def fetch_data(self, endpoint: str = "", params: dict | None = None):
+    def fetch_data(self, endpoint: str = "", params: dict | None = None, pagination: Pagination | None = None):
         logger.info({"event": "extract_start", "url": self.service.base_url, "endpoint": endpoint})
         try:
-            data = self.service.get(endpoint=endpoint, params=params)
+            if pagination is None:
+                data = self.service.get(endpoint=endpoint, params=params)
+            else:
+                data = [record for page in self.iter_pages(endpoint, params, pagination) for record in page]
             logger.info({
                 "event": "extract_success",
                 "records": len(data) if isinstance(data, list) else 1
@@ -26,3 +44,139 @@ class Extractor:
         except Exception as e:
             logger.error({"event": "extract_unexpected_error", "error": str(e)})
             raise ExtractError(f"Erro inesperado na extração: {e}")
+
+    def fetch_changed(self, watermark: Watermark, endpoint: str = "", params: dict | None = None) -> List:
+        """
+        Single conditional request: sends the watermark's validators (ETag,
+        Last-Modified) and returns [] when the source answers 304.
+        """
+        logger.info({"event": "extract_start", "url": self.service.base_url, "endpoint": endpoint, "conditional": True})
+        try:
+            resp = self.service.get_response(endpoint=endpoint, params=watermark.params(params),
+                                             headers=watermark.request_headers())
+            if resp.status_code == 304:
+                logger.info({"event": "extract_not_modified", "url": resp.url})
+                return []
+            watermark.observe_response(resp.headers)
+            data = resp.json()
+            records = watermark.filter(data if isinstance(data, list) else [data])
+            logger.info({"event": "extract_success", "records": len(records)})
+            return records
+        except ExtractError as e:
+            logger.error({"event": "extract_error", "error": str(e)})
+            raise
+        except Exception as e:
+            logger.error({"event": "extract_unexpected_error", "error": str(e)})
+            raise ExtractError(f"Erro inesperado na extração: {e}")
+
+    def iter_pages(self, endpoint: str = "", params: dict | None = None,
+                   pagination: Pagination | None = None) -> Iterator[List]:
+        """
+        Yields the records of each page, in page order.
+        """
+        pagination = pagination or Pagination()
+        if pagination.is_concurrent:
+            pages = self._iter_indexed_pages(endpoint, params, pagination)
+        else:
+            pages = self._iter_linked_pages(endpoint, params, pagination)
+        for page_number, records in enumerate(pages, start=1):
+            logger.info({"event": "extract_page", "page": page_number, "records": len(records)})
+            yield records
+
+    def _iter_indexed_pages(self, endpoint: str, params: dict | None, pagination: Pagination) -> Iterator[List]:
+        """
+        Keeps up to `max_workers` page requests in flight and yields them in
+        index order. The first short (or empty) page ends the walk; pages
+        requested speculatively past it are discarded.
+        """
+        def fetch(page_index: int) -> List:
+            body = self.service.get(endpoint=endpoint, params=pagination.page_params(page_index, params))
+            return pagination.extract_records(body)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {}
+            next_index = 0
+            emit_index = 0
+            try:
+                while True:
+                    while len(pending) < self.max_workers and not pagination.exhausted(next_index):
+                        # in a copy of this context, so the requests count towards the caller's metrics scope
+                        pending[next_index] = pool.submit(contextvars.copy_context().run, fetch, next_index)
+                        next_index += 1
+                    if emit_index not in pending:
+                        return
+                    records = pending.pop(emit_index).result()
+                    emit_index += 1
+                    yield records
+                    if len(records) < pagination.page_size:
+                        return
+            finally:
+                for future in pending.values():
+                    future.cancel()
+
+    def _iter_linked_pages(self, endpoint: str, params: dict | None, pagination: Pagination) -> Iterator[List]:
+        page_params = pagination.first_params(params)
+        url = None
+        page_index = 0
+        while not pagination.exhausted(page_index):
+            resp = self.service.get_response(endpoint=endpoint, params=page_params, url=url)
+            body = resp.json()
+            yield pagination.extract_records(body)
+            page_index += 1
+
+            if pagination.strategy == "cursor":
+                cursor = pagination.next_cursor(body)
+                if not cursor:
+                    return
+                page_params = {**page_params, pagination.cursor_param: cursor}
+            else:
+                url = resp.links.get("next", {}).get("url")
+                if not url:
+                    return
+                # the next link already carries its own query string
+                page_params = None
+
+    def stream_batches(self, endpoint: str = "", params: dict | None = None,
+                       batch_size: int = 1000, fmt: str = "json") -> Iterator[List]:
+        """
+        Parses the response body incrementally (a JSON array, or NDJSON with
+        fmt="ndjson") and yields lists of at most `batch_size` records, so the
+        full payload is never held in memory.
+        """
+        logger.info({"event": "extract_stream_start", "url": self.service.base_url, "endpoint": endpoint})
+        parse = iter_ndjson if fmt == "ndjson" else iter_json_array
+        total = 0
+        try:
+            chunks = self.service.iter_content(endpoint=endpoint, params=params)
+            for batch in batched(parse(chunks), batch_size):
+                total += len(batch)
+                logger.info({"event": "extract_batch", "records": len(batch)})
+                yield batch
+        except ExtractError as e:
+            logger.error({"event": "extract_error", "error": str(e)})
+            raise
+        except Exception as e:
+            logger.error({"event": "extract_unexpected_error", "error": str(e)})
+            raise ExtractError(f"Erro inesperado na extração: {e}")
+        logger.info({"event": "extract_success", "records": total})
+
+
+def config_extractor(base_url: str | None = None) -> Extractor:
+    """
+    Extractor for `base_url` (default API_URL) with the worker pool, HTTP
+    cache, rate limit and adaptive concurrency described by Config.
+    """
+    return Extractor(
+        base_url=base_url or Config.API_URL,
+        max_workers=Config.EXTRACT_MAX_WORKERS,
+        pool_size=Config.HTTP_POOL_SIZE,
+        http_cache=HTTPCache(Config.HTTP_CACHE_DIR, max_bytes=Config.HTTP_CACHE_MAX_MB * 1024 * 1024)
+        if Config.HTTP_CACHE_DIR else None,
+        rate_limiter=TokenBucket(Config.API_RATE_LIMIT, capacity=Config.API_RATE_BURST)
+        if Config.API_RATE_LIMIT > 0 else None,
+        concurrency=AdaptiveConcurrency(
+            initial=Config.EXTRACT_MAX_WORKERS,
+            max_limit=Config.EXTRACT_MAX_WORKERS,
+            latency_target=Config.API_LATENCY_TARGET_MS / 1000 or None,
+        ) if Config.API_ADAPTIVE_CONCURRENCY else None,
+    )
@@ -0,0 +1,150 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from src.core.config import Config
+from src.core.logger import logger
+from src.core.exceptions import ConfigError
+from src.services.state_store import StateStore, create_state_store
+
+KINDS = ("timestamp", "id", "etag")
+
+
+def _timestamp_key(value: Any) -> datetime:
+    parsed = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    # naive timestamps are taken as UTC so they compare with aware ones
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _id_key(value: Any) -> Any:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return float(value)
+
+
+class Watermark:
+    """
+    Incremental extraction state for one source, kept in a StateStore.
+
+    - "timestamp"/"id": the highest `field` value loaded so far. It is sent
+      to the API as `param` (when set) and records at or below it are dropped
+      locally, for APIs that ignore the filter.
+    - "etag": the last ETag/Last-Modified of the response, sent back as
+      If-None-Match/If-Modified-Since so an unchanged source answers 304.
+
+    The new value is only persisted by commit(), after the load succeeded.
+    """
+
+    def __init__(self, store: StateStore, source: str, kind: str = "timestamp",
+                 field: Optional[str] = None, param: Optional[str] = None):
+        if kind not in KINDS:
+            raise ConfigError(f"Tipo de watermark inválido: {kind}")
+        if kind != "etag" and not field:
+            raise ConfigError(f"Watermark '{kind}' requer o campo de referência")
+        self.store = store
+        self.source = source
+        self.kind = kind
+        self.field = field
+        self.param = param
+        self._key = _timestamp_key if kind == "timestamp" else _id_key
+        self.state: Dict[str, Any] = store.get(source) or {}
+        self._pending: Dict[str, Any] = {}
+        self._pending_key: Any = None
+
+    @property
+    def value(self) -> Any:
+        return self.state.get("value")
+
+    def params(self, params: dict | None = None) -> dict | None:
+        if self.kind == "etag" or not self.param or self.value is None:
+            return params
+        return {**(params or {}), self.param: self.value}
+
+    def request_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.kind == "etag":
+            if self.state.get("etag"):
+                headers["If-None-Match"] = self.state["etag"]
+            if self.state.get("last_modified"):
+                headers["If-Modified-Since"] = self.state["last_modified"]
+        return headers
+
+    def observe_response(self, headers: Mapping[str, str]) -> None:
+        if self.kind == "etag":
+            self._pending = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+
+    def filter(self, records: Iterable[Any]) -> List[Any]:
+        """
+        Keeps the records past the stored watermark and tracks the new high
+        mark. Records without the field are kept.
+        """
+        records = list(records)
+        if self.kind == "etag":
+            return records
+        floor = self._key(self.value) if self.value is not None else None
+        kept = []
+        for record in records:
+            raw = record.get(self.field) if isinstance(record, dict) else None
+            if raw is None:
+                kept.append(record)
+                continue
+            key = self._key(raw)
+            if floor is not None and key <= floor:
+                continue
+            kept.append(record)
+            if self._pending_key is None or key > self._pending_key:
+                self._pending_key = key
+                self._pending = {"value": raw}
+        if len(kept) < len(records):
+            logger.info({"event": "incremental_filtered", "source": self.source,
+                         "kept": len(kept), "skipped": len(records) - len(kept)})
+        return kept
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """
+        The uncommitted watermark, for a RunCheckpoint to carry over to a resumed run.
+        """
+        return dict(self._pending)
+
+    def restore_checkpoint_state(self, state: Dict[str, Any]) -> None:
+        self._pending = dict(state)
+        self._pending_key = self._key(state["value"]) if state.get("value") is not None else None
+
+    def commit(self) -> bool:
+        """
+        Persists the watermark observed in this run; returns False when
+        nothing new was seen.
+        """
+        if not self._pending or self._pending == {k: self.state.get(k) for k in self._pending}:
+            return False
+        self.state = {**self.state, **self._pending, "updated_at": datetime.now(timezone.utc).isoformat()}
+        self.store.set(self.source, self.state)
+        self._pending, self._pending_key = {}, None
+        logger.info({"event": "incremental_watermark_saved", "source": self.source, "state": self.state})
+        return True
+
+
+def config_watermark(bigquery_service=None, source: Optional[str] = None) -> Optional[Watermark]:
+    """
+    Watermark described by Config (INCREMENTAL_MODE, STATE_BACKEND), or
+    None when incremental extraction is off. `source` names its state (by
+    default "API_URL -> DATASET.TABLE").
+    """
+    if not Config.INCREMENTAL_MODE:
+        return None
+    store = create_state_store(
+        Config.STATE_BACKEND,
+        Config.STATE_PATH,
+        bigquery_service=bigquery_service,
+        dataset_id=Config.DATASET,
+        table_id=Config.STATE_TABLE,
+    )
+    return Watermark(
+        store,
+        source=source or f"{Config.API_URL} -> {Config.DATASET}.{Config.TABLE}",
+        kind=Config.INCREMENTAL_MODE,
+        field=Config.INCREMENTAL_FIELD or None,
+        param=Config.INCREMENTAL_PARAM or None,
+    )
@@ -0,0 +1,185 @@
+import json
+import os
+import time
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from src.core.config import Config
+from src.core.exceptions import ConfigError
+from src.core.logger import flush_logs, logger
+from src.etl.scheduler import DAGScheduler
+
+_WRITE_DISPOSITIONS = ("WRITE_APPEND", "WRITE_TRUNCATE", "WRITE_EMPTY")
+
+
+class JobSpec:
+    """
+    One source -> transform -> table job of a multi-job run. Unset fields
+    fall back to the single-job Config (DATASET, TRANSFORM_OUTPUT,
+    MERGE_KEYS, BATCH_SIZE). `schema` is the table schema in BigQuery's JSON
+    form ([{"name", "type", "mode", "fields"}]); without it the transform
+    infers column types.
+    """
+
+    def __init__(self, name: str, url: str, table: str, dataset: Optional[str] = None, endpoint: str = "",
+                 endpoints: Optional[List[str]] = None, params: Optional[Dict[str, Any]] = None,
+                 pagination: Optional[str] = None, page_size: Optional[int] = None, stream_format: str = "",
+                 output_format: Optional[str] = None, write_disposition: str = "WRITE_APPEND",
+                 merge_keys: Optional[List[str]] = None, batch_size: Optional[int] = None,
+                 depends_on: Optional[List[str]] = None, schema: Optional[List[Dict[str, Any]]] = None):
+        if not name or not url or not table:
+            raise ConfigError(f"Job inválido, 'name', 'url' e 'table' são obrigatórios: {name or url or table}")
+        if write_disposition not in _WRITE_DISPOSITIONS:
+            raise ConfigError(f"Job {name}: write_disposition inválido: {write_disposition}")
+        self.name = name
+        self.url = url
+        self.table = table
+        self.dataset = dataset or Config.DATASET
+        self.endpoint = endpoint
+        self.endpoints = endpoints or []
+        self.params = params or {}
+        self.pagination = pagination
+        self.page_size = page_size or Config.API_PAGE_SIZE
+        self.stream_format = stream_format
+        self.output_format = output_format or Config.TRANSFORM_OUTPUT
+        self.write_disposition = write_disposition
+        self.merge_keys = Config.MERGE_KEYS if merge_keys is None else merge_keys
+        if Config.CHANGE_DETECTION and not self.merge_keys:
+            # see config_change_detector: changed records must be upserted
+            raise ConfigError(f"Job {name}: CHANGE_DETECTION requer merge_keys")
+        self.batch_size = batch_size or Config.BATCH_SIZE
+        self.depends_on = depends_on or []
+        self.schema = schema
+
+    @property
+    def state_source(self) -> str:
+        # watermark/fingerprint state key, one per source and target
+        source = "/".join(part.strip("/") for part in (self.url, self.endpoint) if part)
+        return f"{source} -> {self.dataset}.{self.table}"
+
+    def __repr__(self) -> str:
+        return f"JobSpec({self.name!r}, {self.dataset}.{self.table})"
+
+
+def load_job_specs(spec: str) -> List[JobSpec]:
+    """
+    Jobs from ETL_JOBS: a path to a JSON file, or the JSON itself, holding
+    {"jobs": [...]} (or just the list) with one object of JobSpec fields per
+    job.
+    """
+    try:
+        if os.path.isfile(spec):
+            with open(spec, encoding="utf-8") as fh:
+                document = json.load(fh)
+        else:
+            document = json.loads(spec)
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"Especificação de jobs inválida: {e}")
+    entries = document.get("jobs") if isinstance(document, dict) else document
+    if not isinstance(entries, list) or not entries:
+        raise ConfigError("Especificação de jobs sem jobs")
+    try:
+        return [JobSpec(**entry) for entry in entries]
+    except TypeError as e:
+        raise ConfigError(f"Campo de job inválido: {e}")
+
+
+def run_job(spec: JobSpec, client=None) -> Dict[str, Any]:
+    """
+    Runs one job end to end and returns its pipeline summary. Watermark and
+    fingerprints are committed only after the load. `client` (a BigQuery
+    client) is shared between jobs running in threads.
+    """
+    # heavy imports stay out of module import, as in cloud_function_handler
+    from google.cloud import bigquery
+
+    from src.etl.change_detection import config_change_detector
+    from src.etl.checkpoint import config_checkpoint
+    from src.etl.extractor import config_extractor
+    from src.etl.incremental import config_watermark
+    from src.etl.loader import Loader
+    from src.etl.pagination import Pagination
+    from src.etl.pipeline import Pipeline, source_batches
+    from src.etl.transformer import config_transformer
+    from src.models.schema_definition import IBGE_STATE_SCHEMA
+    from src.models.schema_validator import SchemaValidator
+    from src.services.dead_letter_service import DeadLetterService
+
+    schema = [bigquery.SchemaField.from_api_repr(field) for field in spec.schema] if spec.schema else None
+    transformer = config_transformer(spec.output_format, schema=schema)
+    try:
+        loader = Loader(
+            project_id=Config.PROJECT_ID,
+            location=Config.BQ_LOCATION,
+            mode=Config.LOAD_MODE,
+            stream_type=Config.BQ_STREAM_TYPE,
+            merge_keys=spec.merge_keys,
+            client=client,
+        )
+        watermark = config_watermark(loader.bq, source=spec.state_source)
+        changes = config_change_detector(loader.bq, source=spec.state_source, merge_keys=spec.merge_keys)
+        checkpoint = config_checkpoint(spec.state_source, trackers=(watermark, changes))
+        validator = SchemaValidator(schema or IBGE_STATE_SCHEMA) if Config.VALIDATE_RECORDS else None
+        pipeline = Pipeline(
+            transformer,
+            loader,
+            queue_size=Config.PIPELINE_QUEUE_SIZE,
+            validator=validator,
+            dead_letter=DeadLetterService(Config.DEAD_LETTER_PATH, source=spec.url),
+        )
+        batches = source_batches(
+            config_extractor(spec.url),
+            batch_size=spec.batch_size,
+            watermark=watermark,
+            changes=changes,
+            endpoint=spec.endpoint,
+            params=spec.params,
+            endpoints=spec.endpoints,
+            stream_format=spec.stream_format,
+            pagination=Pagination(strategy=spec.pagination, page_size=spec.page_size) if spec.pagination else None,
+        )
+        result = pipeline.run(
+            batches,
+            dataset_id=spec.dataset,
+            table_id=spec.table,
+            write_disposition=spec.write_disposition,
+            create_dataset=True,
+            create_table=False,
+            table_schema=schema,
+            checkpoint=checkpoint,
+        )
+        if watermark is not None:
+            watermark.commit()
+        if changes is not None:
+            changes.commit()
+        return result
+    finally:
+        close = getattr(transformer, "close", None)
+        if close:
+            close()
+        # a process worker may exit without running atexit hooks
+        flush_logs()
+
+
+def run_jobs(specs: List[JobSpec], max_workers: int = 4, executor: str = "thread", client=None) -> Dict[str, Any]:
+    """
+    Runs the jobs through a DAGScheduler and aggregates them: overall status
+    ("success", "partial" or "error"), wall time and per-job outcomes.
+    Each job's "metrics" cover only its own stages, also with jobs running
+    alongside it in threads (see Metrics.scope).
+    """
+    started = time.perf_counter()
+    # clients don't cross process boundaries: process workers create their own
+    func = partial(run_job, client=client) if executor == "thread" and client is not None else run_job
+    outcomes = DAGScheduler(max_workers=max_workers, executor=executor).run(specs, func)
+    succeeded = sum(1 for outcome in outcomes.values() if outcome["status"] == "success")
+    status = "success" if succeeded == len(outcomes) else "partial" if succeeded else "error"
+    summary = {
+        "status": status,
+        "wall_s": round(time.perf_counter() - started, 3),
+        "records": sum(o["result"].get("records", 0) for o in outcomes.values() if o["status"] == "success"),
+        "jobs": outcomes,
+    }
+    logger.info({"event": "etl_jobs_finished", "status": status, "jobs": len(outcomes), "succeeded": succeeded,
+                 "wall_s": summary["wall_s"]})
+    return summary
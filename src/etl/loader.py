@@ -1,8 +1,10 @@
 from typing import Optional, List
 import pandas as pd
+import pyarrow as pa
 from google.cloud import bigquery
 
 from src.services.bigquery_service import BigQueryService
+from src.services.storage_write_service import WriteBackend
 from src.core.logger import logger
 from src.core.exceptions import LoadError
 
@@ -10,22 +12,59 @@ from src.core.exceptions import LoadError
 class Loader:
     """
     Loader delegates to BigQueryService for dataset/table creation and dataframe loads.
+    A pyarrow Table is loaded as-is, without a pandas round trip.
+    With mode="stream", rows are appended through the Storage Write API
+    instead of load jobs. With `merge_keys`, batch loads become upserts on
+    those columns (staging table + MERGE) and the write disposition is ignored.
+    Streaming only appends: any other write disposition raises LoadError.
     """
 
-    def __init__(self, project_id: str, location: str = "US"):
-        self.bq = BigQueryService(project_id=project_id, location=location)
+    def __init__(self, project_id: str, location: str = "US", mode: str = "batch",
+                 stream_type: str = "COMMITTED", write_backend: Optional[WriteBackend] = None,
+                 merge_keys: Optional[List[str]] = None, client: Optional[bigquery.Client] = None):
+        if mode not in ("batch", "stream"):
+            raise LoadError(f"Modo de carga inválido: {mode}")
+        if merge_keys and mode == "stream":
+            raise LoadError("Upsert (merge_keys) não é suportado no modo stream")
+        self.mode = mode
+        self.stream_type = stream_type
+        self.merge_keys = merge_keys
+        self.bq = BigQueryService(project_id=project_id, location=location, write_backend=write_backend, client=client)
 
     def load(self,
-             df: pd.DataFrame,
+             df: pd.DataFrame | pa.Table,
              dataset_id: str,
              table_id: str,
              write_disposition: str = "WRITE_APPEND",
              create_dataset: bool = True,
              create_table: bool = False,
              table_schema: Optional[List[bigquery.SchemaField]] = None):
+        if self.mode == "stream" and write_disposition != "WRITE_APPEND":
+            raise LoadError(f"Modo stream só suporta WRITE_APPEND, recebido: {write_disposition}")
         try:
-            result = self.bq.load_dataframe(
-                df=df,
+            if self.mode == "stream":
+                return self.bq.append_rows(
+                    df,
+                    dataset_id=dataset_id,
+                    table_id=table_id,
+                    stream_type=self.stream_type,
+                    create_dataset=create_dataset,
+                    create_table=create_table,
+                    table_schema=table_schema,
+                )
+            if self.merge_keys:
+                return self.bq.merge_load(
+                    df,
+                    dataset_id=dataset_id,
+                    table_id=table_id,
+                    key_columns=self.merge_keys,
+                    create_dataset=create_dataset,
+                    create_table=create_table,
+                    table_schema=table_schema,
+                )
+            load = self.bq.load_arrow if isinstance(df, pa.Table) else self.bq.load_dataframe
+            result = load(
+                df,
                 dataset_id=dataset_id,
                 table_id=table_id,
                 write_disposition=write_disposition,
@@ -38,14 +77,34 @@ class Loader:
             logger.error({"event": "loader_error", "error": str(e)})
             raise LoadError(f"Erro no loader: {e}")
 
-from src.models.schema_definition import IBGE_STATE_SCHEMA
-
-result = loader.load(
-    df=df,
-    dataset_id=Config.DATASET,
-    table_id=Config.TABLE,
-    write_disposition="WRITE_APPEND",
-    create_dataset=True,
-    create_table=True,
-    table_schema=IBGE_STATE_SCHEMA
-)
+    def load_bulk(self,
+                  data,
+                  dataset_id: str,
+                  table_id: str,
+                  write_disposition: str = "WRITE_APPEND",
+                  create_dataset: bool = True,
+                  create_table: bool = False,
+                  table_schema: Optional[List[bigquery.SchemaField]] = None,
+                  shard_rows: int = 500_000,
+                  max_workers: int = 4,
+                  partition_field: Optional[str] = None):
+        """
+        Parallel fan-out load (see BigQueryService.bulk_load) for large
+        frames/tables or a stream of them.
+        """
+        try:
+            return self.bq.bulk_load(
+                data,
+                dataset_id=dataset_id,
+                table_id=table_id,
+                write_disposition=write_disposition,
+                create_dataset=create_dataset,
+                create_table=create_table,
+                table_schema=table_schema,
+                shard_rows=shard_rows,
+                max_workers=max_workers,
+                partition_field=partition_field,
+            )
+        except Exception as e:
+            logger.error({"event": "loader_error", "error": str(e)})
+            raise LoadError(f"Erro no loader: {e}")
@@ -0,0 +1,100 @@
+from typing import Any, Dict, List, Optional
+
+from src.core.exceptions import ExtractError
+
+
+class Pagination:
+    """
+    Describes how a paginated endpoint is walked.
+
+    Strategies:
+    - "offset": ?offset=<n * page_size>&limit=<page_size>
+    - "page":   ?page=<start_page + n>&limit=<page_size>
+    - "cursor": next cursor read from the response body (`cursor_field`)
+    - "link":   next URL read from the `Link: <...>; rel="next"` header
+
+    "offset" and "page" pages are addressable up front, so they can be
+    fetched concurrently. "cursor" and "link" pages name their successor
+    and are always walked sequentially.
+    """
+
+    STRATEGIES = ("offset", "page", "cursor", "link")
+
+    def __init__(
+        self,
+        strategy: str = "offset",
+        page_size: int = 100,
+        size_param: str = "limit",
+        offset_param: str = "offset",
+        page_param: str = "page",
+        start_page: int = 1,
+        cursor_param: str = "cursor",
+        cursor_field: str = "next_cursor",
+        records_field: Optional[str] = None,
+        max_pages: Optional[int] = None,
+    ):
+        if strategy not in self.STRATEGIES:
+            raise ExtractError(f"Estratégia de paginação inválida: {strategy}")
+        if page_size < 1:
+            raise ExtractError(f"page_size deve ser positivo: {page_size}")
+        self.strategy = strategy
+        self.page_size = page_size
+        self.size_param = size_param
+        self.offset_param = offset_param
+        self.page_param = page_param
+        self.start_page = start_page
+        self.cursor_param = cursor_param
+        self.cursor_field = cursor_field
+        self.records_field = records_field
+        self.max_pages = max_pages
+
+    @property
+    def is_concurrent(self) -> bool:
+        return self.strategy in ("offset", "page")
+
+    def exhausted(self, page_index: int) -> bool:
+        return self.max_pages is not None and page_index >= self.max_pages
+
+    def page_params(self, page_index: int, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Query params for the zero-based `page_index` ("offset"/"page" only).
+        """
+        page_params = dict(params or {})
+        page_params[self.size_param] = self.page_size
+        if self.strategy == "offset":
+            page_params[self.offset_param] = page_index * self.page_size
+        elif self.strategy == "page":
+            page_params[self.page_param] = self.start_page + page_index
+        return page_params
+
+    def first_params(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        page_params = dict(params or {})
+        page_params[self.size_param] = self.page_size
+        return page_params
+
+    def extract_records(self, body: Any) -> List[Any]:
+        """
+        Records of one page: the body itself when it is a list, otherwise
+        the list found at `records_field` (dotted path).
+        """
+        if isinstance(body, list):
+            return body
+        if self.records_field:
+            records = _lookup(body, self.records_field)
+            if isinstance(records, list):
+                return records
+        raise ExtractError(
+            f"Página sem lista de registros (records_field={self.records_field!r})"
+        )
+
+    def next_cursor(self, body: Any) -> Optional[Any]:
+        return _lookup(body, self.cursor_field)
+
+
+def _lookup(body: Any, path: str) -> Optional[Any]:
+    value = body
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
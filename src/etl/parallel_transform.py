@@ -0,0 +1,160 @@
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from src.core.exceptions import TransformError
+from src.core.logger import logger
+from src.core.metrics import metrics
+from src.etl.transformer import Transformer
+from src.utils.serializers import arrow_to_pandas
+
+# set in each worker by the pool initializer, so the transformer is pickled once per worker, not per shard
+_WORKER_TRANSFORMER: Optional[Transformer] = None
+
+
+def available_cpus() -> int:
+    """
+    CPUs this process may actually use: the affinity mask, capped by a
+    cgroup CPU quota (Cloud Run and Cloud Functions gen2 limit vCPUs that
+    way, while os.cpu_count() reports the host's cores).
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota:
+        cpus = min(cpus, max(1, math.floor(quota)))
+    return max(1, cpus)
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max", encoding="utf-8") as fh:
+            quota, period = fh.read().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", encoding="utf-8") as fh:
+            quota = int(fh.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us", encoding="utf-8") as fh:
+            period = int(fh.read())
+        return quota / period if quota > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def _init_worker(transformer: Transformer) -> None:
+    global _WORKER_TRANSFORMER
+    _WORKER_TRANSFORMER = transformer
+
+
+def _transform_shard(records: list) -> Tuple[bytes, float]:
+    """
+    Worker side: transforms one shard and returns it as an Arrow IPC stream,
+    which the parent maps without unpickling a DataFrame, with the worker
+    CPU time it took.
+    """
+    cpu_start = time.process_time()
+    result = _WORKER_TRANSFORMER.run(records)
+    table = result if isinstance(result, pa.Table) else pa.Table.from_pandas(result, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes(), time.process_time() - cpu_start
+
+
+def _read_ipc(data: bytes) -> pa.Table:
+    return pa.ipc.open_stream(pa.py_buffer(data)).read_all()
+
+
+class ParallelTransformer:
+    """
+    Drop-in for Transformer.run that shards a batch across a process pool,
+    so the per-record Python work (serialization, coercion) isn't bound by
+    one core's GIL. Shards come back as Arrow IPC buffers and are
+    concatenated in input order; pandas output is converted once, in the
+    parent.
+
+    `workers=0` uses every available CPU (see available_cpus). With one
+    worker, or batches under 2 * `min_shard_rows`, batches are transformed
+    inline: the pool (spawned on first use, then reused) isn't worth it.
+    """
+
+    def __init__(self, transformer: Transformer, workers: int = 0, min_shard_rows: int = 1000):
+        self.transformer = transformer
+        self.workers = workers or available_cpus()
+        self.min_shard_rows = max(1, min_shard_rows)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def output_format(self) -> str:
+        return self.transformer.output_format
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawned, not forked: the parent has live threads (pipeline stages, log writer)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.transformer,),
+            )
+            logger.info({"event": "transform_pool_start", "workers": self.workers})
+        return self._pool
+
+    def _shards(self, records: list) -> List[list]:
+        count = min(self.workers, len(records) // self.min_shard_rows)
+        size = math.ceil(len(records) / count)
+        return [records[offset:offset + size] for offset in range(0, len(records), size)]
+
+    def run(self, raw_data: dict | list) -> pd.DataFrame | pa.Table:
+        if not isinstance(raw_data, list) or self.workers <= 1 or len(raw_data) < 2 * self.min_shard_rows:
+            return self.transformer.run(raw_data)
+
+        shards = self._shards(raw_data)
+        with metrics.stage("transform", rows=len(raw_data)) as run:
+            try:
+                outputs = list(self._executor().map(_transform_shard, shards))
+                buffers = [buffer for buffer, _ in outputs]
+                # the workers' CPU time: this thread only waits and concatenates
+                run.cpu_s = sum(cpu for _, cpu in outputs)
+            except TransformError:
+                raise
+            except Exception as e:
+                # e.g. a pandas column Arrow can't represent: the batch is transformed inline below
+                logger.warning({"event": "transform_parallel_fallback", "error": str(e)})
+                buffers, run.rows = None, 0
+                if isinstance(e, BrokenProcessPool):
+                    # a worker died (e.g. out of memory): start a fresh pool next time
+                    self._pool = None
+            if buffers is not None:
+                try:
+                    table = pa.concat_tables([_read_ipc(buffer) for buffer in buffers], promote_options="permissive")
+                    result = table if self.output_format == "arrow" else arrow_to_pandas(table)
+                except Exception as e:
+                    logger.error({"event": "transform_error", "error": str(e)})
+                    raise TransformError(f"Erro ao combinar shards transformados: {e}")
+                run.bytes_out = table.nbytes
+        if buffers is None:
+            return self.transformer.run(raw_data)
+        logger.info({"event": "transform_parallel_success", "rows": table.num_rows, "shards": len(shards)})
+        return result
+
+    def run_batches(self, batches: Iterable[list]) -> Iterator[pd.DataFrame | pa.Table]:
+        for batch in batches:
+            yield self.run(batch)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
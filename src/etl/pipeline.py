@@ -0,0 +1,296 @@
+import contextvars
+import itertools
+import queue
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from google.cloud import bigquery
+
+from src.core.config import Config
+from src.core.logger import logger
+from src.core.metrics import metrics
+from src.etl.extractor import Extractor
+from src.etl.change_detection import ChangeDetector
+from src.etl.checkpoint import RunCheckpoint
+from src.etl.incremental import Watermark
+from src.etl.pagination import Pagination
+from src.etl.transformer import Transformer
+from src.etl.loader import Loader
+from src.models.schema_validator import SchemaValidator
+from src.services.dead_letter_service import DeadLetterService
+from src.utils.json_stream import batched
+
+_DONE = object()
+
+
+class _Stopped(Exception):
+    """Raised inside a stage thread when another stage has failed."""
+
+
+class Pipeline:
+    """
+    Batch-at-a-time runner: extract -> transform -> load, each stage in its
+    own thread, connected by bounded queues. Stages overlap, and at most
+    `queue_size` batches wait between two stages, so memory stays flat
+    regardless of dataset size.
+
+    With a `validator`, each raw batch is checked against the schema before
+    transformation; failing rows go to `dead_letter` instead of the load.
+
+    The summary returned by run() includes the per-stage metrics of the run
+    (see src.core.metrics).
+    """
+
+    def __init__(self, transformer: Transformer, loader: Loader, queue_size: int = 2,
+                 validator: Optional[SchemaValidator] = None, dead_letter: Optional[DeadLetterService] = None):
+        self.transformer = transformer
+        self.loader = loader
+        self.queue_size = max(1, queue_size)
+        self.validator = validator
+        self.dead_letter = dead_letter
+
+    def run(
+        self,
+        batches: Iterable[list],
+        dataset_id: str,
+        table_id: str,
+        write_disposition: str = "WRITE_APPEND",
+        create_dataset: bool = True,
+        create_table: bool = False,
+        table_schema: Optional[List[bigquery.SchemaField]] = None,
+        checkpoint: Optional[RunCheckpoint] = None,
+    ) -> Dict[str, Any]:
+        """
+        Runs the stages over `batches` and returns the run summary. With a
+        `checkpoint`, transformed batches are spilled before loading and a
+        run that failed earlier is resumed from its spill (see RunCheckpoint);
+        a failed load then stops further loads but not the extraction, which
+        runs to the end so the retry doesn't read the source again.
+        """
+        raw_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        frame_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        rejected_counts: List[int] = []
+
+        def put(q: queue.Queue, item: Any) -> None:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+            raise _Stopped()
+
+        def get(q: queue.Queue) -> Any:
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            raise _Stopped()
+
+        def stage(target, out_queue: queue.Queue) -> None:
+            try:
+                target()
+            except _Stopped:
+                return
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+                return
+            try:
+                put(out_queue, _DONE)
+            except _Stopped:
+                pass
+
+        resumed: List[int] = []
+        source: Iterable[list] = batches
+        if checkpoint is not None:
+            resumed = checkpoint.unloaded()
+            if checkpoint.extracted:
+                # everything was extracted and spilled before the failure: only loads are left
+                source = ()
+            elif checkpoint.consumed:
+                # the batches consumed last time come from disk (or were rejected whole), not from the source
+                source = itertools.islice(batches, checkpoint.consumed, None)
+
+        def extract() -> None:
+            try:
+                for batch in source:
+                    put(raw_queue, batch)
+            finally:
+                # release the source generator (and its HTTP pool) when a later stage fails
+                close = getattr(batches, "close", None)
+                if close:
+                    close()
+
+        def transform() -> None:
+            while (batch := get(raw_queue)) is not _DONE:
+                if self.validator is not None:
+                    batch = self._reject_invalid(batch, rejected_counts)
+                    if not batch:
+                        if checkpoint is not None:
+                            # still counted, so a resumed extraction skips it too
+                            checkpoint.skip()
+                        continue
+                frame = self.transformer.run(batch)
+                put(frame_queue, (checkpoint.spill(frame) if checkpoint is not None else None, frame))
+            if checkpoint is not None:
+                checkpoint.mark_extracted()
+
+        def frames() -> Iterator[tuple]:
+            if checkpoint is not None:
+                yield from checkpoint.iter_unloaded(resumed)
+            while (item := get(frame_queue)) is not _DONE:
+                yield item
+
+        # a scope, not a reset or a snapshot: pipelines in other threads (jobs) record into the same
+        # collector, and the stage threads below get the scope through a copy of this context
+        with metrics.scope() as run_metrics:
+            threads = [
+                threading.Thread(target=contextvars.copy_context().run, args=(stage, extract, raw_queue),
+                                 name="pipeline-extract", daemon=True),
+                threading.Thread(target=contextvars.copy_context().run, args=(stage, transform, frame_queue),
+                                 name="pipeline-transform", daemon=True),
+            ]
+            for thread in threads:
+                thread.start()
+
+            logger.info({"event": "pipeline_start", "table": f"{dataset_id}.{table_id}", "queue_size": self.queue_size})
+            summary: Dict[str, Any] = {"status": "success", "batches": 0, "records": 0, "job_ids": []}
+            loaded_before = checkpoint.loaded if checkpoint is not None else 0
+            load_error: Optional[BaseException] = None
+            try:
+                for index, df in frames():
+                    if load_error is not None:
+                        # draining: the batch is spilled, the retry loads it without extracting again
+                        continue
+                    first = summary["batches"] == 0 and not loaded_before
+                    # only the first batch may create objects or truncate; the rest append to it
+                    try:
+                        result = self.loader.load(
+                            df=df,
+                            dataset_id=dataset_id,
+                            table_id=table_id,
+                            write_disposition=write_disposition if first else "WRITE_APPEND",
+                            create_dataset=create_dataset and first,
+                            create_table=create_table and first,
+                            table_schema=table_schema,
+                        )
+                    except Exception as e:
+                        if checkpoint is None:
+                            raise
+                        load_error = e
+                        logger.warning({"event": "pipeline_load_failed_spilling", "error": str(e),
+                                        "batches_loaded": summary["batches"]})
+                        continue
+                    if index is not None:
+                        checkpoint.mark_loaded(index, result)
+                    summary["batches"] += 1
+                    summary["records"] += len(df)
+                    if result.get("job_id"):
+                        summary["job_ids"].append(result["job_id"])
+                    if result.get("output_rows") is not None:
+                        summary["output_rows"] = summary.get("output_rows", 0) + result["output_rows"]
+                    logger.info({"event": "pipeline_batch_loaded", "batch": summary["batches"], "records": len(df)})
+                if load_error is not None:
+                    raise load_error
+            except _Stopped:
+                pass
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                stop.set()
+                for thread in threads:
+                    thread.join()
+
+        if errors:
+            logger.error({"event": "pipeline_error", "error": str(errors[0]), "batches_loaded": summary["batches"],
+                          "metrics": run_metrics.summary()})
+            raise errors[0]
+
+        if checkpoint is not None:
+            summary["resumed_batches"] = len(resumed)
+            checkpoint.complete()
+        if self.validator is not None:
+            summary["rejected"] = sum(rejected_counts)
+        if summary["batches"] == 0:
+            summary["status"] = "skipped"
+            summary["reason"] = "no_records"
+        summary["metrics"] = run_metrics.summary()
+        logger.info({"event": "pipeline_finished", **summary})
+        return summary
+
+    def _reject_invalid(self, batch: list, rejected_counts: List[int]) -> list:
+        valid, rejected = self.validator.validate_batch(batch)
+        if rejected:
+            rejected_counts.append(len(rejected))
+            logger.info({"event": "pipeline_rows_rejected", "records": len(rejected), "sample": rejected[0]["errors"]})
+            if self.dead_letter is not None:
+                self.dead_letter.write(rejected)
+        return valid
+
+
+def config_batches(extractor: Extractor, batch_size: Optional[int] = None,
+                   watermark: Optional[Watermark] = None,
+                   changes: Optional[ChangeDetector] = None) -> Iterator[List]:
+    """
+    Record batches from the source described by Config: concurrent endpoints
+    (API_ENDPOINTS), a streamed body (API_STREAM_FORMAT), pagination
+    (API_PAGINATION) or a single request.
+    """
+    return source_batches(
+        extractor,
+        batch_size=batch_size or Config.BATCH_SIZE,
+        watermark=watermark,
+        changes=changes,
+        endpoints=Config.API_ENDPOINTS,
+        stream_format=Config.API_STREAM_FORMAT,
+        pagination=Pagination(strategy=Config.API_PAGINATION, page_size=Config.API_PAGE_SIZE)
+        if Config.API_PAGINATION else None,
+    )
+
+
+def source_batches(extractor: Extractor, batch_size: int, watermark: Optional[Watermark] = None,
+                   changes: Optional[ChangeDetector] = None, endpoint: str = "",
+                   params: Optional[Dict[str, Any]] = None, endpoints: Optional[List[str]] = None, stream_format: str = "",
+                   pagination: Optional[Pagination] = None) -> Iterator[List]:
+    """
+    Record batches from the extractor's base URL: `endpoints` fetched
+    concurrently, a body streamed as `stream_format`, `pagination` over
+    `endpoint`, or a single request to it. With a `watermark`, its filter is
+    sent as request params and only records past it are yielded; with
+    `changes`, records already loaded with the same content are dropped.
+    Static `params` go with every request.
+    """
+    params = watermark.params(params) if watermark else params
+    if endpoints:
+        # imported here: httpx is only needed for concurrent endpoints and is slow to import
+        from src.etl.async_extractor import AsyncExtractor
+
+        async_extractor = AsyncExtractor(base_url=extractor.service.base_url, per_host_limit=Config.API_PER_HOST_LIMIT)
+        bodies = async_extractor.fetch_many_sync(endpoints, params=params)
+        records = (record for body in bodies for record in (body if isinstance(body, list) else [body]))
+        batches = batched(records, batch_size)
+    elif stream_format:
+        batches = extractor.stream_batches(endpoint=endpoint, params=params, batch_size=batch_size, fmt=stream_format)
+    elif pagination is not None:
+        records = (record for page in extractor.iter_pages(endpoint=endpoint, params=params, pagination=pagination)
+                   for record in page)
+        batches = batched(records, batch_size)
+    elif watermark is not None and watermark.kind == "etag":
+        # the conditional request already applies the watermark, skip the record filter
+        batches = batched(extractor.fetch_changed(watermark, endpoint=endpoint, params=params), batch_size)
+        watermark = None
+    else:
+        data = extractor.fetch_data(endpoint=endpoint, params=params)
+        batches = batched(data if isinstance(data, list) else [data], batch_size)
+
+    for batch in batches:
+        if watermark is not None:
+            batch = watermark.filter(batch)
+        if changes is not None:
+            batch = changes.filter(batch)
+        if batch:
+            yield batch
@@ -0,0 +1,115 @@
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Sequence
+
+from src.core.exceptions import ConfigError
+from src.core.logger import logger
+
+
+def _timed(func: Callable[[Any], Any], job: Any) -> Dict[str, Any]:
+    # runs in the worker; wall-clock start so process workers share the scheduler's clock
+    started = time.time()
+    result = func(job)
+    return {"result": result, "started": started, "wall_s": round(time.time() - started, 3)}
+
+
+def check_dag(jobs: Sequence[Any]) -> List[str]:
+    """
+    Job names in a dependency-respecting order; raises ConfigError on
+    duplicate names, unknown dependencies or cycles.
+    """
+    names = [job.name for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ConfigError(f"Jobs duplicados: {', '.join(duplicates)}")
+    deps = {job.name: set(job.depends_on) for job in jobs}
+    for name, required in deps.items():
+        unknown = required - deps.keys()
+        if unknown:
+            raise ConfigError(f"Job {name} depende de jobs inexistentes: {', '.join(sorted(unknown))}")
+
+    order: List[str] = []
+    ready = [name for name in names if not deps[name]]
+    remaining = {name: set(required) for name, required in deps.items() if required}
+    while ready:
+        name = ready.pop(0)
+        order.append(name)
+        for other in [other for other, required in remaining.items() if name in required]:
+            remaining[other].discard(name)
+            if not remaining[other]:
+                del remaining[other]
+                ready.append(other)
+    if remaining:
+        raise ConfigError(f"Dependências circulares entre jobs: {', '.join(sorted(remaining))}")
+    return order
+
+
+class DAGScheduler:
+    """
+    Runs jobs (objects with `name` and `depends_on`) on a thread or process
+    pool, each as soon as all of its dependencies have succeeded; jobs whose
+    dependencies failed are skipped. Independent jobs run in parallel, up to
+    `max_workers` at a time.
+
+    With executor="process", `func` and the jobs must be picklable and each
+    job runs in a fresh interpreter (spawned, not forked: the parent has
+    live threads, e.g. the log writer).
+    """
+
+    def __init__(self, max_workers: int = 4, executor: str = "thread"):
+        if executor not in ("thread", "process"):
+            raise ConfigError(f"Executor de jobs inválido: {executor}")
+        self.max_workers = max(1, max_workers)
+        self.executor = executor
+
+    def _pool(self):
+        if self.executor == "process":
+            return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="etl-job")
+
+    def run(self, jobs: Sequence[Any], func: Callable[[Any], Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Runs `func(job)` for every job; returns, per job name (in dependency
+        order), its status ("success", "error" or "skipped"), result or
+        error, start offset from the run's start and wall time.
+        """
+        order = check_dag(jobs)
+        by_name = {job.name: job for job in jobs}
+        pending = {name: set(by_name[name].depends_on) for name in order}
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        started = time.time()
+
+        with self._pool() as pool:
+            running: Dict[Future, str] = {}
+            while pending or running:
+                for name in list(pending):
+                    failed = sorted(dep for dep in pending[name] if outcomes.get(dep, {}).get("status") not in (None, "success"))
+                    if failed:
+                        del pending[name]
+                        outcomes[name] = {"status": "skipped", "reason": f"dependências sem sucesso: {', '.join(failed)}"}
+                        logger.warning({"event": "etl_job_skipped", "job": name, "failed_dependencies": failed})
+                    elif all(outcomes.get(dep, {}).get("status") == "success" for dep in pending[name]):
+                        del pending[name]
+                        logger.info({"event": "etl_job_start", "job": name})
+                        running[pool.submit(_timed, func, by_name[name])] = name
+                if not running:
+                    # whatever is left waits on a skipped job; the next pass skips it too
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        timed = future.result()
+                    except Exception as e:
+                        outcomes[name] = {"status": "error", "error": str(e)}
+                        logger.error({"event": "etl_job_error", "job": name, "error": str(e)})
+                        continue
+                    outcomes[name] = {
+                        "status": "success",
+                        "result": timed["result"],
+                        "started_s": round(timed["started"] - started, 3),
+                        "wall_s": timed["wall_s"],
+                    }
+                    logger.info({"event": "etl_job_success", "job": name, "wall_s": timed["wall_s"]})
+        return {name: outcomes[name] for name in order}
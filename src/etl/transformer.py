@@ -1,26 +1,91 @@
+from typing import Iterable, Iterator, List, Optional
+
 import pandas as pd
+import pyarrow as pa
+from google.cloud import bigquery
+
+from src.core.config import Config
 from src.core.logger import logger
+from src.core.metrics import metrics
 from src.core.exceptions import TransformError
+from src.models.schema_definition import IBGE_STATE_SCHEMA, to_arrow_schema
+from src.utils.serializers import coerce_series, flatten_struct_series, serialize_struct_series
+
+
+def clean_column_name(name: str) -> str:
+    """
+    Column name as clean_columns leaves it: lower case, spaces and dashes as underscores.
+    """
+    return str(name).lower().replace(" ", "_").replace("-", "_")
 
 
 class Transformer:
     """
-    Transform raw data into a clean pandas DataFrame.
+    Transform raw data into a clean pandas DataFrame, or into a pyarrow
+    Table with output_format="arrow". With a schema, pandas output is also
+    normalized column-wise against it (see `normalize`).
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, output_format: str = "pandas", schema: Optional[List[bigquery.SchemaField]] = None,
+                 flatten_structs: bool = False):
+        if output_format not in ("pandas", "arrow"):
+            raise TransformError(f"Formato de saída inválido: {output_format}")
+        self.output_format = output_format
+        self.schema = schema
+        self.flatten_structs = flatten_structs
+        self.arrow_schema = to_arrow_schema(schema) if schema else None
 
     def to_dataframe(self, raw_data: dict | list) -> pd.DataFrame:
         logger.info({"event": "transform_start"})
         try:
             df = pd.DataFrame(raw_data)
+            if self.schema and isinstance(raw_data, list):
+                self._restore_string_columns(df, raw_data)
             logger.info({"event": "transform_dataframe_success", "shape": df.shape})
             return df
         except Exception as e:
             logger.error({"event": "transform_error", "error": str(e)})
             raise TransformError(f"Erro ao transformar dados em DataFrame: {e}")
 
+    def _restore_string_columns(self, df: pd.DataFrame, records: list) -> None:
+        """
+        pandas turns ints with a missing value into float64, so STRING fields
+        would read "11.0" where validate_string gives "11": such columns are
+        rebuilt from the records' own values.
+        """
+        strings = {field.name for field in self.schema if field.field_type == "STRING" and field.mode != "REPEATED"}
+        for name in df.columns:
+            if clean_column_name(name) in strings and pd.api.types.is_float_dtype(df[name]):
+                values = [record.get(name) if isinstance(record, dict) else None for record in records]
+                df[name] = pd.Series(values, index=df.index, dtype=object)
+
+    def to_arrow(self, raw_data: dict | list) -> pa.Table:
+        """
+        Builds a pyarrow Table straight from the records. Keys get the same
+        cleaning as clean_columns. With a schema, columns are typed against
+        it (RECORD fields become struct columns, unknown keys are dropped);
+        without one, Arrow infers the types.
+        """
+        logger.info({"event": "transform_start", "output": "arrow"})
+        records = raw_data if isinstance(raw_data, list) else [raw_data]
+        try:
+            keys = set().union(*records)
+            if any(clean_column_name(key) != key for key in keys):
+                # only rebuilt when some key actually needs cleaning
+                records = [{clean_column_name(key): value for key, value in record.items()} for record in records]
+            table = pa.Table.from_pylist(records, schema=self.arrow_schema)
+        except Exception as e:
+            logger.error({"event": "transform_error", "error": str(e)})
+            raise TransformError(f"Erro ao transformar dados em Arrow: {e}")
+
+        for field in table.schema:
+            if not field.nullable and table.column(field.name).null_count:
+                logger.error({"event": "transform_error", "error": "required_field_null", "field": field.name})
+                raise TransformError(f"Campo obrigatório nulo: {field.name}")
+
+        logger.info({"event": "transform_arrow_success", "rows": table.num_rows, "columns": table.num_columns})
+        return table
+
     def clean_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         try:
             df.columns = (
@@ -35,7 +100,74 @@ class Transformer:
             logger.error({"event": "transform_clean_columns_error", "error": str(e)})
             raise TransformError(f"Erro ao limpar colunas: {e}")
 
-    def run(self, raw_data: dict | list) -> pd.DataFrame:
-        df = self.to_dataframe(raw_data)
-        df = self.clean_columns(df)
-        return df
+    def normalize(self, df: pd.DataFrame, schema: Optional[List[bigquery.SchemaField]] = None) -> pd.DataFrame:
+        """
+        Vectorized counterpart of RecordModel.serialize: typed coercion,
+        trimming and null handling applied to whole columns of the schema
+        fields (INT64/FLOAT64/STRING). RECORD columns are coerced per
+        sub-field and re-assembled into dicts, or expanded into
+        `<field>_<sub>` columns with flatten_structs=True. Columns outside
+        the schema are left untouched.
+        """
+        schema = schema or self.schema
+        if not schema:
+            return df
+        fields = {field.name: field for field in schema}
+        try:
+            columns = {}
+            for name in df.columns:
+                field = fields.get(name)
+                if field is None or field.mode == "REPEATED":
+                    columns[name] = df[name]
+                elif field.field_type in ("RECORD", "STRUCT"):
+                    sub_fields = {sub.name: sub.field_type for sub in field.fields}
+                    if self.flatten_structs:
+                        columns.update(flatten_struct_series(df[name], sub_fields, prefix=name).items())
+                    else:
+                        columns[name] = serialize_struct_series(df[name], sub_fields)
+                else:
+                    columns[name] = coerce_series(df[name], field.field_type)
+            normalized = pd.DataFrame(columns, index=df.index)
+            logger.info({"event": "transform_normalize", "columns": normalized.columns.tolist()})
+            return normalized
+        except Exception as e:
+            logger.error({"event": "transform_normalize_error", "error": str(e)})
+            raise TransformError(f"Erro ao normalizar colunas: {e}")
+
+    def run(self, raw_data: dict | list) -> pd.DataFrame | pa.Table:
+        with metrics.stage("transform", rows=len(raw_data) if isinstance(raw_data, list) else 1) as run:
+            if self.output_format == "arrow":
+                table = self.to_arrow(raw_data)
+                run.bytes_out = table.nbytes
+                return table
+            df = self.to_dataframe(raw_data)
+            df = self.clean_columns(df)
+            df = self.normalize(df)
+            # shallow size: a deep count would walk every object cell
+            run.bytes_out = int(df.memory_usage(index=False).sum())
+            return df
+
+    def run_batches(self, batches: Iterable[list]) -> Iterator[pd.DataFrame | pa.Table]:
+        """
+        Transforms record batches one at a time (e.g. from Extractor.stream_batches).
+        """
+        for batch in batches:
+            yield self.run(batch)
+
+
+def config_transformer(output_format: Optional[str] = None,
+                       schema: Optional[List[bigquery.SchemaField]] = IBGE_STATE_SCHEMA):
+    """
+    Transformer for `output_format` (default TRANSFORM_OUTPUT) typed against
+    `schema` (None = inferred). With TRANSFORM_WORKERS above one (or 0,
+    every available CPU) batches are sharded across a process pool; the
+    default transforms inline.
+    """
+    # imported here: parallel_transform builds on this module
+    from src.etl.parallel_transform import ParallelTransformer, available_cpus
+
+    transformer = Transformer(output_format=output_format or Config.TRANSFORM_OUTPUT, schema=schema)
+    workers = Config.TRANSFORM_WORKERS or available_cpus()
+    if workers <= 1:
+        return transformer
+    return ParallelTransformer(transformer, workers=workers, min_shard_rows=Config.TRANSFORM_MIN_SHARD_ROWS)
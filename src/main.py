@@ -1,37 +1,72 @@
 from src.core.config import Config
 from src.core.logger import logger
-from src.core.exceptions import ExtractError, TransformError, LoadError
+from src.core.exceptions import ConfigError, ExtractError, TransformError, LoadError
 
-from src.etl.extractor import Extractor
-from src.etl.transformer import Transformer
+from src.etl.extractor import config_extractor
+from src.etl.jobs import load_job_specs, run_jobs
+from src.etl.transformer import config_transformer
 from src.etl.loader import Loader
+from src.etl.pipeline import Pipeline, config_batches
+from src.etl.incremental import config_watermark
+from src.etl.change_detection import config_change_detector
+from src.etl.checkpoint import config_checkpoint
+from src.models.schema_definition import IBGE_STATE_SCHEMA
+from src.models.schema_validator import SchemaValidator
+from src.services.dead_letter_service import DeadLetterService
 
 
 def run_etl():
     logger.info({"event": "etl_start", "message": "Pipeline ETL iniciado localmente."})
     try:
         Config.validate()
-        extractor = Extractor(base_url=Config.API_URL)
-        transformer = Transformer()
-        loader = Loader(project_id=Config.PROJECT_ID, location=Config.BQ_LOCATION)
-
-        # Extract
-        raw = extractor.fetch_data()
-        # Transform
-        df = transformer.run(raw)
-        # Load
-        result = loader.load(
-            df=df,
+        if Config.ETL_JOBS:
+            result = run_jobs(load_job_specs(Config.ETL_JOBS), max_workers=Config.JOB_MAX_WORKERS,
+                              executor=Config.JOB_EXECUTOR)
+            logger.info({"event": "etl_finished", "status": result["status"], "load_result": result})
+            return result
+
+        extractor = config_extractor()
+        transformer = config_transformer()
+        loader = Loader(
+            project_id=Config.PROJECT_ID,
+            location=Config.BQ_LOCATION,
+            mode=Config.LOAD_MODE,
+            stream_type=Config.BQ_STREAM_TYPE,
+            merge_keys=Config.MERGE_KEYS,
+        )
+        watermark = config_watermark(loader.bq)
+        changes = config_change_detector(loader.bq)
+        checkpoint = config_checkpoint(trackers=(watermark, changes))
+        validator = SchemaValidator(IBGE_STATE_SCHEMA) if Config.VALIDATE_RECORDS else None
+        pipeline = Pipeline(
+            transformer,
+            loader,
+            queue_size=Config.PIPELINE_QUEUE_SIZE,
+            validator=validator,
+            dead_letter=DeadLetterService(Config.DEAD_LETTER_PATH, source=Config.API_URL),
+        )
+
+        # Extract -> Transform -> Load, batch by batch
+        result = pipeline.run(
+            config_batches(extractor, watermark=watermark, changes=changes),
             dataset_id=Config.DATASET,
             table_id=Config.TABLE,
             write_disposition="WRITE_APPEND",
             create_dataset=True,
             create_table=False,
-            table_schema=None
+            table_schema=None,
+            checkpoint=checkpoint,
         )
 
+        # advance the watermark and fingerprints only once everything up to them is loaded
+        if watermark is not None:
+            watermark.commit()
+        if changes is not None:
+            changes.commit()
+
         logger.info({"event": "etl_finished", "status": "success", "load_result": result})
-    except (ExtractError, TransformError, LoadError) as e:
+        return result
+    except (ExtractError, TransformError, LoadError, ConfigError) as e:
         logger.error({"event": "etl_error", "error": str(e)})
     except Exception as e:
         logger.error({"event": "etl_unexpected_error", "error": str(e)})
@@ -1,3 +1,6 @@
+from typing import List
+
+import pyarrow as pa
 from google.cloud import bigquery
 
 
@@ -16,3 +19,38 @@ IBGE_STATE_SCHEMA = [
         ],
     ),
 ]
+
+
+_ARROW_TYPES = {
+    "INT64": pa.int64(),
+    "INTEGER": pa.int64(),
+    "FLOAT64": pa.float64(),
+    "FLOAT": pa.float64(),
+    "NUMERIC": pa.decimal128(38, 9),
+    "BIGNUMERIC": pa.decimal256(76, 38),
+    "BOOL": pa.bool_(),
+    "BOOLEAN": pa.bool_(),
+    "STRING": pa.string(),
+    "BYTES": pa.binary(),
+    "DATE": pa.date32(),
+    "DATETIME": pa.timestamp("us"),
+    "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+    "TIME": pa.time64("us"),
+}
+
+
+def to_arrow_field(field: bigquery.SchemaField) -> pa.Field:
+    if field.field_type in ("RECORD", "STRUCT"):
+        arrow_type = pa.struct([to_arrow_field(sub) for sub in field.fields])
+    else:
+        arrow_type = _ARROW_TYPES[field.field_type]
+    if field.mode == "REPEATED":
+        arrow_type = pa.list_(arrow_type)
+    return pa.field(field.name, arrow_type, nullable=field.mode != "REQUIRED")
+
+
+def to_arrow_schema(schema: List[bigquery.SchemaField]) -> pa.Schema:
+    """
+    Arrow schema equivalent of a BigQuery schema (RECORD -> struct, REPEATED -> list).
+    """
+    return pa.schema([to_arrow_field(field) for field in schema])
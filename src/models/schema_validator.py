@@ -0,0 +1,185 @@
+import math
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from google.cloud import bigquery
+
+_INT_RE = re.compile(r"\s*[+-]?[0-9]+\s*")
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+# A checker returns None when the value is acceptable, otherwise a short reason.
+Checker = Callable[[Any], Optional[str]]
+
+
+def _is_null(value: Any) -> bool:
+    return value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value))
+
+
+def _check_int(value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return "esperado INT64, recebido bool"
+    if isinstance(value, int):
+        number = value
+    elif isinstance(value, float) and value.is_integer():
+        number = int(value)
+    elif isinstance(value, str) and _INT_RE.fullmatch(value):
+        number = int(value)
+    else:
+        return f"esperado INT64, recebido {type(value).__name__}"
+    return None if _INT64_MIN <= number <= _INT64_MAX else "INT64 fora do intervalo"
+
+
+def _check_float(value: Any) -> Optional[str]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        try:
+            float(value)
+            return None
+        except ValueError:
+            pass
+    return f"esperado FLOAT64, recebido {type(value).__name__}"
+
+
+def _check_numeric(value: Any) -> Optional[str]:
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        try:
+            Decimal(value)
+            return None
+        except InvalidOperation:
+            pass
+    return f"esperado NUMERIC, recebido {type(value).__name__}"
+
+
+def _check_string(value: Any) -> Optional[str]:
+    # scalars are stringified by the Transformer; containers are not
+    if isinstance(value, (str, int, float, bool)):
+        return None
+    return f"esperado STRING, recebido {type(value).__name__}"
+
+
+def _check_bool(value: Any) -> Optional[str]:
+    if isinstance(value, bool) or (isinstance(value, str) and value.lower() in ("true", "false")):
+        return None
+    return f"esperado BOOL, recebido {type(value).__name__}"
+
+
+def _check_bytes(value: Any) -> Optional[str]:
+    return None if isinstance(value, (bytes, str)) else f"esperado BYTES, recebido {type(value).__name__}"
+
+
+def _iso_checker(field_type: str, accepted: tuple, parse: Callable[[str], Any]) -> Checker:
+    def check(value: Any) -> Optional[str]:
+        if isinstance(value, accepted):
+            return None
+        if isinstance(value, str):
+            try:
+                parse(value)
+                return None
+            except ValueError:
+                return f"{field_type} inválido: {value!r}"
+        return f"esperado {field_type}, recebido {type(value).__name__}"
+    return check
+
+
+_SCALAR_CHECKERS: Dict[str, Checker] = {
+    "INT64": _check_int,
+    "INTEGER": _check_int,
+    "FLOAT64": _check_float,
+    "FLOAT": _check_float,
+    "NUMERIC": _check_numeric,
+    "BIGNUMERIC": _check_numeric,
+    "STRING": _check_string,
+    "BOOL": _check_bool,
+    "BOOLEAN": _check_bool,
+    "BYTES": _check_bytes,
+    "DATE": _iso_checker("DATE", (date,), date.fromisoformat),
+    "DATETIME": _iso_checker("DATETIME", (datetime,), datetime.fromisoformat),
+    "TIMESTAMP": _iso_checker("TIMESTAMP", (datetime,), datetime.fromisoformat),
+}
+
+
+def _compile_record(fields: List[bigquery.SchemaField], ignore_unknown: bool) -> Callable[[Any, str, List[str]], None]:
+    compiled = [(field.name, field.mode or "NULLABLE", _compile_field(field, ignore_unknown)) for field in fields]
+    known = {field.name for field in fields}
+
+    def check_record(record: Any, path: str, errors: List[str]) -> None:
+        if not isinstance(record, dict):
+            errors.append(f"{path or 'registro'}: esperado objeto, recebido {type(record).__name__}")
+            return
+        for name, mode, check_value in compiled:
+            value = record.get(name)
+            field_path = f"{path}.{name}" if path else name
+            if _is_null(value):
+                if mode == "REQUIRED":
+                    errors.append(f"{field_path}: campo obrigatório ausente")
+                continue
+            if mode == "REPEATED":
+                if not isinstance(value, list):
+                    errors.append(f"{field_path}: esperado lista, recebido {type(value).__name__}")
+                    continue
+                for index, item in enumerate(value):
+                    check_value(item, f"{field_path}[{index}]", errors)
+            else:
+                check_value(value, field_path, errors)
+        if not ignore_unknown:
+            for name in record.keys() - known:
+                errors.append(f"{path + '.' if path else ''}{name}: campo fora do schema")
+
+    return check_record
+
+
+def _compile_field(field: bigquery.SchemaField, ignore_unknown: bool) -> Callable[[Any, str, List[str]], None]:
+    if field.field_type in ("RECORD", "STRUCT"):
+        return _compile_record(list(field.fields), ignore_unknown)
+
+    checker = _SCALAR_CHECKERS.get(field.field_type)
+    if checker is None:
+        return lambda value, path, errors: None
+
+    def check_scalar(value: Any, path: str, errors: List[str]) -> None:
+        reason = checker(value)
+        if reason:
+            errors.append(f"{path}: {reason}")
+
+    return check_scalar
+
+
+class SchemaValidator:
+    """
+    Row validator compiled once from a BigQuery schema (REQUIRED/NULLABLE/
+    REPEATED modes, scalar types and nested RECORDs). Values are accepted
+    when they are of, or coercible to, the column type, so bad rows are
+    caught locally instead of failing the whole load job.
+    """
+
+    def __init__(self, schema: List[bigquery.SchemaField], ignore_unknown: bool = True):
+        self.schema = schema
+        self._check = _compile_record(schema, ignore_unknown)
+
+    def errors(self, record: Any) -> List[str]:
+        errors: List[str] = []
+        self._check(record, "", errors)
+        return errors
+
+    def validate_batch(self, records: List[Any]) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """
+        Splits a batch into (valid records, dead letters). Each dead letter
+        is {"record": <original record>, "errors": [<reason>, ...]}.
+        """
+        valid: List[Any] = []
+        rejected: List[Dict[str, Any]] = []
+        check = self._check
+        for record in records:
+            errors: List[str] = []
+            check(record, "", errors)
+            if errors:
+                rejected.append({"record": record, "errors": errors})
+            else:
+                valid.append(record)
+        return valid, rejected
@@ -1,14 +1,81 @@
 import time
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import requests
-from typing import Optional, Any, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from typing import Optional, Any, Dict, Iterator
 
 from src.core.logger import logger
+from src.core.metrics import metrics
 from src.core.exceptions import ExtractError
+from src.services.http_cache import HTTPCache
+from src.services.rate_limit import AdaptiveConcurrency, TokenBucket
+
+
+THROTTLING_STATUSES = (429, 503)
+RETRYABLE_CLIENT_STATUSES = (408, 429)
+
+_SESSIONS: Dict[int, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_session(pool_size: int = 10) -> requests.Session:
+    """
+    Process-wide keep-alive session, one per pool size.
+
+    Module state survives warm Cloud Function invocations, so open
+    connections (and their TLS sessions) are reused across requests,
+    retries, endpoints and Extractor instances. Retries stay in APIService,
+    hence max_retries=0 on the adapter. Accept-Encoding advertises every
+    codec urllib3 can decode here (gzip/deflate, br when brotli is installed).
+    """
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(pool_size)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+            _SESSIONS[pool_size] = session
+        return session
+
+
+def _body_size(resp: requests.Response, stream: bool) -> int:
+    """Body bytes received; for a stream, as announced (the body is still unread)."""
+    if stream:
+        try:
+            return int(resp.headers.get("Content-Length") or 0)
+        except (TypeError, ValueError):
+            return 0
+    return len(resp.content or b"")
+
+
+def _retry_after(resp: Optional[requests.Response]) -> Optional[float]:
+    """Seconds asked for by a Retry-After header (delay or HTTP date), if any."""
+    value = resp.headers.get("Retry-After") if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
 
 
 class APIService:
     """
     HTTP client with exponential backoff retries, timeout and structured logs.
+
+    429/503 answers wait for their Retry-After (capped at max_retry_after)
+    instead of the backoff; other 4xx answers fail at once. An optional
+    TokenBucket caps the request rate and an AdaptiveConcurrency bounds the
+    requests in flight, both shared by every thread using this service.
     """
 
     def __init__(
@@ -18,39 +85,134 @@ class APIService:
         max_retries: int = 3,
         backoff_factor: float = 1.5,
         headers: Optional[Dict[str, str]] = None,
+        pool_size: int = 10,
+        session: Optional[requests.Session] = None,
+        cache: Optional[HTTPCache] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        max_retry_after: float = 60,
     ):
         self.base_url = base_url
         self.timeout = timeout
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
         self.headers = headers or {"Content-Type": "application/json"}
+        self.session = session or get_session(pool_size)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.max_retry_after = max_retry_after
 
-    def get(self, endpoint: str = "", params: Optional[Dict[str, Any]] = None) -> Any:
-        url = f"{self.base_url}{endpoint}"
+    def get_response(
+        self,
+        endpoint: str = "",
+        params: Optional[Dict[str, Any]] = None,
+        url: Optional[str] = None,
+        stream: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> requests.Response:
+        """
+        GET with retries, returning the raw response (headers included).
+        `url` overrides base_url + endpoint, e.g. for Link header pagination.
+        With `stream=True` the body is left unread on the socket.
+        `headers` are added to the service headers for this request only.
+        """
+        url = url or f"{self.base_url}{endpoint}"
+        request_headers = {**self.headers, **headers} if headers else self.headers
         for attempt in range(1, self.max_retries + 1):
             logger.info({
                 "event": "api_request_start",
                 "url": url,
                 "attempt": attempt
             })
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if self.concurrency is not None:
+                self.concurrency.acquire()
+            resp = None
+            started = time.monotonic()
             try:
-                resp = requests.get(url, headers=self.headers, timeout=self.timeout, params=params)
+                with metrics.stage("api_request") as run:
+                    resp = self.session.get(url, headers=request_headers, timeout=self.timeout, params=params, stream=stream)
+                    run.bytes_in = _body_size(resp, stream)
                 resp.raise_for_status()
                 logger.info({
                     "event": "api_request_success",
                     "status_code": resp.status_code
                 })
-                return resp.json()
+                return resp
             except Exception as e:
+                status = getattr(resp, "status_code", None)
                 logger.error({
                     "event": "api_request_error",
                     "url": url,
                     "attempt": attempt,
+                    "status_code": status,
                     "error": str(e)
                 })
-                if attempt < self.max_retries:
-                    sleep_time = self.backoff_factor ** attempt
-                    logger.info({"event": "api_retry_wait", "sleep_seconds": sleep_time})
-                    time.sleep(sleep_time)
-                else:
+                if isinstance(status, int) and 400 <= status < 500 and status not in RETRYABLE_CLIENT_STATUSES:
+                    # the request itself is wrong: repeating it can't help
+                    raise ExtractError(f"Failed to GET {url}: {e}")
+                if attempt >= self.max_retries:
                     raise ExtractError(f"Failed to GET {url} after {self.max_retries} attempts: {e}")
+                sleep_time = self.backoff_factor ** attempt
+                if status in THROTTLING_STATUSES:
+                    retry_after = _retry_after(resp)
+                    if retry_after is not None:
+                        sleep_time = min(retry_after, self.max_retry_after)
+                    if self.rate_limiter is not None:
+                        # hold every request sharing the limiter, not just this one
+                        self.rate_limiter.pause(sleep_time)
+            finally:
+                if self.concurrency is not None:
+                    status_code = getattr(resp, "status_code", None)
+                    # only answers the source actually served (2xx/304) count towards raising the limit
+                    succeeded = isinstance(status_code, int) and (200 <= status_code < 300 or status_code == 304)
+                    self.concurrency.release(time.monotonic() - started,
+                                             throttled=status_code in THROTTLING_STATUSES, succeeded=succeeded)
+            # waits outside the concurrency slot, so other requests may proceed
+            logger.info({"event": "api_retry_wait", "sleep_seconds": sleep_time, "status_code": status})
+            time.sleep(sleep_time)
+
+    def get(self, endpoint: str = "", params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET returning the JSON body. With a cache, the request is made
+        conditional on the cached validators and a 304 returns the cached
+        value.
+        """
+        if self.cache is None:
+            return self.get_response(endpoint=endpoint, params=params).json()
+
+        key = self.cache.key(f"{self.base_url}{endpoint}", params)
+        validators = self.cache.validators(key)
+        resp = self.get_response(endpoint=endpoint, params=params, headers=validators)
+        if resp.status_code == 304:
+            try:
+                value = self.cache.get(key)
+                logger.info({"event": "api_cache_hit", "url": resp.url})
+                return value
+            except KeyError:
+                # evicted between the lookup and the answer: fetch it again
+                resp = self.get_response(endpoint=endpoint, params=params)
+        value = resp.json()
+        self.cache.put(key, resp.headers, resp.content, value)
+        return value
+
+    def iter_content(
+        self,
+        endpoint: str = "",
+        params: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 64 * 1024,
+    ) -> Iterator[bytes]:
+        """
+        Streams the (already decompressed) response body in chunks.
+        Retries cover opening the response only; a failure mid-body raises.
+        """
+        resp = self.get_response(endpoint=endpoint, params=params, stream=True)
+        try:
+            yield from resp.iter_content(chunk_size=chunk_size)
+        except Exception as e:
+            logger.error({"event": "api_stream_error", "url": resp.url, "error": str(e)})
+            raise ExtractError(f"Falha ao ler o corpo de {resp.url}: {e}")
+        finally:
+            resp.close()
@@ -0,0 +1,100 @@
+import asyncio
+import httpx
+from typing import Optional, Any, Dict
+
+from src.core.logger import logger
+from src.core.exceptions import ExtractError
+
+
+class AsyncAPIService:
+    """
+    asyncio counterpart of APIService: one pooled httpx.AsyncClient,
+    a concurrency cap per host and non-blocking (asyncio.sleep) backoff.
+
+    Use as an async context manager so the client is closed on exit.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 1.5,
+        headers: Optional[Dict[str, str]] = None,
+        per_host_limit: int = 10,
+        max_connections: int = 100,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.headers = headers or {"Content-Type": "application/json"}
+        self.per_host_limit = per_host_limit
+        self.max_connections = max_connections
+        self._client = client
+        self._owns_client = client is None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "AsyncAPIService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = httpx.URL(url).host
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphore
+
+    async def get(self, endpoint: str = "", params: Optional[Dict[str, Any]] = None) -> Any:
+        url = f"{self.base_url}{endpoint}"
+        semaphore = self._host_semaphore(url)
+        for attempt in range(1, self.max_retries + 1):
+            logger.info({
+                "event": "api_request_start",
+                "url": url,
+                "attempt": attempt
+            })
+            try:
+                # the host slot is held only while the request is in flight, not during backoff
+                async with semaphore:
+                    resp = await self.client.get(url, headers=self.headers, params=params)
+                resp.raise_for_status()
+                logger.info({
+                    "event": "api_request_success",
+                    "status_code": resp.status_code
+                })
+                return resp.json()
+            except Exception as e:
+                logger.error({
+                    "event": "api_request_error",
+                    "url": url,
+                    "attempt": attempt,
+                    "error": str(e)
+                })
+                if attempt < self.max_retries:
+                    sleep_time = self.backoff_factor ** attempt
+                    logger.info({"event": "api_retry_wait", "sleep_seconds": sleep_time})
+                    await asyncio.sleep(sleep_time)
+                else:
+                    raise ExtractError(f"Failed to GET {url} after {self.max_retries} attempts: {e}")
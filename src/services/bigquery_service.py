@@ -1,25 +1,56 @@
-from typing import Optional, List, Dict, Any
+import io
+import uuid
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from google.cloud import bigquery
 from google.api_core.exceptions import NotFound, Conflict
 
 from src.core.logger import logger
+from src.core.metrics import metrics
 from src.core.exceptions import LoadError
+from src.services.metadata_cache import METADATA_CACHE, MetadataCache
+from src.services.query_cache import (
+    QUERY_CACHE,
+    QueryCache,
+    has_unqualified_tables,
+    is_cacheable,
+    referenced_tables,
+)
+from src.services.storage_write_service import StorageWriteService, WriteBackend
 
 
 class BigQueryService:
     """
     High-level BigQuery operations:
-    - create dataset/table if not exists
-    - load DataFrame safely
-    - run queries returning list[dict]
+    - create dataset/table if not exists (existence cached process-wide)
+    - load DataFrame (or Arrow table) safely
+    - upsert through a staging table + MERGE
+    - run queries returning list[dict] (cached client-side), or streamed as pages / Arrow batches
     """
 
-    def __init__(self, project_id: str, location: str = "US"):
+    def __init__(self, project_id: str, location: str = "US", write_backend: Optional[WriteBackend] = None,
+                 metadata_cache: Optional[MetadataCache] = None, client: Optional[bigquery.Client] = None,
+                 query_cache: Optional[QueryCache] = None):
         self.project_id = project_id
         self.location = location
-        self.client = bigquery.Client(project=self.project_id)
+        self.client = client or bigquery.Client(project=self.project_id)
+        self.metadata_cache = metadata_cache if metadata_cache is not None else METADATA_CACHE
+        self.query_cache = query_cache if query_cache is not None else QUERY_CACHE
+        self._write_backend = write_backend
+        self._storage_writer: Optional[StorageWriteService] = None
+        self._read_client = None
+
+    @property
+    def storage_writer(self) -> StorageWriteService:
+        # created on first use: the Storage Write client is only needed in streaming mode
+        if self._storage_writer is None:
+            self._storage_writer = StorageWriteService(self.project_id, backend=self._write_backend)
+        return self._storage_writer
 
     def _dataset_ref(self, dataset_id: str) -> bigquery.DatasetReference:
         return bigquery.DatasetReference(self.project_id, dataset_id)
@@ -28,9 +59,13 @@ class BigQueryService:
         return self._dataset_ref(dataset_id).table(table_id)
 
     def create_dataset_if_not_exists(self, dataset_id: str, description: Optional[str] = None) -> None:
+        cache_key = (self.project_id, dataset_id)
+        if self.metadata_cache.get(cache_key):
+            return
         dataset_ref = self._dataset_ref(dataset_id)
         try:
             self.client.get_dataset(dataset_ref)
+            self.metadata_cache.set(cache_key)
             logger.info({"event": "bigquery_dataset_exists", "dataset": f"{self.project_id}.{dataset_id}"})
             return
         except NotFound:
@@ -46,11 +81,16 @@ class BigQueryService:
             except Exception as e:
                 logger.error({"event": "bigquery_dataset_create_error", "dataset": dataset_id, "error": str(e)})
                 raise LoadError(f"Erro ao criar dataset {dataset_id}: {e}")
+            self.metadata_cache.set(cache_key)
 
     def create_table_if_not_exists(self, dataset_id: str, table_id: str, schema: Optional[List[bigquery.SchemaField]] = None) -> None:
+        cache_key = (self.project_id, dataset_id, table_id)
+        if self.metadata_cache.get(cache_key):
+            return
         table_ref = self._table_ref(dataset_id, table_id)
         try:
             self.client.get_table(table_ref)
+            self.metadata_cache.set(cache_key)
             logger.info({"event": "bigquery_table_exists", "table": f"{self.project_id}.{dataset_id}.{table_id}"})
             return
         except NotFound:
@@ -63,6 +103,15 @@ class BigQueryService:
             except Exception as e:
                 logger.error({"event": "bigquery_table_create_error", "table": f"{dataset_id}.{table_id}", "error": str(e)})
                 raise LoadError(f"Erro ao criar tabela {dataset_id}.{table_id}: {e}")
+            self.metadata_cache.set(cache_key)
+
+    def invalidate_metadata(self, dataset_id: str, table_id: Optional[str] = None) -> None:
+        """
+        Forgets cached metadata for a table, or for a dataset and all its
+        tables, e.g. after dropping them outside this service.
+        """
+        key = (self.project_id, dataset_id) if table_id is None else (self.project_id, dataset_id, table_id)
+        self.metadata_cache.invalidate(key)
 
     def load_dataframe(
         self,
@@ -79,17 +128,286 @@ class BigQueryService:
             logger.info({"event": "bigquery_load_skipped", "reason": "empty_dataframe"})
             return {"status": "skipped", "reason": "empty_dataframe"}
 
+        table_ref = self._prepare_target(dataset_id, table_id, create_dataset, create_table, table_schema)
+        table_id_full = f"{self.project_id}.{dataset_id}.{table_id}"
+
+        logger.info({"event": "bigquery_load_start", "table": table_id_full, "records": len(df)})
+
+        job_config = self._load_job_config(write_disposition, table_schema, job_labels)
+
+        try:
+            with metrics.stage("load", rows=len(df)):
+                load_job = self.client.load_table_from_dataframe(df, table_ref, job_config=job_config, location=self.location)
+                return self._wait_load(load_job, table_ref, table_id_full)
+        except Exception as e:
+            logger.error({"event": "bigquery_load_error", "table": table_id_full, "error": str(e)})
+            raise LoadError(f"Erro ao carregar DataFrame no BigQuery: {e}")
+
+    def load_arrow(
+        self,
+        table: pa.Table,
+        dataset_id: str,
+        table_id: str,
+        write_disposition: str = "WRITE_APPEND",
+        create_dataset: bool = True,
+        create_table: bool = False,
+        table_schema: Optional[List[bigquery.SchemaField]] = None,
+        job_labels: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Loads a pyarrow Table as an in-memory Parquet file, skipping the
+        pandas conversion of load_table_from_dataframe. Struct columns land
+        as RECORD fields.
+        """
+        if table is None or table.num_rows == 0:
+            logger.info({"event": "bigquery_load_skipped", "reason": "empty_table"})
+            return {"status": "skipped", "reason": "empty_table"}
+
+        table_ref = self._prepare_target(dataset_id, table_id, create_dataset, create_table, table_schema)
+        table_id_full = f"{self.project_id}.{dataset_id}.{table_id}"
+
+        logger.info({"event": "bigquery_load_start", "table": table_id_full, "records": table.num_rows, "format": "arrow"})
+
+        job_config = self._parquet_job_config(write_disposition, table_schema, job_labels)
+
+        try:
+            with metrics.stage("load", rows=table.num_rows, bytes_in=table.nbytes) as run:
+                buffer = _to_parquet(table)
+                run.bytes_out = buffer.getbuffer().nbytes
+                load_job = self.client.load_table_from_file(buffer, table_ref, job_config=job_config, location=self.location)
+                return self._wait_load(load_job, table_ref, table_id_full)
+        except Exception as e:
+            logger.error({"event": "bigquery_load_error", "table": table_id_full, "error": str(e)})
+            raise LoadError(f"Erro ao carregar tabela Arrow no BigQuery: {e}")
+
+    def bulk_load(
+        self,
+        data: pd.DataFrame | pa.Table | Iterable[pd.DataFrame | pa.Table],
+        dataset_id: str,
+        table_id: str,
+        write_disposition: str = "WRITE_APPEND",
+        create_dataset: bool = True,
+        create_table: bool = False,
+        table_schema: Optional[List[bigquery.SchemaField]] = None,
+        job_labels: Optional[Dict[str, str]] = None,
+        shard_rows: int = 500_000,
+        max_workers: int = 4,
+        partition_field: Optional[str] = None,
+        partition_type: str = "DAY",
+    ) -> Dict[str, Any]:
+        """
+        Fan-out load: splits `data` (a frame, an Arrow table or a stream of
+        them) into shards, serializes each shard to Parquet on a worker pool
+        and submits one load job per shard, then waits on all jobs together.
+
+        With `partition_field`, rows are grouped by partition and each group
+        goes to its own `table$<partition>` decorator, so WRITE_TRUNCATE
+        replaces only the touched partitions. A WRITE_TRUNCATE or WRITE_EMPTY
+        disposition applies to the first shard of each target (the table, or
+        each partition) and is loaded before that target's other shards,
+        which append.
+        """
+        table_ref = self._prepare_target(dataset_id, table_id, create_dataset, create_table, table_schema)
+        table_id_full = f"{self.project_id}.{dataset_id}.{table_id}"
+
+        shards = self._iter_shards(data, shard_rows, partition_field, partition_type)
+        logger.info({"event": "bigquery_bulk_load_start", "table": table_id_full, "workers": max_workers,
+                     "partition_field": partition_field})
+
+        def submit(shard: pa.Table, partition: Optional[str], disposition: str):
+            destination = self._table_ref(dataset_id, f"{table_id}${partition}") if partition else table_ref
+            job_config = self._parquet_job_config(disposition, table_schema, job_labels)
+            return self.client.load_table_from_file(
+                _to_parquet(shard), destination, job_config=job_config, location=self.location
+            )
+
+        def submit_and_wait(shard: pa.Table, partition: Optional[str], disposition: str):
+            job = submit(shard, partition, disposition)
+            job.result()
+            return job
+
+        jobs = []
+        # per target (None = the whole table): the job applying write_disposition
+        first_loads: Dict[Optional[str], Any] = {}
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                futures = []
+                for shard, partition in shards:
+                    # bound the shards waiting for a worker, so a long stream isn't buffered whole
+                    in_flight = [future for future in futures if not future.done()]
+                    if len(in_flight) >= 2 * max_workers:
+                        wait(in_flight, return_when=FIRST_COMPLETED)
+                    if write_disposition != "WRITE_APPEND":
+                        first_load = first_loads.get(partition)
+                        if first_load is None:
+                            # the disposition must hit each target once, before its appends run
+                            first_loads[partition] = pool.submit(submit_and_wait, shard, partition, write_disposition)
+                            futures.append(first_loads[partition])
+                            continue
+                        first_load.result()
+                    futures.append(pool.submit(submit, shard, partition, "WRITE_APPEND"))
+                jobs.extend(future.result() for future in futures)
+        except Exception as e:
+            logger.error({"event": "bigquery_bulk_load_error", "table": table_id_full, "error": str(e)})
+            raise LoadError(f"Erro ao submeter cargas em paralelo no BigQuery: {e}")
+
+        if not jobs:
+            logger.info({"event": "bigquery_load_skipped", "reason": "empty_data"})
+            return {"status": "skipped", "reason": "empty_data"}
+
+        failures = []
+        for job in jobs:
+            try:
+                job.result()
+            except Exception as e:
+                if isinstance(e, NotFound):
+                    self.invalidate_metadata(dataset_id)
+                failures.append(f"{job.job_id}: {e}")
+        if failures:
+            logger.error({"event": "bigquery_bulk_load_error", "table": table_id_full, "failed_jobs": failures})
+            raise LoadError(f"{len(failures)} de {len(jobs)} cargas falharam: {'; '.join(failures)}")
+
+        self._invalidate_queries(table_id_full)
+        output_rows = sum(job.output_rows or 0 for job in jobs)
+        job_ids = [job.job_id for job in jobs]
+        logger.info({"event": "bigquery_bulk_load_success", "table": table_id_full, "jobs": len(jobs),
+                     "output_rows": output_rows})
+        return {"status": "success", "job_ids": job_ids, "jobs": len(jobs), "output_rows": output_rows}
+
+    def merge_load(
+        self,
+        data: pd.DataFrame | pa.Table,
+        dataset_id: str,
+        table_id: str,
+        key_columns: List[str],
+        create_dataset: bool = True,
+        create_table: bool = False,
+        table_schema: Optional[List[bigquery.SchemaField]] = None,
+        job_labels: Optional[Dict[str, str]] = None,
+        staging_ttl_minutes: int = 60,
+    ) -> Dict[str, Any]:
+        """
+        Upsert: loads `data` into a staging table next to the target, then
+        MERGEs it on `key_columns`, updating rows whose values changed and
+        inserting new keys. Rows with a NULL key are rejected (they never
+        match, so they would be inserted again on every run); when a key
+        repeats, its last row wins. The staging table is dropped afterwards
+        (and expires on its own if the cleanup never runs). The target table
+        must exist, or be created through `create_table` + `table_schema`.
+        """
+        columns = list(data.column_names if isinstance(data, pa.Table) else data.columns)
+        missing = [key for key in key_columns if key not in columns]
+        if not key_columns or missing:
+            raise LoadError(f"Colunas-chave ausentes para o MERGE: {missing or key_columns}")
+        data = _last_row_per_key(data, key_columns)
+        if len(data) == 0:
+            logger.info({"event": "bigquery_load_skipped", "reason": "empty_data"})
+            return {"status": "skipped", "reason": "empty_data"}
+
+        self._prepare_target(dataset_id, table_id, create_dataset, create_table, table_schema)
+        staging_id = f"{table_id}__staging_{uuid.uuid4().hex[:12]}"
+        staging_ref = self._table_ref(dataset_id, staging_id)
+        table_id_full = f"{self.project_id}.{dataset_id}.{table_id}"
+
+        try:
+            staging = bigquery.Table(staging_ref, schema=table_schema)
+            staging.expires = datetime.now(timezone.utc) + timedelta(minutes=staging_ttl_minutes)
+            self.client.create_table(staging)
+            load = self.load_arrow if isinstance(data, pa.Table) else self.load_dataframe
+            staged = load(data, dataset_id, staging_id, write_disposition="WRITE_TRUNCATE",
+                          create_dataset=False, table_schema=table_schema, job_labels=job_labels)
+            self.run_query(
+                merge_statement(table_id_full, f"{self.project_id}.{dataset_id}.{staging_id}", columns, key_columns),
+                job_config=bigquery.QueryJobConfig(labels=job_labels) if job_labels else None,
+            )
+        except Exception as e:
+            logger.error({"event": "bigquery_merge_error", "table": table_id_full, "error": str(e)})
+            raise LoadError(f"Erro no MERGE em {table_id_full}: {e}")
+        finally:
+            try:
+                self.client.delete_table(staging_ref, not_found_ok=True)
+            except Exception as e:
+                logger.error({"event": "bigquery_staging_cleanup_error", "table": staging_id, "error": str(e)})
+
+        logger.info({"event": "bigquery_merge_success", "table": table_id_full, "staged_rows": staged.get("output_rows"),
+                     "keys": key_columns})
+        return {"status": "success", "job_id": staged.get("job_id"), "output_rows": staged.get("output_rows"),
+                "merge_keys": key_columns}
+
+    @staticmethod
+    def _iter_shards(data, shard_rows: int, partition_field: Optional[str],
+                     partition_type: str) -> Iterator[Tuple[pa.Table, Optional[str]]]:
+        frames = [data] if isinstance(data, (pd.DataFrame, pa.Table)) else data
+        for frame in frames:
+            table = frame if isinstance(frame, pa.Table) else pa.Table.from_pandas(frame, preserve_index=False)
+            if table.num_rows == 0:
+                continue
+            if partition_field:
+                keys = _partition_keys(table.column(partition_field).to_pandas(), partition_type)
+                for partition, positions in keys.groupby(keys).indices.items():
+                    for offset in range(0, len(positions), shard_rows):
+                        yield table.take(positions[offset:offset + shard_rows]), partition
+            else:
+                for offset in range(0, table.num_rows, shard_rows):
+                    yield table.slice(offset, shard_rows), None
+
+    def _parquet_job_config(
+        self,
+        write_disposition: str,
+        table_schema: Optional[List[bigquery.SchemaField]],
+        job_labels: Optional[Dict[str, str]],
+    ) -> bigquery.LoadJobConfig:
+        job_config = self._load_job_config(write_disposition, table_schema, job_labels)
+        job_config.source_format = bigquery.SourceFormat.PARQUET
+        parquet_options = bigquery.ParquetOptions()
+        parquet_options.enable_list_inference = True
+        job_config.parquet_options = parquet_options
+        return job_config
+
+    def append_rows(
+        self,
+        data: pd.DataFrame | pa.Table | Iterable[pd.DataFrame | pa.Table],
+        dataset_id: str,
+        table_id: str,
+        stream_type: str = "COMMITTED",
+        create_dataset: bool = True,
+        create_table: bool = False,
+        table_schema: Optional[List[bigquery.SchemaField]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Streaming alternative to load jobs: appends rows through the Storage
+        Write API (no job scheduling), with exactly-once offsets. COMMITTED
+        rows are visible immediately; PENDING rows at commit.
+        """
+        self._prepare_target(dataset_id, table_id, create_dataset, create_table, table_schema)
+        try:
+            return self.storage_writer.append_rows(data, dataset_id, table_id, stream_type=stream_type)
+        finally:
+            # streamed rows don't always bump the table's last-modified time
+            self._invalidate_queries(f"{self.project_id}.{dataset_id}.{table_id}")
+
+    def _prepare_target(
+        self,
+        dataset_id: str,
+        table_id: str,
+        create_dataset: bool,
+        create_table: bool,
+        table_schema: Optional[List[bigquery.SchemaField]],
+    ) -> bigquery.TableReference:
         if create_dataset:
             self.create_dataset_if_not_exists(dataset_id)
 
         if create_table and table_schema:
             self.create_table_if_not_exists(dataset_id, table_id, schema=table_schema)
 
-        table_ref = self._table_ref(dataset_id, table_id)
-        table_id_full = f"{self.project_id}.{dataset_id}.{table_id}"
-
-        logger.info({"event": "bigquery_load_start", "table": table_id_full, "records": len(df)})
+        return self._table_ref(dataset_id, table_id)
 
+    def _load_job_config(
+        self,
+        write_disposition: str,
+        table_schema: Optional[List[bigquery.SchemaField]],
+        job_labels: Optional[Dict[str, str]],
+    ) -> bigquery.LoadJobConfig:
         job_config = bigquery.LoadJobConfig()
         if write_disposition == "WRITE_TRUNCATE":
             job_config.write_disposition = bigquery.WriteDisposition.WRITE_TRUNCATE
@@ -104,29 +422,234 @@ class BigQueryService:
         if job_labels:
             job_config.labels = job_labels
 
+        return job_config
+
+    def _wait_load(self, load_job, table_ref: bigquery.TableReference, table_id_full: str) -> Dict[str, Any]:
         try:
-            load_job = self.client.load_table_from_dataframe(df, table_ref, job_config=job_config, location=self.location)
-            result = load_job.result()
-            table = self.client.get_table(table_ref)
-            logger.info({
-                "event": "bigquery_load_success",
-                "table": table_id_full,
-                "total_rows": table.num_rows,
-                "load_job_id": load_job.job_id
-            })
-            return {"status": "success", "job_id": load_job.job_id, "total_rows": table.num_rows}
-        except Exception as e:
-            logger.error({"event": "bigquery_load_error", "table": table_id_full, "error": str(e)})
-            raise LoadError(f"Erro ao carregar DataFrame no BigQuery: {e}")
+            with metrics.stage("load_wait") as run:
+                load_job.result()
+                run.rows = load_job.output_rows or 0
+        except NotFound:
+            # the table (or dataset) vanished since it was cached
+            self.metadata_cache.invalidate((table_ref.project, table_ref.dataset_id))
+            raise
+        self._invalidate_queries(f"{table_ref.project}.{table_ref.dataset_id}.{table_ref.table_id}")
+        logger.info({
+            "event": "bigquery_load_success",
+            "table": table_id_full,
+            "output_rows": load_job.output_rows,
+            "load_job_id": load_job.job_id
+        })
+        return {"status": "success", "job_id": load_job.job_id, "output_rows": load_job.output_rows}
+
+    def run_query(self, query: str, job_config: Optional[bigquery.QueryJobConfig] = None,
+                  use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Runs a query and returns its rows. With a query cache, deterministic
+        reads (SELECT/WITH) of fully qualified base tables are served from it
+        while the SQL, parameters and the last-modified time of every
+        referenced table are unchanged; other statements drop cached results
+        of the tables they name.
+        """
+        tables = referenced_tables(query, self.project_id)
+        cache_key = self._query_cache_key(query, job_config, tables) if use_cache else None
+        if cache_key is not None:
+            try:
+                rows = self.query_cache.get(cache_key)
+                logger.info({"event": "bigquery_query_cache_hit", "rows": len(rows)})
+                return rows
+            except KeyError:
+                pass
 
-    def run_query(self, query: str, job_config: Optional[bigquery.QueryJobConfig] = None) -> List[Dict[str, Any]]:
         logger.info({"event": "bigquery_query_start", "query": query[:200]})
         try:
             query_job = self.client.query(query, job_config=job_config)
             result = query_job.result()
             rows = [dict(row) for row in result]
             logger.info({"event": "bigquery_query_success", "rows": len(rows)})
-            return rows
         except Exception as e:
             logger.error({"event": "bigquery_query_error", "error": str(e)})
             raise LoadError(f"Erro ao executar query no BigQuery: {e}")
+
+        if cache_key is not None:
+            try:
+                self.query_cache.put(cache_key, rows, tables)
+            except Exception as e:  # unpicklable values: the result is just not cached
+                logger.warning({"event": "bigquery_query_cache_error", "error": str(e)})
+        elif not is_cacheable(query):
+            for table in tables:
+                self._invalidate_queries(table)
+        return rows
+
+    def _query_cache_key(self, query: str, job_config: Optional[bigquery.QueryJobConfig],
+                         tables: Iterable[str]) -> Optional[str]:
+        if self.query_cache is None or not is_cacheable(query):
+            return None
+        if job_config is not None and (job_config.dry_run or job_config.use_query_cache is False):
+            return None
+        # every table read must be versioned below, or a write to it would go unnoticed
+        if not tables or has_unqualified_tables(query):
+            return None
+        config = job_config.to_api_repr() if job_config is not None else {}
+        config.pop("labels", None)
+        config.update(project=self.project_id, location=self.location)
+        versions = {}
+        for table in tables:
+            try:
+                # a metadata read (not billed); any write to the table changes it, and so the key
+                metadata = self.client.get_table(table)
+            except Exception:
+                return None
+            if metadata.table_type != "TABLE":
+                # a view's `modified` doesn't move when the tables it reads change
+                return None
+            versions[table] = metadata.modified
+        return QueryCache.key(query, config, versions)
+
+    def _invalidate_queries(self, table: str) -> None:
+        if self.query_cache is not None:
+            self.query_cache.invalidate_table(table.split("$")[0])
+
+    @property
+    def read_client(self):
+        """
+        BigQuery Storage Read API client for fast result downloads, or None
+        when google-cloud-bigquery-storage isn't installed.
+        """
+        if self._read_client is None:
+            try:
+                from google.cloud import bigquery_storage
+            except ImportError:
+                return None
+            self._read_client = bigquery_storage.BigQueryReadClient()
+        return self._read_client
+
+    def iter_query_pages(
+        self,
+        query: str,
+        job_config: Optional[bigquery.QueryJobConfig] = None,
+        page_size: int = 10_000,
+        max_rows: Optional[int] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Runs a query and yields its rows page by page (lists of dicts), so
+        only one page is in memory and consumers start on the first page.
+        Stops after `max_rows` rows.
+        """
+        logger.info({"event": "bigquery_query_start", "query": query[:200], "mode": "pages"})
+        total = 0
+        try:
+            result = self.client.query(query, job_config=job_config).result(page_size=page_size, max_results=max_rows)
+            for page in result.pages:
+                rows = [dict(row) for row in page]
+                total += len(rows)
+                yield rows
+        except Exception as e:
+            logger.error({"event": "bigquery_query_error", "error": str(e)})
+            raise LoadError(f"Erro ao executar query no BigQuery: {e}")
+        logger.info({"event": "bigquery_query_success", "rows": total})
+
+    def iter_query_arrow(
+        self,
+        query: str,
+        job_config: Optional[bigquery.QueryJobConfig] = None,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        use_storage_api: bool = True,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Runs a query and yields its result as Arrow record batches. With
+        `use_storage_api` (and the package installed) the result is read
+        through the Storage Read API, over parallel streams; otherwise it is
+        paged over REST. The stream stops once `max_rows` rows (the last
+        batch is sliced) or `max_bytes` of Arrow data have been yielded.
+        """
+        logger.info({"event": "bigquery_query_start", "query": query[:200], "mode": "arrow"})
+        rows = 0
+        size = 0
+        try:
+            result = self.client.query(query, job_config=job_config).result()
+            read_client = self.read_client if use_storage_api else None
+            for batch in result.to_arrow_iterable(bqstorage_client=read_client):
+                if max_rows is not None and rows + batch.num_rows > max_rows:
+                    batch = batch.slice(0, max_rows - rows)
+                if max_bytes is not None and size + batch.nbytes > max_bytes:
+                    logger.warning({"event": "bigquery_query_capped", "rows": rows, "bytes": size, "max_bytes": max_bytes})
+                    return
+                rows += batch.num_rows
+                size += batch.nbytes
+                yield batch
+                if max_rows is not None and rows >= max_rows:
+                    logger.warning({"event": "bigquery_query_capped", "rows": rows, "bytes": size, "max_rows": max_rows})
+                    return
+        except Exception as e:
+            logger.error({"event": "bigquery_query_error", "error": str(e)})
+            raise LoadError(f"Erro ao executar query no BigQuery: {e}")
+        logger.info({"event": "bigquery_query_success", "rows": rows, "bytes": size})
+
+
+_PARTITION_FORMATS = {"HOUR": "%Y%m%d%H", "DAY": "%Y%m%d", "MONTH": "%Y%m", "YEAR": "%Y"}
+
+
+def _partition_keys(values: pd.Series, partition_type: str) -> pd.Series:
+    """Partition decorator suffix per row; nulls go to __NULL__."""
+    timestamps = pd.to_datetime(values)
+    return timestamps.dt.strftime(_PARTITION_FORMATS[partition_type]).fillna("__NULL__")
+
+
+def _quote(name: str) -> str:
+    return f"`{name.replace('`', '')}`"
+
+
+def _last_row_per_key(data: pd.DataFrame | pa.Table, key_columns: List[str]) -> pd.DataFrame | pa.Table:
+    """
+    Rows of `data` to upsert: LoadError on a NULL key, and only the last row of each repeated key.
+    """
+    keys = (data.select(key_columns).to_pandas() if isinstance(data, pa.Table) else data[key_columns])
+    null_keys = int(keys.isna().any(axis=1).sum())
+    if null_keys:
+        raise LoadError(f"{null_keys} linha(s) com chave nula para o MERGE em {key_columns}")
+    duplicated = keys.duplicated(keep="last").to_numpy()
+    if not duplicated.any():
+        return data
+    logger.warning({"event": "bigquery_merge_duplicate_keys", "dropped": int(duplicated.sum()), "keys": key_columns})
+    return data.filter(pa.array(~duplicated)) if isinstance(data, pa.Table) else data[~duplicated]
+
+
+def merge_statement(target: str, source: str, columns: List[str], key_columns: List[str]) -> str:
+    """
+    MERGE of `source` into `target` on `key_columns`. Source rows with a
+    NULL key are skipped and the rest deduplicated per key first (MERGE
+    fails on several matches; the row kept is fixed by ordering on its
+    content), and matched rows are only rewritten when a value differs.
+    """
+    keys = ", ".join(f"S.{_quote(k)}" for k in key_columns)
+    on = " AND ".join(f"T.{_quote(k)} = S.{_quote(k)}" for k in key_columns)
+    values = [c for c in columns if c not in key_columns]
+    insert_columns = ", ".join(_quote(c) for c in columns)
+    insert_values = ", ".join(f"S.{_quote(c)}" for c in columns)
+
+    not_null = " AND ".join(f"S.{_quote(k)} IS NOT NULL" for k in key_columns)
+
+    statement = (
+        f"MERGE {_quote(target)} T\n"
+        f"USING (SELECT * FROM {_quote(source)} S WHERE {not_null}\n"
+        f"       QUALIFY ROW_NUMBER() OVER (PARTITION BY {keys} ORDER BY TO_JSON_STRING(S)) = 1) S\n"
+        f"ON {on}\n"
+    )
+    if values:
+        # TO_JSON_STRING compares any column type, ARRAYs and STRUCTs included, NULL-safely
+        changed = " OR ".join(
+            f"TO_JSON_STRING(T.{_quote(c)}) != TO_JSON_STRING(S.{_quote(c)})" for c in values
+        )
+        assignments = ", ".join(f"{_quote(c)} = S.{_quote(c)}" for c in values)
+        statement += f"WHEN MATCHED AND ({changed}) THEN UPDATE SET {assignments}\n"
+    statement += f"WHEN NOT MATCHED THEN INSERT ({insert_columns}) VALUES ({insert_values})"
+    return statement
+
+
+def _to_parquet(table: pa.Table) -> io.BytesIO:
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    buffer.seek(0)
+    return buffer
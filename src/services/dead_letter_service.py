@@ -0,0 +1,38 @@
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from src.core.logger import logger
+from src.core.exceptions import LoadError
+
+
+class DeadLetterService:
+    """
+    Appends rejected rows, with their validation errors, to a local NDJSON
+    file (under /tmp on Cloud Functions, the only writable path).
+    """
+
+    def __init__(self, path: str, source: Optional[str] = None):
+        self.path = path
+        self.source = source
+        self._lock = threading.Lock()
+
+    def write(self, rejected: List[Dict[str, Any]]) -> int:
+        if not rejected:
+            return 0
+        rejected_at = datetime.now(timezone.utc).isoformat()
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+                for item in rejected:
+                    line = {"rejected_at": rejected_at, "source": self.source, **item}
+                    fh.write(json.dumps(line, ensure_ascii=False, default=str) + "\n")
+        except OSError as e:
+            logger.error({"event": "dead_letter_write_error", "path": self.path, "error": str(e)})
+            raise LoadError(f"Erro ao gravar dead letters em {self.path}: {e}")
+        logger.info({"event": "dead_letter_written", "path": self.path, "records": len(rejected)})
+        return len(rejected)
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
+from src.core.logger import logger
+
+
+class HTTPCache:
+    """
+    Disk-backed cache of JSON responses with their validators (ETag,
+    Last-Modified), for conditional requests.
+
+    Each entry is a raw body file plus a small metadata file. Total body size
+    is bounded by `max_bytes`, evicting least recently used entries. The last
+    `memory_entries` parsed bodies are also kept in memory, so a 304 answer
+    is served without reading or parsing the body again; callers must treat
+    returned values as read-only.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, memory_entries: int = 32):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._parsed: "OrderedDict[str, Tuple[Dict[str, str], Any]]" = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        return hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{key}.{suffix}")
+
+    def _load_index(self) -> None:
+        # oldest access first, so eviction order survives restarts
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".meta"):
+                key = name[:-len(".meta")]
+                try:
+                    stat = os.stat(self._path(key, "body"))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, key, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+
+    def validators(self, key: str) -> Dict[str, str]:
+        """
+        Conditional request headers for a cached entry ({} on a miss).
+        """
+        with self._lock:
+            if key not in self._sizes:
+                return {}
+            cached = self._parsed.get(key)
+        if cached is not None:
+            meta = cached[0]
+        else:
+            try:
+                with open(self._path(key, "meta"), encoding="utf-8") as fh:
+                    meta = json.load(fh)
+            except (OSError, ValueError):
+                return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def get(self, key: str) -> Any:
+        """
+        Cached value for `key`; raises KeyError on a miss.
+        """
+        with self._lock:
+            if key not in self._sizes:
+                raise KeyError(key)
+            self._sizes.move_to_end(key)
+            cached = self._parsed.get(key)
+            if cached is not None:
+                self._parsed.move_to_end(key)
+        try:
+            os.utime(self._path(key, "body"))
+            if cached is not None:
+                return cached[1]
+            with open(self._path(key, "meta"), encoding="utf-8") as fh:
+                meta = json.load(fh)
+            with open(self._path(key, "body"), "rb") as fh:
+                value = json.loads(fh.read())
+        except (OSError, ValueError) as e:
+            logger.error({"event": "http_cache_read_error", "key": key, "error": str(e)})
+            self._drop(key)
+            raise KeyError(key)
+        self._remember(key, meta, value)
+        return value
+
+    def put(self, key: str, headers: Mapping[str, str], body: bytes, value: Any) -> bool:
+        """
+        Stores a response that carries a validator; returns False when it
+        can't be revalidated (no ETag/Last-Modified) or forbids storage.
+        """
+        meta = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+        if not (meta["etag"] or meta["last_modified"]) or "no-store" in headers.get("Cache-Control", ""):
+            return False
+        if len(body) > self.max_bytes:
+            return False
+        try:
+            for suffix, data in (("body", body), ("meta", json.dumps(meta).encode("utf-8"))):
+                tmp_path = self._path(key, f"{suffix}.tmp")
+                with open(tmp_path, "wb") as fh:
+                    fh.write(data)
+                os.replace(tmp_path, self._path(key, suffix))
+        except OSError as e:
+            logger.error({"event": "http_cache_write_error", "key": key, "error": str(e)})
+            return False
+        with self._lock:
+            self._sizes[key] = len(body)
+            self._sizes.move_to_end(key)
+        self._remember(key, meta, value)
+        self._evict()
+        return True
+
+    def _remember(self, key: str, meta: Dict[str, str], value: Any) -> None:
+        with self._lock:
+            self._parsed[key] = (meta, value)
+            self._parsed.move_to_end(key)
+            while len(self._parsed) > self.memory_entries:
+                self._parsed.popitem(last=False)
+
+    def _drop(self, key: str) -> None:
+        with self._lock:
+            self._sizes.pop(key, None)
+            self._parsed.pop(key, None)
+        for suffix in ("meta", "body"):
+            try:
+                os.remove(self._path(key, suffix))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        while True:
+            with self._lock:
+                if sum(self._sizes.values()) <= self.max_bytes or not self._sizes:
+                    return
+                key = next(iter(self._sizes))
+            logger.info({"event": "http_cache_evict", "key": key})
+            self._drop(key)
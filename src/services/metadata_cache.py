@@ -0,0 +1,49 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.core.config import Config
+
+
+class MetadataCache:
+    """
+    Thread-safe TTL cache of BigQuery dataset/table metadata, keyed by
+    ("project", "dataset") or ("project", "dataset", "table"). Invalidating
+    a dataset also drops the tables cached under it.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, ...], Tuple[float, Any]] = {}
+
+    def get(self, key: Tuple[str, ...]) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Tuple[str, ...], value: Any = True) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+
+    def invalidate(self, key: Tuple[str, ...]) -> None:
+        with self._lock:
+            for cached in [k for k in self._entries if k[:len(key)] == key]:
+                del self._entries[cached]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# module state outlives a single request, so warm Cloud Function instances reuse it
+METADATA_CACHE = MetadataCache(ttl_seconds=Config.BQ_METADATA_TTL)
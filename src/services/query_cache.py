@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from src.core.config import Config
+from src.core.logger import logger
+
+_LITERALS = re.compile(r"('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`)")
+_COMMENTS = re.compile(r"--[^\n]*|#[^\n]*|/\*.*?\*/", re.S)
+_TABLE_REFS = re.compile(r"\b(?:FROM|JOIN|INTO|MERGE|UPDATE|TABLE)\s+`?([\w-]+(?:\.[\w-]+){1,2})`?", re.I)
+_QUOTED_TABLES = re.compile(r"`([\w-]+\.[\w-]+\.[\w$-]+)`")
+# FROM/JOIN targets without a dataset: resolved by a default dataset or session, not by the query
+_UNQUALIFIED_REFS = re.compile(r"\b(?:FROM|JOIN)\s+(?:`([^`.]+)`|([A-Za-z_][\w-]*))(?![\w.`-]|\s*\()", re.I)
+_CTE_NAMES = re.compile(r"(?:\bWITH(?:\s+RECURSIVE)?|,)\s*`?(\w+)`?\s+AS\s*\(", re.I)
+_READ_ONLY = re.compile(r"^\s*(SELECT|WITH)\b", re.I)
+# results that change without any table changing can't be cached
+_NONDETERMINISTIC = re.compile(
+    r"\b(CURRENT_(DATE|DATETIME|TIME|TIMESTAMP)|NOW|RAND|GENERATE_UUID|SESSION_USER)\s*\(|INFORMATION_SCHEMA",
+    re.I,
+)
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Drops comments and collapses whitespace outside string literals and
+    quoted identifiers, so formatting changes don't change the cache key.
+    """
+    parts = _LITERALS.split(query)
+    for index in range(0, len(parts), 2):
+        parts[index] = " ".join(_COMMENTS.sub(" ", parts[index]).split())
+    return " ".join(part for part in parts if part).strip()
+
+
+def referenced_tables(query: str, default_project: str) -> Set[str]:
+    """
+    Fully qualified ids of the tables named in a query, as project.dataset.table.
+    """
+    names = set(_TABLE_REFS.findall(query)) | set(_QUOTED_TABLES.findall(query))
+    tables = set()
+    for name in names:
+        parts = name.split(".")
+        if len(parts) == 2:
+            parts = [default_project, *parts]
+        tables.add(".".join(parts[:2] + [parts[2].split("$")[0]]))
+    return tables
+
+
+def has_unqualified_tables(query: str) -> bool:
+    """
+    Whether the query reads a table named without its dataset (CTE names
+    aside), which referenced_tables can't resolve.
+    """
+    query = normalize_sql(query)
+    ctes = {name.lower() for name in _CTE_NAMES.findall(query)}
+    return any((quoted or bare).lower() not in ctes for quoted, bare in _UNQUALIFIED_REFS.findall(query))
+
+
+def is_cacheable(query: str) -> bool:
+    return bool(_READ_ONLY.match(normalize_sql(query))) and not _NONDETERMINISTIC.search(query)
+
+
+class QueryCache:
+    """
+    Two-tier (memory, then disk) cache of query results with TTL and
+    size-bounded LRU eviction per tier. Entries remember the tables they
+    read, so writes to a table can invalidate them.
+    """
+
+    def __init__(self, directory: Optional[str] = None, memory_bytes: int = 64 * 1024 * 1024,
+                 disk_bytes: int = 512 * 1024 * 1024, ttl_seconds: float = 600,
+                 clock: Callable[[], float] = time.time):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, size, tables, rows)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        # key -> (expires_at, size, tables); bodies live on disk
+        self._disk: "OrderedDict[str, tuple]" = OrderedDict()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load_index()
+
+    @staticmethod
+    def key(query: str, job_config: Optional[Dict[str, Any]], table_versions: Dict[str, Any]) -> str:
+        payload = {"sql": normalize_sql(query), "config": job_config or {}, "tables": table_versions}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{key}.{suffix}")
+
+    def _load_index(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".meta"):
+                continue
+            key = name[:-len(".meta")]
+            try:
+                with open(self._path(key, "meta"), encoding="utf-8") as fh:
+                    meta = json.load(fh)
+                mtime = os.stat(self._path(key, "rows")).st_mtime
+            except (OSError, ValueError):
+                continue
+            entries.append((mtime, key, meta))
+        for _, key, meta in sorted(entries):
+            self._disk[key] = (meta["expires_at"], meta["size"], frozenset(meta["tables"]))
+
+    def get(self, key: str) -> List[Dict[str, Any]]:
+        """
+        Cached rows (fresh list and dicts) for `key`; raises KeyError on a miss.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    return [dict(row) for row in entry[3]]
+                del self._memory[key]
+            disk_entry = self._disk.get(key)
+        if disk_entry is None:
+            raise KeyError(key)
+        if disk_entry[0] <= now:
+            self._drop_disk(key)
+            raise KeyError(key)
+        try:
+            with open(self._path(key, "rows"), "rb") as fh:
+                rows = pickle.load(fh)
+            os.utime(self._path(key, "rows"))
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.error({"event": "query_cache_read_error", "key": key, "error": str(e)})
+            self._drop_disk(key)
+            raise KeyError(key)
+        with self._lock:
+            self._disk.move_to_end(key)
+        # promoted, so the next hit skips the disk
+        self._put_memory(key, disk_entry[0], disk_entry[1], disk_entry[2], rows)
+        return [dict(row) for row in rows]
+
+    def put(self, key: str, rows: List[Dict[str, Any]], tables: Iterable[str]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        body = pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL)
+        expires_at = self._clock() + self.ttl_seconds
+        tables = frozenset(tables)
+        self._put_memory(key, expires_at, len(body), tables, rows)
+        if self.directory and len(body) <= self.disk_bytes:
+            try:
+                meta = {"expires_at": expires_at, "size": len(body), "tables": sorted(tables)}
+                for suffix, data in (("rows", body), ("meta", json.dumps(meta).encode("utf-8"))):
+                    tmp_path = self._path(key, f"{suffix}.tmp")
+                    with open(tmp_path, "wb") as fh:
+                        fh.write(data)
+                    os.replace(tmp_path, self._path(key, suffix))
+            except OSError as e:
+                logger.error({"event": "query_cache_write_error", "key": key, "error": str(e)})
+                return
+            with self._lock:
+                self._disk[key] = (expires_at, len(body), tables)
+                self._disk.move_to_end(key)
+                evicted = self._over_budget(self._disk, self.disk_bytes)
+            for old_key in evicted:
+                self._drop_disk(old_key)
+
+    def _put_memory(self, key: str, expires_at: float, size: int, tables: frozenset, rows: list) -> None:
+        if size > self.memory_bytes:
+            return
+        with self._lock:
+            self._memory[key] = (expires_at, size, tables, rows)
+            self._memory.move_to_end(key)
+            for old_key in self._over_budget(self._memory, self.memory_bytes):
+                del self._memory[old_key]
+
+    @staticmethod
+    def _over_budget(entries: "OrderedDict[str, tuple]", budget: int) -> List[str]:
+        # least recently used first, until the rest fits
+        total = sum(entry[1] for entry in entries.values())
+        evicted = []
+        for key, entry in entries.items():
+            if total <= budget:
+                break
+            total -= entry[1]
+            evicted.append(key)
+        return evicted
+
+    def _drop_disk(self, key: str) -> None:
+        with self._lock:
+            self._disk.pop(key, None)
+        for suffix in ("meta", "rows"):
+            try:
+                os.remove(self._path(key, suffix))
+            except FileNotFoundError:
+                pass
+
+    def invalidate_table(self, table: str) -> int:
+        """
+        Drops every entry that read `table` (project.dataset.table).
+        """
+        with self._lock:
+            memory_keys = [k for k, entry in self._memory.items() if table in entry[2]]
+            for key in memory_keys:
+                del self._memory[key]
+            disk_keys = [k for k, entry in self._disk.items() if table in entry[2]]
+        for key in disk_keys:
+            self._drop_disk(key)
+        dropped = len(set(memory_keys) | set(disk_keys))
+        if dropped:
+            logger.info({"event": "query_cache_invalidated", "table": table, "entries": dropped})
+        return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            keys = list(self._disk)
+        for key in keys:
+            self._drop_disk(key)
+
+
+# process-wide, like the metadata cache: warm instances keep their results
+QUERY_CACHE: Optional[QueryCache] = QueryCache(
+    directory=Config.QUERY_CACHE_DIR or None,
+    memory_bytes=Config.QUERY_CACHE_MEMORY_MB * 1024 * 1024,
+    disk_bytes=Config.QUERY_CACHE_DISK_MB * 1024 * 1024,
+    ttl_seconds=Config.QUERY_CACHE_TTL,
+) if Config.QUERY_CACHE else None
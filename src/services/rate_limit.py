@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from src.core.logger import logger
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: at most `rate` requests per second on
+    average, with bursts of up to `capacity`. pause() blocks every caller
+    for a while, e.g. to honour a server's Retry-After.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Takes `tokens`, sleeping until they are available; returns the time waited.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                delay = self._paused_until - now
+                if delay <= 0:
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return waited
+                    delay = (tokens - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + seconds)
+            # don't let the pause build up a burst
+            self._refill(now)
+            self._tokens = 0.0
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on in-flight requests. The limit grows by one after `limit`
+    consecutive fast successes (additive increase; other failures neither
+    count towards it nor shrink the limit) and is multiplied by
+    `decrease_ratio` on a throttling answer (429/503) or, with
+    `latency_target`, a response slower than the target (multiplicative
+    decrease).
+    """
+
+    def __init__(self, initial: int = 4, min_limit: int = 1, max_limit: int = 32,
+                 latency_target: Optional[float] = None, decrease_ratio: float = 0.5):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_target = latency_target
+        self.decrease_ratio = decrease_ratio
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, throttled: bool = False, succeeded: bool = True) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            previous = int(self._limit)
+            if throttled or (self.latency_target is not None and latency > self.latency_target):
+                self._limit = max(self.min_limit, self._limit * self.decrease_ratio)
+                self._successes = 0
+            elif not succeeded:
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= int(self._limit):
+                    self._limit = min(self.max_limit, self._limit + 1)
+                    self._successes = 0
+            if int(self._limit) != previous:
+                logger.info({"event": "api_concurrency_limit", "limit": int(self._limit), "throttled": throttled,
+                             "latency_ms": round(latency * 1000)})
+            self._condition.notify_all()
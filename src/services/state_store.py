@@ -0,0 +1,199 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from src.core.logger import logger
+from src.core.exceptions import ConfigError, ExtractError, LoadError
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+# one lock per state file, shared by every FileStateStore on it (e.g. jobs running in threads)
+_PATH_LOCKS: Dict[str, threading.Lock] = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def _path_lock(path: str) -> threading.Lock:
+    with _PATH_LOCKS_GUARD:
+        return _PATH_LOCKS.setdefault(os.path.abspath(path), threading.Lock())
+
+
+class StateStore(ABC):
+    """
+    Key -> JSON state persisted between runs (e.g. per-source watermarks).
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, state: Dict[str, Any]) -> None:
+        ...
+
+
+class FileStateStore(StateStore):
+    """
+    All keys in one JSON file, replaced atomically on every write. Writes
+    are read-modify-write under a per-path lock, and a `<path>.lock` file
+    lock where available, so stores on the same file in other threads or
+    processes don't drop each other's keys.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = _path_lock(path)
+
+    @contextmanager
+    def _exclusive(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(f"{self.path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_all(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            raise ExtractError(f"Erro ao ler estado em {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._read_all().get(key)
+
+    def set(self, key: str, state: Dict[str, Any]) -> None:
+        try:
+            with self._exclusive():
+                states = self._read_all()
+                states[key] = state
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # a unique temp file: a writer that skipped the lock still can't clobber it
+                fd, tmp_path = tempfile.mkstemp(dir=directory or None, prefix=f"{os.path.basename(self.path)}.",
+                                                suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                        json.dump(states, fh, ensure_ascii=False, default=str)
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+        except OSError as e:
+            raise LoadError(f"Erro ao gravar estado em {self.path}: {e}")
+
+
+class SQLiteStateStore(StateStore):
+    """
+    One row per key in a local SQLite database.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS etl_state (key TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # short-lived connections: sqlite3 objects can't cross threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT state FROM etl_state WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            raise ExtractError(f"Erro ao ler estado em {self.path}: {e}")
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, state: Dict[str, Any]) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO etl_state (key, state, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at",
+                    (key, json.dumps(state, ensure_ascii=False, default=str), datetime.now(timezone.utc).isoformat()),
+                )
+        except sqlite3.Error as e:
+            raise LoadError(f"Erro ao gravar estado em {self.path}: {e}")
+
+
+class BigQueryStateStore(StateStore):
+    """
+    State kept in a BigQuery table (key STRING, state STRING, updated_at
+    TIMESTAMP), for runtimes without durable local disk such as Cloud
+    Functions.
+    """
+
+    def __init__(self, bigquery_service, dataset_id: str, table_id: str = "etl_state"):
+        from google.cloud import bigquery
+
+        self._bigquery = bigquery
+        self.bq = bigquery_service
+        self.table = f"`{bigquery_service.project_id}.{dataset_id}.{table_id}`"
+        bigquery_service.create_dataset_if_not_exists(dataset_id)
+        bigquery_service.create_table_if_not_exists(dataset_id, table_id, schema=[
+            bigquery.SchemaField("key", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("state", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("updated_at", "TIMESTAMP", mode="REQUIRED"),
+        ])
+
+    def _params(self, **values: str):
+        return self._bigquery.QueryJobConfig(query_parameters=[
+            self._bigquery.ScalarQueryParameter(name, "STRING", value) for name, value in values.items()
+        ])
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        # never from the query cache: the watermark must be exact
+        rows = self.bq.run_query(f"SELECT state FROM {self.table} WHERE key = @key LIMIT 1",
+                                 job_config=self._params(key=key), use_cache=False)
+        return json.loads(rows[0]["state"]) if rows else None
+
+    def set(self, key: str, state: Dict[str, Any]) -> None:
+        self.bq.run_query(
+            f"MERGE {self.table} T USING (SELECT @key AS key, @state AS state) S ON T.key = S.key "
+            "WHEN MATCHED THEN UPDATE SET state = S.state, updated_at = CURRENT_TIMESTAMP() "
+            "WHEN NOT MATCHED THEN INSERT (key, state, updated_at) VALUES (S.key, S.state, CURRENT_TIMESTAMP())",
+            job_config=self._params(key=key, state=json.dumps(state, ensure_ascii=False, default=str)),
+        )
+
+
+def create_state_store(backend: str, path: str, bigquery_service=None, dataset_id: Optional[str] = None,
+                       table_id: str = "etl_state") -> StateStore:
+    """
+    Builds the store named by `backend`: "file", "sqlite" or "bigquery".
+    """
+    logger.info({"event": "state_store_init", "backend": backend})
+    if backend == "file":
+        return FileStateStore(path)
+    if backend == "sqlite":
+        return SQLiteStateStore(path)
+    if backend == "bigquery":
+        if bigquery_service is None or not dataset_id:
+            raise ConfigError("O backend de estado 'bigquery' requer um BigQueryService e um dataset")
+        return BigQueryStateStore(bigquery_service, dataset_id, table_id)
+    raise ConfigError(f"Backend de estado inválido: {backend}")
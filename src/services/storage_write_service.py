@@ -0,0 +1,238 @@
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from src.core.logger import logger
+from src.core.exceptions import LoadError
+
+STREAM_TYPES = ("COMMITTED", "PENDING")
+
+
+class OffsetAlreadyExists(Exception):
+    """The rows at this offset were already written (a retried append)."""
+
+
+class OffsetOutOfRange(Exception):
+    """The offset is past the end of the stream: an earlier append is missing."""
+
+
+class WriteBackend(ABC):
+    """
+    Minimal Storage Write API surface used by StorageWriteService.
+
+    COMMITTED streams make rows visible as soon as an append is acknowledged;
+    PENDING streams buffer rows until the stream is finalized and committed.
+    Appends carry the offset of their first row, which makes retries
+    idempotent: re-sending an acknowledged offset raises OffsetAlreadyExists.
+    """
+
+    @abstractmethod
+    def create_stream(self, table_path: str, stream_type: str) -> str:
+        ...
+
+    @abstractmethod
+    def append(self, stream_name: str, batch: pa.RecordBatch, offset: int) -> None:
+        ...
+
+    @abstractmethod
+    def finalize(self, stream_name: str) -> int:
+        ...
+
+    @abstractmethod
+    def commit(self, table_path: str, stream_names: List[str]) -> None:
+        ...
+
+
+class FakeWriteBackend(WriteBackend):
+    """
+    In-process stand-in for the Storage Write API with the same stream,
+    offset and commit semantics, for offline tests and local runs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._streams: Dict[str, Dict[str, Any]] = {}
+        self._tables: Dict[str, List[pa.RecordBatch]] = {}
+
+    def create_stream(self, table_path: str, stream_type: str) -> str:
+        name = f"{table_path}/streams/{uuid.uuid4().hex}"
+        with self._lock:
+            self._streams[name] = {"table": table_path, "type": stream_type, "rows": [],
+                                   "next_offset": 0, "finalized": False}
+        return name
+
+    def append(self, stream_name: str, batch: pa.RecordBatch, offset: int) -> None:
+        with self._lock:
+            stream = self._streams[stream_name]
+            if stream["finalized"]:
+                raise LoadError(f"Stream já finalizado: {stream_name}")
+            if offset < stream["next_offset"]:
+                raise OffsetAlreadyExists(f"offset {offset} < {stream['next_offset']}")
+            if offset > stream["next_offset"]:
+                raise OffsetOutOfRange(f"offset {offset} > {stream['next_offset']}")
+            stream["next_offset"] += batch.num_rows
+            if stream["type"] == "COMMITTED":
+                self._tables.setdefault(stream["table"], []).append(batch)
+            else:
+                stream["rows"].append(batch)
+
+    def finalize(self, stream_name: str) -> int:
+        with self._lock:
+            stream = self._streams[stream_name]
+            stream["finalized"] = True
+            return stream["next_offset"]
+
+    def commit(self, table_path: str, stream_names: List[str]) -> None:
+        with self._lock:
+            for name in stream_names:
+                stream = self._streams[name]
+                if not stream["finalized"]:
+                    raise LoadError(f"Stream não finalizado: {name}")
+                self._tables.setdefault(table_path, []).extend(stream["rows"])
+                stream["rows"] = []
+
+    def read_rows(self, table_path: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            batches = list(self._tables.get(table_path, []))
+        return [row for batch in batches for row in batch.to_pylist()]
+
+
+class BigQueryWriteBackend(WriteBackend):
+    """
+    Storage Write API backend (google-cloud-bigquery-storage), sending
+    rows as serialized Arrow record batches.
+    """
+
+    def __init__(self, client=None):
+        from google.cloud import bigquery_storage_v1
+        from google.cloud.bigquery_storage_v1 import types, writer
+
+        self._types = types
+        self._writer = writer
+        self.client = client or bigquery_storage_v1.BigQueryWriteClient()
+        self._connections: Dict[str, Any] = {}
+
+    def create_stream(self, table_path: str, stream_type: str) -> str:
+        stream = self._types.WriteStream(type_=getattr(self._types.WriteStream.Type, stream_type))
+        return self.client.create_write_stream(parent=table_path, write_stream=stream).name
+
+    def _connection(self, stream_name: str, schema: pa.Schema):
+        connection = self._connections.get(stream_name)
+        if connection is None:
+            template = self._types.AppendRowsRequest(
+                write_stream=stream_name,
+                arrow_rows=self._types.AppendRowsRequest.ArrowData(
+                    writer_schema=self._types.ArrowSchema(serialized_schema=schema.serialize().to_pybytes())
+                ),
+            )
+            connection = self._connections[stream_name] = self._writer.AppendRowsStream(self.client, template)
+        return connection
+
+    def append(self, stream_name: str, batch: pa.RecordBatch, offset: int) -> None:
+        from google.api_core.exceptions import AlreadyExists, OutOfRange
+
+        request = self._types.AppendRowsRequest(
+            offset=offset,
+            arrow_rows=self._types.AppendRowsRequest.ArrowData(
+                rows=self._types.ArrowRecordBatch(serialized_record_batch=batch.serialize().to_pybytes())
+            ),
+        )
+        try:
+            self._connection(stream_name, batch.schema).send(request).result()
+        except AlreadyExists as e:
+            raise OffsetAlreadyExists(str(e))
+        except OutOfRange as e:
+            raise OffsetOutOfRange(str(e))
+
+    def finalize(self, stream_name: str) -> int:
+        connection = self._connections.pop(stream_name, None)
+        if connection is not None:
+            connection.close()
+        return self.client.finalize_write_stream(name=stream_name).row_count
+
+    def commit(self, table_path: str, stream_names: List[str]) -> None:
+        request = self._types.BatchCommitWriteStreamsRequest(parent=table_path, write_streams=stream_names)
+        response = self.client.batch_commit_write_streams(request)
+        if response.stream_errors:
+            raise LoadError(f"Falha no commit dos streams: {[str(e) for e in response.stream_errors]}")
+
+
+class StorageWriteService:
+    """
+    Streaming ingestion through a Storage Write API backend: each call
+    writes to its own stream with explicit offsets, so a retried append can
+    never duplicate rows (exactly-once), and PENDING streams become
+    visible atomically at commit.
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        backend: Optional[WriteBackend] = None,
+        max_retries: int = 3,
+        backoff_factor: float = 1.5,
+        max_batch_rows: int = 10_000,
+    ):
+        self.project_id = project_id
+        self.backend = backend or BigQueryWriteBackend()
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_batch_rows = max_batch_rows
+
+    def table_path(self, dataset_id: str, table_id: str) -> str:
+        return f"projects/{self.project_id}/datasets/{dataset_id}/tables/{table_id}"
+
+    def append_rows(
+        self,
+        data: pd.DataFrame | pa.Table | Iterable[pd.DataFrame | pa.Table],
+        dataset_id: str,
+        table_id: str,
+        stream_type: str = "COMMITTED",
+    ) -> Dict[str, Any]:
+        if stream_type not in STREAM_TYPES:
+            raise LoadError(f"Tipo de stream inválido: {stream_type}")
+        table_path = self.table_path(dataset_id, table_id)
+        frames = [data] if isinstance(data, (pd.DataFrame, pa.Table)) else data
+
+        try:
+            stream_name = self.backend.create_stream(table_path, stream_type)
+            logger.info({"event": "storage_write_start", "table": table_path, "stream_type": stream_type})
+            offset = 0
+            for frame in frames:
+                table = frame if isinstance(frame, pa.Table) else pa.Table.from_pandas(frame, preserve_index=False)
+                for batch in table.to_batches(max_chunksize=self.max_batch_rows):
+                    self._append(stream_name, batch, offset)
+                    offset += batch.num_rows
+            row_count = self.backend.finalize(stream_name)
+            if stream_type == "PENDING":
+                self.backend.commit(table_path, [stream_name])
+        except LoadError:
+            raise
+        except Exception as e:
+            logger.error({"event": "storage_write_error", "table": table_path, "error": str(e)})
+            raise LoadError(f"Erro no streaming para o BigQuery: {e}")
+
+        logger.info({"event": "storage_write_success", "table": table_path, "rows": row_count, "stream": stream_name})
+        return {"status": "success", "stream": stream_name, "stream_type": stream_type, "rows": row_count}
+
+    def _append(self, stream_name: str, batch: pa.RecordBatch, offset: int) -> None:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                self.backend.append(stream_name, batch, offset)
+                return
+            except OffsetAlreadyExists:
+                # an earlier attempt landed before its acknowledgement was lost
+                logger.info({"event": "storage_write_duplicate_offset", "offset": offset})
+                return
+            except OffsetOutOfRange:
+                raise
+            except Exception as e:
+                logger.error({"event": "storage_write_append_error", "offset": offset, "attempt": attempt, "error": str(e)})
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self.backoff_factor ** attempt)
@@ -0,0 +1,109 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator, List
+
+_WHITESPACE = " \t\r\n"
+_DELIMITERS = ",]" + _WHITESPACE
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Incrementally parses a top-level JSON array from byte chunks and yields
+    its elements one by one. Only the unparsed tail of the stream is kept in
+    memory, never the whole body.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buf = ""
+    pos = 0
+    eof = False
+    state = "start"  # start -> first -> (item -> sep)* -> done
+
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+
+        if pos == len(buf) or state == "refill":
+            if eof:
+                break
+            chunk = next(chunks, None)
+            buf = buf[pos:]
+            pos = 0
+            if chunk is None:
+                eof = True
+                buf += text_decoder.decode(b"", final=True)
+            else:
+                buf += text_decoder.decode(chunk)
+            if state == "refill":
+                state = "item"
+            continue
+
+        char = buf[pos]
+        if state == "start":
+            if char != "[":
+                raise ValueError(f"Esperado array JSON, encontrado {char!r}")
+            pos += 1
+            state = "first"
+        elif state in ("first", "item"):
+            if state == "first" and char == "]":
+                pos += 1
+                state = "done"
+                continue
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                state = "refill"
+                continue
+            # a scalar cut at the chunk boundary (e.g. "12" of "123") also decodes
+            if not eof and (end == len(buf) or buf[end] not in _DELIMITERS):
+                state = "refill"
+                continue
+            yield value
+            pos = end
+            state = "sep"
+        elif state == "sep":
+            if char == ",":
+                state = "item"
+            elif char == "]":
+                state = "done"
+            else:
+                raise ValueError(f"Separador inválido no array JSON: {char!r}")
+            pos += 1
+        else:
+            raise ValueError("Dados após o fim do array JSON")
+
+    if state != "done":
+        raise ValueError("Array JSON truncado")
+
+
+def iter_ndjson(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Parses newline-delimited JSON from byte chunks, one value per line.
+    """
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        lines = pending.split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if pending.strip():
+        yield json.loads(pending)
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Groups an iterable into lists of at most `size` items.
+    """
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -1,11 +1,18 @@
 from typing import Any, Dict, Optional
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
 from src.utils.validators import (
     validate_string,
     validate_int,
     validate_float,
     validate_dict,
+    validate_int_series,
+    validate_float_series,
+    validate_string_series,
 )
 
 
@@ -51,3 +58,81 @@ def safe_serialize_value(value: Any) -> Any:
     if isinstance(value, (int, float, str)):
         return value
     return str(value)
+
+
+_SERIES_VALIDATORS = {
+    "INT64": validate_int_series,
+    "INTEGER": validate_int_series,
+    "FLOAT64": validate_float_series,
+    "FLOAT": validate_float_series,
+    "STRING": validate_string_series,
+}
+
+
+def coerce_series(series: pd.Series, field_type: str) -> pd.Series:
+    """
+    Column-wise coercion for a BigQuery scalar type; unknown types pass through.
+    """
+    validator = _SERIES_VALIDATORS.get(field_type)
+    return validator(series) if validator else series
+
+
+def _struct_mask(series: pd.Series) -> np.ndarray:
+    return np.fromiter(
+        (isinstance(v, dict) and len(v) > 0 for v in series.tolist()), dtype=bool, count=len(series)
+    )
+
+
+def flatten_struct_series(series: pd.Series, fields: Dict[str, str], prefix: str) -> pd.DataFrame:
+    """
+    Expands a column of dicts into one typed column per sub-field
+    (`<prefix>_<name>`). Rows that are not a non-empty dict are all <NA>,
+    matching serialize_region's None.
+    """
+    return _flatten_struct(series, fields, f"{prefix}_", _struct_mask(series))
+
+
+def _flatten_struct(series: pd.Series, fields: Dict[str, str], prefix: str, present: np.ndarray) -> pd.DataFrame:
+    # positional index, so duplicated labels in `series` can't break the reindex
+    structs = series[present].tolist()
+    nested = pd.DataFrame.from_records(structs, index=np.flatnonzero(present), columns=list(fields))
+    for name, field_type in fields.items():
+        if field_type == "STRING" and pd.api.types.is_float_dtype(nested[name]):
+            # ints upcast by a missing value: back to the structs' own values, as for top-level columns
+            nested[name] = pd.Series([struct.get(name) for struct in structs], index=nested.index, dtype=object)
+    nested = nested.reindex(range(len(series)))
+    nested.index = series.index
+    return pd.DataFrame(
+        {f"{prefix}{name}": coerce_series(nested[name], field_type) for name, field_type in fields.items()},
+        index=series.index,
+    )
+
+
+def serialize_struct_series(series: pd.Series, fields: Dict[str, str]) -> pd.Series:
+    """
+    Vectorized serialize_region for any RECORD: sub-fields are coerced
+    column-wise and assembled into an Arrow struct column (null for
+    absent/empty structs) without building per-row dicts.
+    """
+    present = _struct_mask(series)
+    flat = _flatten_struct(series, fields, "", present)
+    children = [pa.array(flat[name], from_pandas=True) for name in fields]
+    struct = pa.StructArray.from_arrays(children, names=list(fields), mask=pa.array(~present))
+    return pd.Series(pd.arrays.ArrowExtensionArray(struct), index=series.index, name=series.name)
+
+
+
+def arrow_to_pandas(table: pa.Table) -> pd.DataFrame:
+    """
+    Table.to_pandas() that also takes back Arrow-backed columns (e.g.
+    serialize_struct_series output): pandas can't rebuild a nested
+    ArrowDtype from the table's pandas metadata, so those types are mapped
+    explicitly. Other columns get their original dtypes.
+    """
+    columns = (table.schema.pandas_metadata or {}).get("columns", [])
+    arrow_backed = {
+        table.schema.field(column["name"]).type
+        for column in columns
+        if column["name"] in table.column_names and str(column["numpy_type"]).endswith("[pyarrow]")
+    }
+    return table.to_pandas(types_mapper=lambda t: pd.ArrowDtype(t) if t in arrow_backed else None)
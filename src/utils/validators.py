@@ -1,5 +1,8 @@
 from typing import Any, Optional
 
+import numpy as np
+import pandas as pd
+
 
 def is_empty(value: Any) -> bool:
     """
@@ -45,3 +48,87 @@ def validate_dict(value: Any) -> Optional[dict]:
     Ensures the value is a dictionary.
     """
     return value if isinstance(value, dict) else None
+
+
+# --- Column-wise (vectorized) variants -------------------------------------
+# Same results as the scalar helpers above, applied to a whole pandas Series.
+# Missing values (None/NaN/NA) always come out as <NA>. Homogeneous columns
+# take a vectorized path; only values it cannot decide fall back to the
+# scalar helper.
+
+_INT_PATTERN = r"\s*[+-]?[0-9]{1,18}\s*"
+_FLOAT_PATTERN = r"\s*[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?\s*"
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+def _is_string_column(series: pd.Series) -> bool:
+    return pd.api.types.is_string_dtype(series) and pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty")
+
+
+def _to_int64(values: pd.Series) -> pd.Series:
+    """Python ints/None -> Int64, dropping values outside the INT64 range."""
+    in_range = values.map(lambda v: v is not None and _INT64_MIN <= v <= _INT64_MAX)
+    return pd.array(values.where(in_range, None).tolist(), dtype="Int64")
+
+
+def validate_int_series(series: pd.Series) -> pd.Series:
+    """
+    Vectorized validate_int: int(value) per element, <NA> when it fails.
+    """
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return series.astype("Int64")
+
+    if pd.api.types.is_float_dtype(series):
+        values = series.astype("float64")
+        finite = np.isfinite(values) & (values.abs() < 2.0 ** 63)
+        return np.trunc(values.where(finite)).astype("Int64")
+
+    result = pd.Series(pd.NA, index=series.index, dtype="Int64")
+    if _is_string_column(series):
+        plain = series.str.fullmatch(_INT_PATTERN).fillna(False).astype(bool)
+        result[plain] = series[plain].str.strip().astype("int64")
+        rest = series.notna() & ~plain
+    else:
+        rest = series.notna()
+
+    if rest.any():
+        result[rest] = _to_int64(series[rest].map(validate_int))
+    return result
+
+
+def validate_float_series(series: pd.Series) -> pd.Series:
+    """
+    Vectorized validate_float: float(value) per element, <NA> when it fails (or is NaN).
+    """
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        return series.astype("float64").astype("Float64")
+
+    result = pd.Series(pd.NA, index=series.index, dtype="Float64")
+    present = series.notna()
+    if _is_string_column(series):
+        plain = series.str.fullmatch(_FLOAT_PATTERN).fillna(False).astype(bool)
+        result[plain] = series[plain].str.strip().astype("float64").astype("Float64")
+        rest = present & ~plain
+    else:
+        rest = present
+
+    if rest.any():
+        result[rest] = series[rest].map(validate_float).astype("float64").astype("Float64")
+    return result
+
+
+def validate_string_series(series: pd.Series) -> pd.Series:
+    """
+    Vectorized validate_string: str(value).strip() per element, <NA> for missing values.
+    """
+    present = series.notna()
+    if _is_string_column(series):
+        return series.str.strip().astype("string")
+
+    if pd.api.types.is_integer_dtype(series) or pd.api.types.is_float_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series.astype(str).str.strip().astype("string").where(present, pd.NA)
+
+    result = pd.Series(pd.NA, index=series.index, dtype="string")
+    if present.any():
+        result[present] = series[present].map(validate_string).astype("string")
+    return result
@@ -1,9 +1,13 @@
 import pytest
+import requests
 from unittest.mock import patch, MagicMock
 from src.services.api_service import APIService
+from src.services.http_cache import HTTPCache
+from src.services.rate_limit import AdaptiveConcurrency
+from src.core.exceptions import ExtractError
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_api_service_success(mock_get):
     mock_response = MagicMock()
     mock_response.json.return_value = {"ok": True}
@@ -17,7 +21,7 @@ def test_api_service_success(mock_get):
     mock_get.assert_called_once()
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_api_service_retry(mock_get):
     mock_get.side_effect = Exception("Network error")
 
@@ -27,3 +31,71 @@ def test_api_service_retry(mock_get):
         api.get()
 
     assert mock_get.call_count == 2
+
+
+def test_api_service_shares_pooled_session():
+    first = APIService(base_url="https://example.com", pool_size=7)
+    second = APIService(base_url="https://other.com", pool_size=7)
+
+    assert first.session is second.session
+    assert first.session.get_adapter("https://example.com")._pool_maxsize == 7
+    assert "gzip" in first.session.headers["Accept-Encoding"]
+
+
+@patch("requests.Session.get")
+def test_api_service_cache_serves_not_modified(mock_get, tmp_path):
+    fresh = MagicMock(status_code=200, headers={"ETag": '"v1"'}, content=b'[{"id": 1}]')
+    fresh.json.return_value = [{"id": 1}]
+    mock_get.side_effect = [fresh, MagicMock(status_code=304)]
+
+    api = APIService(base_url="https://example.com", cache=HTTPCache(str(tmp_path)))
+    first = api.get(params={"page": 1})
+    second = api.get(params={"page": 1})
+
+    assert second == first == [{"id": 1}]
+    assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+
+
+@patch("src.services.api_service.time.sleep")
+@patch("requests.Session.get")
+def test_api_service_honours_retry_after_on_429(mock_get, mock_sleep):
+    throttled = MagicMock(status_code=429, headers={"Retry-After": "7"})
+    throttled.raise_for_status.side_effect = requests.HTTPError("429 Too Many Requests")
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"ok": True}
+    mock_get.side_effect = [throttled, ok]
+    concurrency = AdaptiveConcurrency(initial=4)
+
+    api = APIService(base_url="https://example.com", concurrency=concurrency)
+
+    assert api.get() == {"ok": True}
+    mock_sleep.assert_called_once_with(7.0)
+    assert concurrency.limit == 2
+
+
+@patch("src.services.api_service.time.sleep")
+@patch("requests.Session.get")
+def test_api_service_server_errors_do_not_raise_concurrency(mock_get, mock_sleep):
+    failing = MagicMock(status_code=500, headers={})
+    failing.raise_for_status.side_effect = requests.HTTPError("500 Server Error")
+    mock_get.return_value = failing
+    concurrency = AdaptiveConcurrency(initial=1)
+
+    api = APIService(base_url="https://example.com", max_retries=3, concurrency=concurrency)
+
+    with pytest.raises(ExtractError):
+        api.get()
+    assert concurrency.limit == 1
+
+
+@patch("requests.Session.get")
+def test_api_service_does_not_retry_client_errors(mock_get):
+    not_found = MagicMock(status_code=404, headers={})
+    not_found.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
+    mock_get.return_value = not_found
+
+    api = APIService(base_url="https://example.com", max_retries=3)
+
+    with pytest.raises(ExtractError):
+        api.get()
+    assert mock_get.call_count == 1
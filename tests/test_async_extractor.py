@@ -0,0 +1,59 @@
+import asyncio
+import httpx
+import pytest
+
+from src.etl.async_extractor import AsyncExtractor
+from src.services.async_api_service import AsyncAPIService
+from src.core.exceptions import ExtractError
+
+
+def test_async_extractor_fetch_many_keeps_order():
+    def handler(request):
+        return httpx.Response(200, json=[{"uf": request.url.path.rsplit("/", 1)[-1]}])
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    extractor = AsyncExtractor(base_url="https://fake.com/estados/", client=client)
+
+    data = extractor.fetch_many_sync(["SP", "RJ", "MG"])
+
+    assert data == [[{"uf": "SP"}], [{"uf": "RJ"}], [{"uf": "MG"}]]
+
+
+def test_async_api_service_caps_concurrency_per_host():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"ok": True})
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncAPIService(base_url="https://fake.com/", per_host_limit=2, client=client) as api:
+            await asyncio.gather(*(api.get(str(i)) for i in range(6)))
+        await client.aclose()
+
+    asyncio.run(run())
+
+    assert peak == 2
+
+
+def test_async_api_service_retries_then_raises():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(500)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    api = AsyncAPIService(base_url="https://fake.com", max_retries=2, backoff_factor=0, client=client)
+
+    with pytest.raises(ExtractError):
+        asyncio.run(api.get())
+
+    assert calls == 2
@@ -0,0 +1,31 @@
+import pandas as pd
+
+from benchmarks.fake_bigquery import FakeBigQueryClient
+from benchmarks.run import compare, main, run_scenario
+from src.etl.loader import Loader
+from src.services.metadata_cache import MetadataCache
+
+
+def test_fake_bigquery_client_backs_the_loader():
+    client = FakeBigQueryClient()
+    loader = Loader(project_id="bench", client=client)
+    loader.bq.metadata_cache = MetadataCache()
+
+    result = loader.load(df=pd.DataFrame({"id": [1, 2]}), dataset_id="bench", table_id="estados")
+
+    assert result["output_rows"] == 2
+    assert client.rows == {"bench.estados": 2}
+    assert "bench" in client.datasets
+
+
+def test_benchmark_scenario_reports_throughput_and_regressions():
+    result = run_scenario("transform_arrow", 1200, latency=0.0)
+
+    assert result["rows"] == 1200
+    assert result["stages"]["transform"]["calls"] == 1
+    assert compare([result], {"transform_arrow@1200": result["rows_per_s"] * 10}, tolerance=0.2)
+    assert not compare([result], {}, tolerance=0.2)
+
+
+def test_benchmark_fails_without_a_baseline(tmp_path):
+    assert main(["--scenarios", "transform_arrow", "--sizes", "100", "--baseline", str(tmp_path / "none.json")]) == 2
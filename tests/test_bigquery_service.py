@@ -1,6 +1,15 @@
+import itertools
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from google.cloud import bigquery
 from unittest.mock import patch, MagicMock
-from src.services.bigquery_service import BigQueryService
+from google.api_core.exceptions import NotFound
+from src.core.exceptions import LoadError
+from src.services.bigquery_service import BigQueryService, merge_statement
+from src.services.metadata_cache import MetadataCache
+from src.services.query_cache import QueryCache
 
 
 @patch("google.cloud.bigquery.Client")
@@ -9,13 +18,318 @@ def test_bq_load_dataframe(mock_client):
 
     mock_job = MagicMock()
     mock_job.job_id = "12345"
+    mock_job.output_rows = 1
     instance.load_table_from_dataframe.return_value = mock_job
-    instance.get_table.return_value = MagicMock(num_rows=1)
 
-    service = BigQueryService(project_id="project")
+    service = BigQueryService(project_id="project", metadata_cache=MetadataCache())
     df = pd.DataFrame({"id": [1]})
 
     result = service.load_dataframe(df, "dataset", "table")
 
     assert result["status"] == "success"
+    assert result["output_rows"] == 1
     assert instance.load_table_from_dataframe.called
+    assert not instance.get_table.called
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_load_arrow_uses_parquet(mock_client):
+    instance = mock_client.return_value
+
+    mock_job = MagicMock()
+    mock_job.job_id = "67890"
+    mock_job.output_rows = 1
+    instance.load_table_from_file.return_value = mock_job
+
+    service = BigQueryService(project_id="project")
+    table = pa.table({"id": [1], "regiao": [{"id": 1, "nome": "Norte"}]})
+
+    result = service.load_arrow(table, "dataset", "table", create_dataset=False)
+
+    assert result == {"status": "success", "job_id": "67890", "output_rows": 1}
+    job_config = instance.load_table_from_file.call_args.kwargs["job_config"]
+    assert job_config.source_format == "PARQUET"
+    assert not instance.load_table_from_dataframe.called
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_bulk_load_fans_out_shards(mock_client):
+    instance = mock_client.return_value
+    jobs = []
+    job_numbers = itertools.count()
+
+    def fake_load(buffer, destination, job_config=None, location=None):
+        job = MagicMock(job_id=f"job-{next(job_numbers)}", output_rows=pq.read_table(buffer).num_rows)
+        job.disposition = job_config.write_disposition
+        jobs.append(job)
+        return job
+
+    instance.load_table_from_file.side_effect = fake_load
+
+    service = BigQueryService(project_id="project")
+    df = pd.DataFrame({"id": range(5)})
+
+    result = service.bulk_load(df, "dataset", "table", write_disposition="WRITE_TRUNCATE",
+                               create_dataset=False, shard_rows=2, max_workers=2)
+
+    assert result["jobs"] == 3
+    assert result["output_rows"] == 5
+    assert sorted(result["job_ids"]) == ["job-0", "job-1", "job-2"]
+    assert [job.disposition for job in jobs] == ["WRITE_TRUNCATE", "WRITE_APPEND", "WRITE_APPEND"]
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_bulk_load_one_job_per_partition(mock_client):
+    instance = mock_client.return_value
+    destinations = []
+
+    def fake_load(buffer, destination, job_config=None, location=None):
+        destinations.append((destination.table_id, job_config.write_disposition))
+        return MagicMock(job_id=destination.table_id, output_rows=pq.read_table(buffer).num_rows)
+
+    instance.load_table_from_file.side_effect = fake_load
+
+    service = BigQueryService(project_id="project")
+    df = pd.DataFrame({"id": [1, 2, 3], "dia": ["2024-01-01", "2024-01-02", "2024-01-01"]})
+
+    result = service.bulk_load(df, "dataset", "table", write_disposition="WRITE_TRUNCATE",
+                               create_dataset=False, partition_field="dia")
+
+    assert result["output_rows"] == 3
+    assert sorted(destinations) == [("table$20240101", "WRITE_TRUNCATE"), ("table$20240102", "WRITE_TRUNCATE")]
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_bulk_load_truncates_each_partition_once_across_frames(mock_client):
+    instance = mock_client.return_value
+    loads = []
+
+    def fake_load(buffer, destination, job_config=None, location=None):
+        rows = pq.read_table(buffer).num_rows
+        loads.append((destination.table_id, job_config.write_disposition, rows))
+        return MagicMock(job_id=f"job-{len(loads)}", output_rows=rows)
+
+    instance.load_table_from_file.side_effect = fake_load
+
+    service = BigQueryService(project_id="project")
+    frames = [
+        pd.DataFrame({"id": [1, 2, 3], "dia": ["2024-01-01", "2024-01-01", "2024-01-02"]}),
+        pd.DataFrame({"id": [4, 5], "dia": ["2024-01-01", "2024-01-02"]}),
+    ]
+
+    result = service.bulk_load(iter(frames), "dataset", "table", write_disposition="WRITE_TRUNCATE",
+                               create_dataset=False, partition_field="dia", shard_rows=1, max_workers=4)
+
+    assert result["output_rows"] == 5
+    assert all(rows == 1 for _, _, rows in loads)
+    for partition, shards in (("table$20240101", 3), ("table$20240102", 2)):
+        dispositions = [disposition for table_id, disposition, _ in loads if table_id == partition]
+        # the truncate lands first and only once; the partition's other shards append after it
+        assert dispositions == ["WRITE_TRUNCATE"] + ["WRITE_APPEND"] * (shards - 1)
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_metadata_cached_across_loads(mock_client):
+    instance = mock_client.return_value
+    instance.load_table_from_dataframe.return_value = MagicMock(job_id="1", output_rows=1)
+    schema = [bigquery.SchemaField("id", "INT64")]
+    cache = MetadataCache()
+
+    for _ in range(3):
+        # a new service per call, like separate warm invocations sharing the process
+        service = BigQueryService(project_id="project", metadata_cache=cache)
+        service.load_dataframe(pd.DataFrame({"id": [1]}), "dataset", "table", create_table=True, table_schema=schema)
+
+    assert instance.get_dataset.call_count == 1
+    assert instance.get_table.call_count == 1
+    assert instance.load_table_from_dataframe.call_count == 3
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_metadata_invalidated_on_not_found(mock_client):
+    instance = mock_client.return_value
+    failed_job = MagicMock(job_id="1")
+    failed_job.result.side_effect = NotFound("table gone")
+    instance.load_table_from_dataframe.side_effect = [failed_job, MagicMock(job_id="2", output_rows=1)]
+    cache = MetadataCache()
+    service = BigQueryService(project_id="project", metadata_cache=cache)
+
+    with pytest.raises(LoadError):
+        service.load_dataframe(pd.DataFrame({"id": [1]}), "dataset", "table")
+    assert cache.get(("project", "dataset")) is None
+
+    service.load_dataframe(pd.DataFrame({"id": [1]}), "dataset", "table")
+    assert instance.get_dataset.call_count == 2
+
+
+def test_merge_statement_updates_changed_rows_and_inserts_new_keys():
+    sql = merge_statement("p.d.t", "p.d.stage", ["id", "nome", "regiao"], ["id"])
+
+    assert sql.startswith("MERGE `p.d.t` T")
+    assert "WHERE S.`id` IS NOT NULL" in sql
+    assert "QUALIFY ROW_NUMBER() OVER (PARTITION BY S.`id` ORDER BY TO_JSON_STRING(S)) = 1" in sql
+    assert "ON T.`id` = S.`id`" in sql
+    assert "TO_JSON_STRING(T.`nome`) != TO_JSON_STRING(S.`nome`)" in sql
+    assert "UPDATE SET `nome` = S.`nome`, `regiao` = S.`regiao`" in sql
+    assert sql.endswith("INSERT (`id`, `nome`, `regiao`) VALUES (S.`id`, S.`nome`, S.`regiao`)")
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_merge_load_stages_merges_and_cleans_up(mock_client):
+    instance = mock_client.return_value
+    instance.load_table_from_dataframe.return_value = MagicMock(job_id="load-1", output_rows=2)
+
+    service = BigQueryService(project_id="project", metadata_cache=MetadataCache())
+    df = pd.DataFrame({"id": [1, 2], "nome": ["A", "B"]})
+
+    result = service.merge_load(df, "dataset", "table", key_columns=["id"], create_dataset=False)
+
+    staging_ref = instance.load_table_from_dataframe.call_args.args[1]
+    assert staging_ref.table_id.startswith("table__staging_")
+    assert instance.create_table.call_args.args[0].expires is not None
+    merge_sql = instance.query.call_args.args[0]
+    assert merge_sql.startswith("MERGE `project.dataset.table` T")
+    assert f"`project.dataset.{staging_ref.table_id}`" in merge_sql
+    instance.delete_table.assert_called_once_with(staging_ref, not_found_ok=True)
+    assert result == {"status": "success", "job_id": "load-1", "output_rows": 2, "merge_keys": ["id"]}
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_merge_load_drops_staging_on_failure(mock_client):
+    instance = mock_client.return_value
+    instance.load_table_from_dataframe.return_value = MagicMock(job_id="load-1", output_rows=1)
+    instance.query.side_effect = RuntimeError("merge failed")
+
+    service = BigQueryService(project_id="project", metadata_cache=MetadataCache())
+
+    with pytest.raises(LoadError):
+        service.merge_load(pd.DataFrame({"id": [1]}), "dataset", "table", key_columns=["id"], create_dataset=False)
+    assert instance.delete_table.called
+
+    with pytest.raises(LoadError):
+        service.merge_load(pd.DataFrame({"id": [1]}), "dataset", "table", key_columns=["codigo"])
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_merge_load_keeps_last_row_per_key(mock_client):
+    instance = mock_client.return_value
+    staged = []
+
+    def fake_load(buffer, destination, job_config=None, location=None):
+        staged.append(pq.read_table(buffer).to_pylist())
+        return MagicMock(job_id="load-1", output_rows=len(staged[-1]))
+
+    instance.load_table_from_file.side_effect = fake_load
+    service = BigQueryService(project_id="project", metadata_cache=MetadataCache())
+    table = pa.table({"id": [1, 2, 1], "nome": ["A", "B", "A2"]})
+
+    service.merge_load(table, "dataset", "table", key_columns=["id"], create_dataset=False)
+
+    assert staged == [[{"id": 2, "nome": "B"}, {"id": 1, "nome": "A2"}]]
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_merge_load_rejects_null_keys(mock_client):
+    instance = mock_client.return_value
+    service = BigQueryService(project_id="project", metadata_cache=MetadataCache())
+
+    for data in (pd.DataFrame({"id": [1, None], "nome": ["A", "B"]}), pa.table({"id": [1, None]})):
+        with pytest.raises(LoadError):
+            service.merge_load(data, "dataset", "table", key_columns=["id"], create_dataset=False)
+
+    assert not instance.create_table.called
+    assert not instance.query.called
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_iter_query_pages_yields_page_by_page(mock_client):
+    result = MagicMock()
+    result.pages = iter([[{"id": 1}, {"id": 2}], [{"id": 3}]])
+    mock_client.return_value.query.return_value.result.return_value = result
+
+    service = BigQueryService(project_id="project")
+    pages = list(service.iter_query_pages("SELECT id FROM t", page_size=2, max_rows=3))
+
+    assert pages == [[{"id": 1}, {"id": 2}], [{"id": 3}]]
+    mock_client.return_value.query.return_value.result.assert_called_once_with(page_size=2, max_results=3)
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_iter_query_arrow_applies_row_and_byte_caps(mock_client):
+    batches = [pa.record_batch({"id": list(range(i, i + 4))}) for i in (0, 4, 8)]
+    result = MagicMock()
+    result.to_arrow_iterable.side_effect = lambda bqstorage_client=None: iter(batches)
+    mock_client.return_value.query.return_value.result.return_value = result
+
+    service = BigQueryService(project_id="project")
+
+    capped_rows = list(service.iter_query_arrow("SELECT id FROM t", max_rows=6, use_storage_api=False))
+    assert [batch.num_rows for batch in capped_rows] == [4, 2]
+    assert result.to_arrow_iterable.call_args.kwargs["bqstorage_client"] is None
+
+    capped_bytes = list(service.iter_query_arrow("SELECT id FROM t", max_bytes=batches[0].nbytes * 2,
+                                                 use_storage_api=False))
+    assert sum(batch.num_rows for batch in capped_bytes) == 8
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_run_query_caches_until_a_referenced_table_changes(mock_client):
+    instance = mock_client.return_value
+    instance.query.return_value.result.return_value = [{"id": 1}]
+    instance.get_table.return_value.modified = "2024-01-01T00:00:00"
+    instance.get_table.return_value.table_type = "TABLE"
+
+    service = BigQueryService(project_id="project", metadata_cache=MetadataCache(), query_cache=QueryCache())
+    sql = "SELECT id FROM dataset.table WHERE id = @id"
+    config = bigquery.QueryJobConfig(query_parameters=[bigquery.ScalarQueryParameter("id", "INT64", 1)])
+
+    assert service.run_query(sql, job_config=config) == [{"id": 1}]
+    assert service.run_query(sql.replace(" ", "  "), job_config=config) == [{"id": 1}]
+    assert instance.query.call_count == 1
+    instance.get_table.assert_called_with("project.dataset.table")
+
+    other = bigquery.QueryJobConfig(query_parameters=[bigquery.ScalarQueryParameter("id", "INT64", 2)])
+    service.run_query(sql, job_config=other)
+    assert instance.query.call_count == 2
+
+    instance.get_table.return_value.modified = "2024-01-02T00:00:00"
+    service.run_query(sql, job_config=config)
+    assert instance.query.call_count == 3
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_loads_and_dml_invalidate_cached_queries(mock_client):
+    instance = mock_client.return_value
+    instance.query.return_value.result.return_value = [{"total": 1}]
+    instance.load_table_from_dataframe.return_value.output_rows = 1
+    instance.get_table.return_value.table_type = "TABLE"
+    cache = QueryCache()
+
+    service = BigQueryService(project_id="project", metadata_cache=MetadataCache(), query_cache=cache)
+    sql = "SELECT COUNT(*) AS total FROM `project.dataset.table`"
+    service.run_query(sql)
+    service.load_dataframe(pd.DataFrame({"id": [1]}), "dataset", "table", create_dataset=False)
+    service.run_query(sql)
+    assert instance.query.call_count == 2
+
+    service.run_query("DELETE FROM dataset.table WHERE TRUE")
+    service.run_query(sql)
+    assert instance.query.call_count == 4
+
+    service.run_query(sql, use_cache=False)
+    assert instance.query.call_count == 5
+
+
+@patch("google.cloud.bigquery.Client")
+def test_bq_run_query_skips_cache_for_unresolved_tables_and_views(mock_client):
+    instance = mock_client.return_value
+    instance.query.return_value.result.return_value = [{"total": 1}]
+    instance.get_table.return_value.table_type = "VIEW"
+
+    service = BigQueryService(project_id="project", metadata_cache=MetadataCache(), query_cache=QueryCache())
+    # `t` resolves through a default dataset: no table version would ever move the key
+    for sql in ("SELECT COUNT(*) AS total FROM t", "SELECT COUNT(*) AS total FROM dataset.view"):
+        service.run_query(sql)
+        service.run_query(sql)
+
+    assert instance.query.call_count == 4
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.core.exceptions import ConfigError
+from src.etl.change_detection import ChangeDetector, config_change_detector, fingerprint
+from src.etl.jobs import JobSpec
+from src.services.state_store import FileStateStore
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"id": 1, "nome": "A"}) == fingerprint({"nome": "A", "id": 1})
+    assert fingerprint({"id": 1, "nome": "A"}) != fingerprint({"id": 1, "nome": "B"})
+
+
+def test_change_detector_keeps_only_changed_records(tmp_path):
+    store = FileStateStore(str(tmp_path / "state.json"))
+    first = ChangeDetector(store, "src", key_field="id")
+    records = [{"id": 1, "nome": "A"}, {"id": 2, "nome": "B"}]
+    assert first.filter(records) == records
+    assert first.commit()
+
+    second = ChangeDetector(store, "src", key_field="id")
+    assert second.filter([{"id": 1, "nome": "A"}, {"id": 2, "nome": "B2"}, {"id": 3, "nome": "C"}]) == [
+        {"id": 2, "nome": "B2"},
+        {"id": 3, "nome": "C"},
+    ]
+    assert (second.changed, second.unchanged) == (2, 1)
+
+
+def test_change_detector_unchanged_payload_skips_commit(tmp_path):
+    store = FileStateStore(str(tmp_path / "state.json"))
+    records = [{"id": 1, "nome": "A"}]
+    detector = ChangeDetector(store, "src")
+    detector.filter(records)
+    detector.commit()
+
+    again = ChangeDetector(store, "src")
+    assert again.filter([{"nome": "A", "id": 1}]) == []
+    assert again.payload_unchanged
+    assert not again.commit()
+
+
+def test_change_detection_requires_merge_keys(tmp_path):
+    with patch("src.core.config.Config.CHANGE_DETECTION", True), \
+            patch("src.core.config.Config.STATE_PATH", str(tmp_path / "state.json")), \
+            patch("src.core.config.Config.MERGE_KEYS", []):
+        with pytest.raises(ConfigError):
+            config_change_detector()
+        with pytest.raises(ConfigError):
+            JobSpec(name="estados", url="https://ibge", table="estados", write_disposition="WRITE_TRUNCATE")
+
+        assert config_change_detector(merge_keys=["id"]) is not None
+        assert JobSpec(name="estados", url="https://ibge", table="estados", merge_keys=["id"]).merge_keys == ["id"]
@@ -0,0 +1,152 @@
+import time
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from src.core.exceptions import LoadError
+from src.etl.checkpoint import RunCheckpoint
+from src.etl.incremental import Watermark
+from src.etl.pipeline import Pipeline
+from src.etl.transformer import Transformer
+from src.models.schema_definition import IBGE_STATE_SCHEMA
+from src.models.schema_validator import SchemaValidator
+from src.services.state_store import FileStateStore
+
+
+def _batches(*ids):
+    for batch in ids:
+        yield [{"id": i, "nome": f"UF {i}"} for i in batch]
+
+
+def _ids(frame):
+    column = frame["id"]
+    return column.to_pylist() if hasattr(column, "to_pylist") else column.tolist()
+
+
+def _failing_loader(fail_on_call):
+    loader = MagicMock()
+    calls = []
+
+    def load(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == fail_on_call:
+            raise LoadError("transient")
+        return {"status": "success", "job_id": f"job-{len(calls)}"}
+    loader.load.side_effect = load
+    return loader, calls
+
+
+@pytest.mark.parametrize("output_format", ["pandas", "arrow"])
+def test_resume_after_load_failure_skips_extraction(tmp_path, output_format):
+    store = FileStateStore(str(tmp_path / "state.json"))
+    loader, calls = _failing_loader(fail_on_call=2)
+    watermark = Watermark(store, "src", kind="id", field="id")
+    source = (watermark.filter(batch) for batch in _batches([1, 2], [3], [4, 5]))
+
+    with pytest.raises(LoadError):
+        Pipeline(Transformer(output_format=output_format), loader, queue_size=1).run(
+            source, dataset_id="d", table_id="t", write_disposition="WRITE_TRUNCATE",
+            checkpoint=RunCheckpoint(str(tmp_path / "spill"), "run", trackers=[watermark]),
+        )
+
+    def untouched():
+        raise AssertionError("the source must not be read again")
+        yield
+
+    retry_watermark = Watermark(store, "src", kind="id", field="id")
+    checkpoint = RunCheckpoint(str(tmp_path / "spill"), "run", trackers=[retry_watermark])
+    assert checkpoint.progress() == {"consumed": 3, "spilled": 3, "loaded": 1, "extracted": True}
+
+    result = Pipeline(Transformer(output_format=output_format), loader).run(
+        untouched(), dataset_id="d", table_id="t", write_disposition="WRITE_TRUNCATE", checkpoint=checkpoint,
+    )
+
+    assert result["resumed_batches"] == 2
+    assert result["records"] == 3
+    assert [_ids(call["df"]) for call in calls[2:]] == [[3], [4, 5]]
+    # the truncate already happened with the first batch of the failed run
+    assert [call["write_disposition"] for call in calls] == ["WRITE_TRUNCATE", "WRITE_APPEND", "WRITE_APPEND",
+                                                             "WRITE_APPEND"]
+    assert retry_watermark.commit() and store.get("src")["value"] == 5
+    assert not (tmp_path / "spill").exists() or not any((tmp_path / "spill").iterdir())
+
+
+def test_resume_reads_schema_typed_spills_back(tmp_path):
+    # IBGE_STATE_SCHEMA makes "regiao" an Arrow struct column, which pd.read_parquet can't rebuild
+    records = [{"id": i, "nome": f"UF {i}", "sigla": "UF", "regiao": {"id": 1, "nome": "Norte", "sigla": "N"}}
+               for i in (1, 2)]
+    loader, calls = _failing_loader(fail_on_call=1)
+
+    with pytest.raises(LoadError):
+        Pipeline(Transformer(schema=IBGE_STATE_SCHEMA), loader).run(
+            iter([records]), dataset_id="d", table_id="t",
+            checkpoint=RunCheckpoint(str(tmp_path / "spill"), "run"),
+        )
+    result = Pipeline(Transformer(schema=IBGE_STATE_SCHEMA), loader).run(
+        iter([]), dataset_id="d", table_id="t", checkpoint=RunCheckpoint(str(tmp_path / "spill"), "run"),
+    )
+
+    assert (result["resumed_batches"], result["records"]) == (1, 2)
+    pd.testing.assert_frame_equal(calls[1]["df"], Transformer(schema=IBGE_STATE_SCHEMA).run(records))
+
+
+def test_resume_after_extraction_failure_skips_spilled_batches(tmp_path):
+    loader, calls = _failing_loader(fail_on_call=0)
+
+    def broken_source():
+        yield from _batches([1], [2])
+        raise ConnectionError("upstream down")
+
+    with pytest.raises(ConnectionError):
+        Pipeline(Transformer(), loader, queue_size=1).run(
+            broken_source(), dataset_id="d", table_id="t", checkpoint=RunCheckpoint(str(tmp_path), "run"),
+        )
+    loaded_before = len(calls)
+
+    checkpoint = RunCheckpoint(str(tmp_path), "run")
+    assert not checkpoint.extracted
+    Pipeline(Transformer(), loader).run(_batches([1], [2], [3]), dataset_id="d", table_id="t", checkpoint=checkpoint)
+
+    assert sorted(i for call in calls for i in _ids(call["df"])) == [1, 2, 3]
+    assert loaded_before <= 2
+
+
+def test_resume_skips_batches_rejected_whole(tmp_path):
+    loader, calls = _failing_loader(fail_on_call=0)
+
+    failing = RunCheckpoint(str(tmp_path), "run")
+
+    def source(fail):
+        yield [{"id": 1, "nome": "A"}]
+        yield [{"id": "bad", "nome": "B"}]
+        yield [{"id": 2, "nome": "C"}]
+        if fail:
+            # fail only once the batch before is spilled
+            deadline = time.monotonic() + 5
+            while failing.spilled < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            raise ConnectionError("upstream down")
+        yield [{"id": 3, "nome": "D"}]
+
+    def pipeline():
+        return Pipeline(Transformer(), loader, queue_size=1, validator=SchemaValidator(IBGE_STATE_SCHEMA))
+
+    with pytest.raises(ConnectionError):
+        pipeline().run(source(fail=True), dataset_id="d", table_id="t", checkpoint=failing)
+
+    checkpoint = RunCheckpoint(str(tmp_path), "run")
+    assert (checkpoint.consumed, checkpoint.spilled) == (3, 2)
+    pipeline().run(source(fail=False), dataset_id="d", table_id="t", checkpoint=checkpoint)
+
+    assert sorted(i for call in calls for i in _ids(call["df"])) == [1, 2, 3]
+
+
+def test_stale_or_foreign_manifest_is_discarded(tmp_path):
+    now = [0.0]
+    checkpoint = RunCheckpoint(str(tmp_path), "run", clock=lambda: now[0])
+    checkpoint.spill(Transformer(output_format="arrow").run([{"id": 1}]))
+
+    assert RunCheckpoint(str(tmp_path), "run", clock=lambda: now[0]).spilled == 1
+    now[0] = 25 * 3600
+    assert RunCheckpoint(str(tmp_path), "run", clock=lambda: now[0]).spilled == 0
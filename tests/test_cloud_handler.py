@@ -1,4 +1,8 @@
+import subprocess
+import sys
 from unittest.mock import patch, MagicMock
+
+import src.cloud_function_handler as handler
 from src.cloud_function_handler import main
 
 
@@ -23,3 +27,43 @@ def test_cloud_fn_success(mock_extract, mock_transform, mock_load):
 
     assert status == 200
     assert response.json["status"] == "success"
+
+
+@patch("google.cloud.bigquery.Client")
+def test_cloud_fn_components_reused_across_invocations(mock_client):
+    handler._COMPONENTS = handler._BQ_CLIENT = None
+    try:
+        first = handler.get_components()
+        second = handler.get_components()
+    finally:
+        handler._COMPONENTS = handler._BQ_CLIENT = None
+
+    assert first is second
+    assert first["loader"].bq.client is mock_client.return_value
+    assert mock_client.call_count == 1
+
+
+@patch("src.etl.jobs.run_jobs", return_value={"status": "success", "jobs": {}})
+@patch("src.etl.jobs.load_job_specs", return_value=[])
+@patch("google.cloud.bigquery.Client")
+def test_cloud_fn_jobs_mode_skips_single_job_components(mock_client, mock_specs, mock_run_jobs):
+    handler._COMPONENTS = handler._BQ_CLIENT = None
+    try:
+        with patch("src.core.config.Config.ETL_JOBS", '{"jobs": []}'), \
+                patch("src.cloud_function_handler._build_components") as mock_build, \
+                patch("src.cloud_function_handler.jsonify", side_effect=lambda body: body), \
+                patch.dict("os.environ", {"GCP_PROJECT_ID": "p", "BIGQUERY_DATASET": "d"}):
+            body, status = main(MockRequest())
+    finally:
+        handler._COMPONENTS = handler._BQ_CLIENT = None
+
+    assert (body["status"], status) == ("success", 200)
+    assert not mock_build.called
+    assert mock_run_jobs.call_args.kwargs["client"] is mock_client.return_value
+
+
+def test_cloud_fn_module_defers_heavy_imports():
+    code = "import sys, src.cloud_function_handler; print(sorted({'pandas', 'pyarrow', 'google.cloud.bigquery'} & set(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+    assert out.strip() == "[]"
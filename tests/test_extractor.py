@@ -1,6 +1,7 @@
 import pytest
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 from src.etl.extractor import Extractor
+from src.etl.pagination import Pagination
 from src.core.exceptions import ExtractError
 
 
@@ -23,3 +24,63 @@ def test_extractor_error(mock_get):
 
     with pytest.raises(ExtractError):
         extractor.fetch_data()
+
+
+@patch("src.services.api_service.APIService.get")
+def test_extractor_offset_pagination_keeps_page_order(mock_get):
+    rows = [{"id": i} for i in range(7)]
+
+    def fake_get(endpoint="", params=None):
+        start = params["offset"]
+        return rows[start:start + params["limit"]]
+
+    mock_get.side_effect = fake_get
+
+    extractor = Extractor(base_url="https://fake.com", max_workers=3)
+    data = extractor.fetch_data(pagination=Pagination(strategy="offset", page_size=2))
+
+    assert [r["id"] for r in data] == list(range(7))
+
+
+@patch("src.services.api_service.APIService.get_response")
+def test_extractor_cursor_pagination(mock_get_response):
+    pages = {
+        None: {"items": [{"id": 1}], "next": "b"},
+        "b": {"items": [{"id": 2}], "next": None},
+    }
+
+    def fake_get_response(endpoint="", params=None, url=None):
+        resp = MagicMock()
+        resp.json.return_value = pages[params.get("cursor")]
+        return resp
+
+    mock_get_response.side_effect = fake_get_response
+
+    extractor = Extractor(base_url="https://fake.com")
+    pagination = Pagination(strategy="cursor", records_field="items", cursor_field="next")
+    data = extractor.fetch_data(pagination=pagination)
+
+    assert data == [{"id": 1}, {"id": 2}]
+    assert mock_get_response.call_count == 2
+
+
+@patch("src.services.api_service.APIService.iter_content")
+def test_extractor_stream_batches_parses_across_chunks(mock_iter_content):
+    body = b'[{"id": 1, "nome": "Rond\xc3\xb4nia"}, {"id": 2}, {"id": 3}]'
+    # split mid-record and mid-multibyte character
+    mock_iter_content.return_value = iter([body[:20], body[20:25], body[25:]])
+
+    extractor = Extractor(base_url="https://fake.com")
+    batches = list(extractor.stream_batches(batch_size=2))
+
+    assert batches == [[{"id": 1, "nome": "Rondônia"}, {"id": 2}], [{"id": 3}]]
+
+
+@patch("src.services.api_service.APIService.iter_content")
+def test_extractor_stream_batches_truncated_body(mock_iter_content):
+    mock_iter_content.return_value = iter([b'[{"id": 1}, {"id"'])
+
+    extractor = Extractor(base_url="https://fake.com")
+
+    with pytest.raises(ExtractError):
+        list(extractor.stream_batches())
@@ -0,0 +1,33 @@
+from src.services.http_cache import HTTPCache
+
+
+def test_http_cache_persists_entries_across_instances(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    key = cache.key("https://api/x", {"b": 2, "a": 1})
+    assert key == cache.key("https://api/x", {"a": 1, "b": 2})
+
+    assert cache.put(key, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, b'{"ok": true}', {"ok": True})
+
+    reopened = HTTPCache(str(tmp_path))
+    assert reopened.validators(key) == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert reopened.get(key) == {"ok": True}
+
+
+def test_http_cache_skips_responses_without_validators(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    assert not cache.put("a", {}, b"[]", [])
+    assert not cache.put("b", {"ETag": '"v"', "Cache-Control": "no-store"}, b"[]", [])
+    assert cache.validators("a") == {}
+
+
+def test_http_cache_evicts_least_recently_used(tmp_path):
+    cache = HTTPCache(str(tmp_path), max_bytes=10)
+    cache.put("a", {"ETag": "a"}, b"1234", 1234)
+    cache.put("b", {"ETag": "b"}, b"5678", 5678)
+    cache.get("a")
+    cache.put("c", {"ETag": "c"}, b"9012", 9012)
+
+    assert cache.get("a") == 1234
+    assert cache.get("c") == 9012
+    assert cache.validators("b") == {}
+    assert not (tmp_path / "b.body").exists()
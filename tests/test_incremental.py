@@ -0,0 +1,54 @@
+from unittest.mock import MagicMock, patch
+
+from src.etl.extractor import Extractor
+from src.etl.incremental import Watermark
+from src.services.state_store import FileStateStore
+
+
+def test_watermark_filters_and_commits_high_mark(tmp_path):
+    store = FileStateStore(str(tmp_path / "state.json"))
+    store.set("src", {"value": "2024-01-02T00:00:00Z"})
+    watermark = Watermark(store, "src", kind="timestamp", field="updated_at", param="since")
+
+    assert watermark.params({"limit": 10}) == {"limit": 10, "since": "2024-01-02T00:00:00Z"}
+
+    records = [
+        {"id": 1, "updated_at": "2024-01-01T00:00:00"},
+        {"id": 2, "updated_at": "2024-01-03T00:00:00+00:00"},
+        {"id": 3, "updated_at": "2024-01-02T12:00:00"},
+    ]
+    assert [r["id"] for r in watermark.filter(records)] == [2, 3]
+    assert store.get("src")["value"] == "2024-01-02T00:00:00Z"
+
+    assert watermark.commit()
+    assert store.get("src")["value"] == "2024-01-03T00:00:00+00:00"
+    assert not watermark.commit()
+
+
+def test_watermark_id_kind_compares_numerically(tmp_path):
+    store = FileStateStore(str(tmp_path / "state.json"))
+    watermark = Watermark(store, "src", kind="id", field="id")
+
+    assert len(watermark.filter([{"id": "9"}, {"id": "10"}])) == 2
+    watermark.commit()
+
+    reloaded = Watermark(store, "src", kind="id", field="id")
+    assert reloaded.filter([{"id": 10}, {"id": 11}]) == [{"id": 11}]
+
+
+@patch("src.services.api_service.APIService.get_response")
+def test_fetch_changed_skips_not_modified(mock_get_response, tmp_path):
+    store = FileStateStore(str(tmp_path / "state.json"))
+    changed = MagicMock(status_code=200, headers={"ETag": '"v1"'})
+    changed.json.return_value = [{"id": 1}]
+    mock_get_response.side_effect = [changed, MagicMock(status_code=304)]
+
+    extractor = Extractor(base_url="https://fake.com")
+    watermark = Watermark(store, "src", kind="etag")
+    assert extractor.fetch_changed(watermark) == [{"id": 1}]
+    watermark.commit()
+
+    watermark = Watermark(store, "src", kind="etag")
+    assert extractor.fetch_changed(watermark) == []
+    assert mock_get_response.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert not watermark.commit()
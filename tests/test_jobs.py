@@ -0,0 +1,74 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.core.exceptions import ConfigError
+from src.etl.jobs import JobSpec, load_job_specs, run_job, run_jobs
+
+SPEC = {"jobs": [
+    {"name": "regioes", "url": "https://ibge/api/v1/localidades", "endpoint": "regioes", "table": "regioes"},
+    {"name": "estados", "url": "https://ibge/api/v1/localidades", "endpoint": "estados", "table": "estados",
+     "depends_on": ["regioes"], "merge_keys": ["id"]},
+]}
+
+
+def test_load_job_specs_from_json_or_file(tmp_path):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(SPEC))
+
+    for source in (json.dumps(SPEC), str(path)):
+        regioes, estados = load_job_specs(source)
+        assert (estados.table, estados.depends_on, estados.merge_keys) == ("estados", ["regioes"], ["id"])
+        assert regioes.state_source.startswith("https://ibge/api/v1/localidades/regioes -> ")
+
+    with pytest.raises(ConfigError):
+        load_job_specs('{"jobs": [{"name": "x", "url": "u", "table": "t", "tabela": "t"}]}')
+    with pytest.raises(ConfigError):
+        load_job_specs("[]")
+
+
+@patch("google.cloud.bigquery.Client")
+@patch("src.etl.loader.Loader.load")
+@patch("src.etl.extractor.Extractor.fetch_data")
+def test_run_job_extracts_and_loads_its_table(mock_fetch, mock_load, mock_client):
+    mock_fetch.return_value = [{"id": 1, "nome": "Norte"}]
+    mock_load.return_value = {"status": "success", "job_id": "j1", "output_rows": 1}
+
+    result = run_job(JobSpec(name="regioes", url="https://ibge", endpoint="regioes", table="regioes", dataset="ds"))
+
+    assert result["records"] == 1
+    assert mock_fetch.call_args.kwargs["endpoint"] == "regioes"
+    assert mock_load.call_args.kwargs["table_id"] == "regioes"
+
+
+@patch("google.cloud.bigquery.Client")
+@patch("src.etl.loader.Loader.load")
+@patch("src.etl.extractor.Extractor.fetch_data")
+def test_run_job_validates_records_against_its_schema(mock_fetch, mock_load, mock_client, tmp_path):
+    mock_fetch.return_value = [{"id": 1, "nome": "Norte"}, {"id": "x", "nome": "Sul"}]
+    mock_load.return_value = {"status": "success", "job_id": "j1", "output_rows": 1}
+    schema = [{"name": "id", "type": "INT64", "mode": "REQUIRED"}, {"name": "nome", "type": "STRING"}]
+
+    with patch("src.etl.jobs.Config.VALIDATE_RECORDS", True), \
+            patch("src.etl.jobs.Config.DEAD_LETTER_PATH", str(tmp_path / "dead.ndjson")):
+        result = run_job(JobSpec(name="regioes", url="https://ibge", endpoint="regioes", table="regioes",
+                                 dataset="ds", schema=schema))
+
+    assert (result["records"], result["rejected"]) == (1, 1)
+
+
+def test_run_jobs_aggregates_outcomes():
+    specs = load_job_specs(json.dumps(SPEC))
+
+    def fake_run_job(spec, client=None):
+        if spec.name == "regioes":
+            return {"records": 5}
+        raise ConfigError("falhou")
+
+    with patch("src.etl.jobs.run_job", side_effect=fake_run_job):
+        summary = run_jobs(specs, max_workers=2)
+
+    assert summary["status"] == "partial"
+    assert summary["records"] == 5
+    assert summary["jobs"]["estados"] == {"status": "error", "error": "falhou"}
@@ -1,6 +1,9 @@
 import pandas as pd
+import pyarrow as pa
+import pytest
 from unittest.mock import patch, MagicMock
 
+from src.core.exceptions import LoadError
 from src.etl.loader import Loader
 
 
@@ -21,3 +24,30 @@ def test_loader_calls_bigquery_service(mock_load):
 
     mock_load.assert_called_once()
     assert result["status"] == "success"
+
+
+@patch("src.services.bigquery_service.BigQueryService.load_dataframe")
+@patch("src.services.bigquery_service.BigQueryService.load_arrow")
+@patch("google.cloud.bigquery.Client")
+def test_loader_dispatches_arrow_tables(mock_client, mock_load_arrow, mock_load_dataframe):
+    mock_load_arrow.return_value = {"status": "success"}
+
+    loader = Loader(project_id="test-project")
+    result = loader.load(df=pa.table({"id": [1]}), dataset_id="dataset", table_id="table")
+
+    mock_load_arrow.assert_called_once()
+    assert not mock_load_dataframe.called
+    assert result["status"] == "success"
+
+
+@patch("src.services.bigquery_service.BigQueryService.append_rows")
+@patch("google.cloud.bigquery.Client")
+def test_loader_stream_mode_only_appends(mock_client, mock_append_rows):
+    loader = Loader(project_id="test-project", mode="stream")
+
+    for disposition in ("WRITE_TRUNCATE", "WRITE_EMPTY"):
+        with pytest.raises(LoadError):
+            loader.load(df=pa.table({"id": [1]}), dataset_id="dataset", table_id="table",
+                        write_disposition=disposition)
+
+    assert not mock_append_rows.called
@@ -0,0 +1,42 @@
+import json
+import logging
+
+from src.core.logger import CompactJsonFormatter, EventSampler
+
+
+def _record(msg, level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 1, msg, None, None)
+
+
+def test_compact_formatter_is_single_line_and_evaluates_lazy_fields():
+    calls = []
+    line = CompactJsonFormatter().format(_record({"event": "x", "records": lambda: calls.append(1) or 3}))
+
+    assert "\n" not in line
+    data = json.loads(line)
+    assert data["severity"] == "INFO"
+    assert data["event"] == "x" and data["records"] == 3
+    assert "time" in data and calls == [1]
+
+
+def test_event_sampler_rate_limits_hot_events_only():
+    now = [0.0]
+    sampler = EventSampler(events={"api_request_start"}, max_per_second=2, clock=lambda: now[0])
+
+    hot = [sampler.filter(_record({"event": "api_request_start"})) for _ in range(5)]
+    assert hot == [True, True, False, False, False]
+    assert sampler.filter(_record({"event": "pipeline_finished"}))
+    assert sampler.filter(_record({"event": "api_request_start"}, level=logging.ERROR))
+
+    now[0] = 1.5
+    record = _record({"event": "api_request_start"})
+    assert sampler.filter(record)
+    assert record.msg["suppressed"] == 3
+
+
+def test_event_sampler_samples_by_rate():
+    draws = iter([0.05, 0.5, 0.09, 0.95])
+    sampler = EventSampler(events={"extract_page"}, sample_rate=0.1, rng=lambda: next(draws))
+
+    kept = [sampler.filter(_record({"event": "extract_page"})) for _ in range(4)]
+    assert kept == [True, False, True, False]
@@ -0,0 +1,31 @@
+from src.services.metadata_cache import MetadataCache
+
+
+def test_metadata_cache_expires_after_ttl():
+    now = [0.0]
+    cache = MetadataCache(ttl_seconds=10, clock=lambda: now[0])
+    cache.set(("project", "dataset"))
+
+    now[0] = 9.9
+    assert cache.get(("project", "dataset")) is True
+    now[0] = 10.0
+    assert cache.get(("project", "dataset")) is None
+
+
+def test_metadata_cache_dataset_invalidation_drops_tables():
+    cache = MetadataCache()
+    cache.set(("project", "dataset"))
+    cache.set(("project", "dataset", "table"))
+    cache.set(("project", "other", "table"))
+
+    cache.invalidate(("project", "dataset"))
+
+    assert cache.get(("project", "dataset")) is None
+    assert cache.get(("project", "dataset", "table")) is None
+    assert cache.get(("project", "other", "table")) is True
+
+
+def test_metadata_cache_disabled_with_zero_ttl():
+    cache = MetadataCache(ttl_seconds=0)
+    cache.set(("project", "dataset"))
+    assert cache.get(("project", "dataset")) is None
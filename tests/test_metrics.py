@@ -0,0 +1,83 @@
+import contextvars
+import threading
+
+import pytest
+
+from src.core.metrics import Metrics
+
+
+def test_metrics_aggregates_stage_runs():
+    metrics = Metrics()
+
+    for rows in (10, 30):
+        with metrics.stage("transform", rows=rows, bytes_in=100) as run:
+            sum(range(10_000))
+            run.bytes_out = 50
+
+    stats = metrics.summary()["stages"]["transform"]
+    assert stats["calls"] == 2
+    assert stats["rows"] == 40
+    assert (stats["bytes_in"], stats["bytes_out"]) == (200, 100)
+    assert stats["wall_s"] >= stats["cpu_s"] >= 0
+    assert stats["rows_per_s"] > 0
+
+
+def test_metrics_records_failed_stages_and_resets():
+    metrics = Metrics()
+
+    with pytest.raises(ValueError):
+        with metrics.stage("load"):
+            raise ValueError("boom")
+    assert metrics.summary()["stages"]["load"]["calls"] == 1
+
+    metrics.reset()
+    assert metrics.summary()["stages"] == {}
+
+
+def test_metrics_summary_since_snapshot_keeps_other_runs():
+    metrics = Metrics()
+    with metrics.stage("load", rows=5):
+        pass
+
+    before = metrics.snapshot()
+    with metrics.stage("transform", rows=3):
+        pass
+    with metrics.stage("load", rows=2):
+        pass
+
+    since = metrics.summary(since=before)["stages"]
+    assert (since["load"]["calls"], since["load"]["rows"]) == (1, 2)
+    assert since["transform"]["rows"] == 3
+    # the earlier run's totals are still there
+    assert metrics.summary()["stages"]["load"]["rows"] == 7
+
+
+def test_metrics_scope_keeps_concurrent_runs_apart():
+    metrics = Metrics()
+    summaries = {}
+    barrier = threading.Barrier(2)
+
+    def run(name, rows):
+        with metrics.scope() as scoped:
+            barrier.wait()
+            # a stage thread started with the run's context records into its scope
+            worker = threading.Thread(target=contextvars.copy_context().run, args=(record, name, rows))
+            worker.start()
+            worker.join()
+            barrier.wait()
+        summaries[name] = scoped.summary()["stages"]
+
+    def record(name, rows):
+        with metrics.stage(name, rows=rows):
+            pass
+
+    threads = [threading.Thread(target=run, args=(name, rows)) for name, rows in (("a", 3), ("b", 5))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert list(summaries["a"]) == ["a"] and summaries["a"]["a"]["rows"] == 3
+    assert list(summaries["b"]) == ["b"] and summaries["b"]["b"]["rows"] == 5
+    # the collector itself still has both
+    assert set(metrics.summary()["stages"]) == {"a", "b"}
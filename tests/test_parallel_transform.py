@@ -0,0 +1,79 @@
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.core.metrics import metrics
+from src.etl.parallel_transform import ParallelTransformer, _init_worker, available_cpus
+from src.etl.transformer import Transformer, config_transformer
+from src.models.schema_definition import IBGE_STATE_SCHEMA
+
+
+def _records(n):
+    return [{"id": i, "Nome Estado": f"UF {i}", "regiao": {"id": i % 5, "nome": "Norte"}} for i in range(n)]
+
+
+def test_available_cpus_respects_cgroup_quota():
+    with patch("src.etl.parallel_transform.os.sched_getaffinity", return_value=set(range(8))):
+        with patch("src.etl.parallel_transform._cgroup_cpu_quota", return_value=2.5):
+            assert available_cpus() == 2
+        with patch("src.etl.parallel_transform._cgroup_cpu_quota", return_value=None):
+            assert available_cpus() == 8
+
+
+def test_parallel_transform_matches_inline_and_keeps_order():
+    records = _records(25)
+    for output_format in ("pandas", "arrow"):
+        inline = Transformer(output_format=output_format)
+        parallel = ParallelTransformer(Transformer(output_format=output_format), workers=2, min_shard_rows=5)
+        try:
+            assert parallel._shards(records)[0] == records[:13]
+            result = parallel.run(records)
+        finally:
+            parallel.close()
+        expected = inline.run(records)
+        if output_format == "arrow":
+            assert result.equals(expected)
+        else:
+            pd.testing.assert_frame_equal(result, expected)
+            assert list(result.columns) == ["id", "nome_estado", "regiao"]
+
+
+def test_parallel_transform_keeps_schema_struct_columns():
+    records = [{"id": i, "nome": f"UF {i}", "sigla": "UF", "regiao": {"id": i % 5, "nome": "Norte", "sigla": "N"}}
+               for i in range(25)]
+    records[3]["regiao"] = None
+    parallel = ParallelTransformer(Transformer(schema=IBGE_STATE_SCHEMA), workers=2, min_shard_rows=5)
+    try:
+        result = parallel.run(records)
+    finally:
+        parallel.close()
+
+    # the struct column comes back Arrow-backed, the rest with the inline dtypes
+    pd.testing.assert_frame_equal(result, Transformer(schema=IBGE_STATE_SCHEMA).run(records))
+
+
+def test_parallel_transform_runs_small_batches_inline():
+    parallel = ParallelTransformer(Transformer(), workers=4, min_shard_rows=100)
+    assert len(parallel.run(_records(150))) == 150
+    assert parallel._pool is None
+
+
+def test_parallel_transform_reports_worker_cpu_time():
+    transformer = Transformer()
+    _init_worker(transformer)
+
+    class InProcessPool:
+        # stands in for the spawned pool; each shard reports 5s of worker CPU
+        def map(self, func, shards):
+            return [(func(shard)[0], 5.0) for shard in shards]
+
+    parallel = ParallelTransformer(transformer, workers=2, min_shard_rows=500)
+    before = metrics.snapshot()
+    with patch.object(ParallelTransformer, "_executor", return_value=InProcessPool()):
+        assert len(parallel.run(_records(1000))) == 1000
+
+    assert metrics.summary(since=before)["stages"]["transform"]["cpu_s"] >= 10.0
+
+
+def test_config_transformer_is_inline_by_default():
+    assert isinstance(config_transformer(), Transformer)
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+from src.etl.pipeline import Pipeline
+from src.etl.transformer import Transformer
+from src.core.exceptions import LoadError
+from src.models.schema_definition import IBGE_STATE_SCHEMA
+from src.models.schema_validator import SchemaValidator
+
+
+def test_pipeline_loads_batches_in_order():
+    loader = MagicMock()
+    loader.load.side_effect = lambda **kwargs: {"status": "success", "job_id": f"job-{len(kwargs['df'])}"}
+
+    pipeline = Pipeline(Transformer(), loader, queue_size=1)
+    batches = iter([[{"id": 1}, {"id": 2}], [{"id": 3}]])
+
+    result = pipeline.run(batches, dataset_id="dataset", table_id="table",
+                          write_disposition="WRITE_TRUNCATE", create_table=True)
+
+    assert result["batches"] == 2
+    assert result["records"] == 3
+    assert result["job_ids"] == ["job-2", "job-1"]
+    assert result["metrics"]["stages"]["transform"]["rows"] == 3
+
+    first, second = [call.kwargs for call in loader.load.call_args_list]
+    assert first["df"]["id"].tolist() == [1, 2]
+    assert first["write_disposition"] == "WRITE_TRUNCATE" and first["create_table"]
+    assert second["write_disposition"] == "WRITE_APPEND" and not second["create_table"]
+
+
+def test_pipeline_propagates_stage_error():
+    loader = MagicMock()
+    loader.load.side_effect = LoadError("falhou")
+
+    def endless():
+        while True:
+            yield [{"id": 1}]
+
+    pipeline = Pipeline(Transformer(), loader)
+
+    with pytest.raises(LoadError):
+        pipeline.run(endless(), dataset_id="dataset", table_id="table")
+
+    assert loader.load.call_count == 1
+
+
+def test_pipeline_routes_invalid_rows_to_dead_letter():
+    loader = MagicMock()
+    loader.load.return_value = {"status": "success"}
+    dead_letter = MagicMock()
+
+    pipeline = Pipeline(Transformer(), loader, validator=SchemaValidator(IBGE_STATE_SCHEMA), dead_letter=dead_letter)
+    batches = iter([[{"id": 1, "nome": "A"}, {"nome": "sem id"}], [{"id": None, "nome": "B"}]])
+
+    result = pipeline.run(batches, dataset_id="dataset", table_id="table")
+
+    assert result["records"] == 1
+    assert result["rejected"] == 2
+    assert loader.load.call_count == 1
+    assert dead_letter.write.call_count == 2
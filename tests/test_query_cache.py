@@ -0,0 +1,69 @@
+import pytest
+
+from src.services.query_cache import (
+    QueryCache,
+    has_unqualified_tables,
+    is_cacheable,
+    normalize_sql,
+    referenced_tables,
+)
+
+
+def test_normalize_sql_ignores_formatting_but_not_literals():
+    a = "SELECT id,  nome\n  FROM `p.d.t` -- estados\nWHERE nome = 'São  Paulo'"
+    b = "select id, nome FROM `p.d.t` WHERE nome = 'São  Paulo'"
+    assert normalize_sql(a) == "SELECT id, nome FROM `p.d.t` WHERE nome = 'São  Paulo'"
+    assert QueryCache.key(a, {}, {}) == QueryCache.key(
+        "SELECT id, nome FROM `p.d.t`\n\tWHERE nome = 'São  Paulo' /* estados */", {}, {}
+    )
+    assert QueryCache.key(a, {}, {}) != QueryCache.key(b, {}, {})
+    assert QueryCache.key(a, {}, {"p.d.t": 1}) != QueryCache.key(a, {}, {"p.d.t": 2})
+
+
+def test_referenced_tables_and_cacheability():
+    sql = "WITH x AS (SELECT * FROM d.t1) SELECT * FROM x JOIN `other.d.t2$20240101` USING (id)"
+    assert referenced_tables(sql, "p") == {"p.d.t1", "other.d.t2"}
+    assert is_cacheable(sql)
+    assert not has_unqualified_tables(sql)
+    assert has_unqualified_tables("SELECT COUNT(*) FROM t")
+    assert has_unqualified_tables("SELECT * FROM d.a JOIN `b` USING (id)")
+    assert not has_unqualified_tables("SELECT * FROM d.t, UNNEST(t.tags) AS tag")
+    assert not is_cacheable("SELECT CURRENT_TIMESTAMP() FROM d.t")
+    assert not is_cacheable("MERGE `p.d.t` T USING (SELECT 1) S ON FALSE WHEN NOT MATCHED THEN INSERT ROW")
+
+
+def test_query_cache_expires_and_invalidates_by_table():
+    now = [0.0]
+    cache = QueryCache(ttl_seconds=10, clock=lambda: now[0])
+    cache.put("a", [{"id": 1}], ["p.d.t1"])
+    cache.put("b", [{"id": 2}], ["p.d.t2"])
+
+    rows = cache.get("a")
+    rows[0]["id"] = 99
+    assert cache.get("a") == [{"id": 1}]
+
+    assert cache.invalidate_table("p.d.t1") == 1
+    assert cache.get("b") == [{"id": 2}]
+    now[0] = 11
+    for key in ("a", "b"):
+        with pytest.raises(KeyError):
+            cache.get(key)
+
+
+def test_query_cache_disk_tier_survives_restart_and_evicts_lru(tmp_path):
+    rows = [{"id": i, "nome": "x" * 50} for i in range(10)]
+    cache = QueryCache(str(tmp_path), memory_bytes=0)
+    cache.put("a", rows, ["p.d.t"])
+    size = (tmp_path / "a.rows").stat().st_size
+
+    reopened = QueryCache(str(tmp_path), memory_bytes=0, disk_bytes=2 * size)
+    assert reopened.get("a") == rows
+    reopened.put("b", rows, ["p.d.t"])
+    reopened.get("a")
+    reopened.put("c", rows, ["p.d.u"])
+
+    assert not (tmp_path / "b.rows").exists()
+    assert reopened.get("a") == rows
+
+    reopened.invalidate_table("p.d.t")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["c.meta", "c.rows"]
@@ -0,0 +1,54 @@
+from src.services.rate_limit import AdaptiveConcurrency, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2:] == [0.5, 0.5]
+    assert clock.now == 1.0
+
+
+def test_token_bucket_pause_holds_callers():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=5, clock=clock, sleep=clock.sleep)
+
+    bucket.pause(3)
+    bucket.acquire()
+
+    assert clock.now >= 3
+
+
+def test_adaptive_concurrency_aimd():
+    limiter = AdaptiveConcurrency(initial=4, max_limit=8, latency_target=0.5)
+
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(latency=0.1)
+    assert limiter.limit == 5
+
+    limiter.acquire()
+    limiter.release(latency=0.1, throttled=True)
+    assert limiter.limit == 2
+
+    limiter.acquire()
+    limiter.release(latency=2.0)
+    assert limiter.limit == 1
+
+    limiter.acquire()
+    limiter.release(latency=0.1, succeeded=False)
+    assert limiter.limit == 1
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from src.core.exceptions import ConfigError
+from src.etl.scheduler import DAGScheduler, check_dag
+
+
+class Job:
+    def __init__(self, name, depends_on=(), fail=False):
+        self.name = name
+        self.depends_on = list(depends_on)
+        self.fail = fail
+
+
+def _square(job):
+    # module level, so process workers can unpickle it
+    return int(job.name) ** 2
+
+
+def test_check_dag_orders_jobs_and_rejects_bad_graphs():
+    jobs = [Job("estados", ["regioes"]), Job("municipios", ["estados"]), Job("regioes")]
+    assert check_dag(jobs) == ["regioes", "estados", "municipios"]
+
+    with pytest.raises(ConfigError):
+        check_dag([Job("a", ["b"]), Job("b", ["a"])])
+    with pytest.raises(ConfigError):
+        check_dag([Job("a", ["x"])])
+    with pytest.raises(ConfigError):
+        check_dag([Job("a"), Job("a")])
+
+
+def test_scheduler_runs_independent_jobs_in_parallel_after_dependencies():
+    barrier = threading.Barrier(2, timeout=5)
+    order = []
+
+    def run(job):
+        if job.name in ("a", "b"):
+            barrier.wait()  # deadlocks unless a and b run at the same time
+        order.append(job.name)
+        return job.name.upper()
+
+    outcomes = DAGScheduler(max_workers=2).run([Job("c", ["a", "b"]), Job("a"), Job("b")], run)
+
+    assert order[-1] == "c"
+    assert {name: o["result"] for name, o in outcomes.items()} == {"a": "A", "b": "B", "c": "C"}
+    assert outcomes["c"]["started_s"] >= max(outcomes["a"]["started_s"], outcomes["b"]["started_s"])
+
+
+def test_scheduler_skips_dependents_of_failed_jobs():
+    def run(job):
+        if job.fail:
+            raise RuntimeError("boom")
+        time.sleep(0.01)
+        return "ok"
+
+    jobs = [Job("a", fail=True), Job("b", ["a"]), Job("c", ["b"]), Job("d")]
+    outcomes = DAGScheduler(max_workers=2).run(jobs, run)
+
+    assert outcomes["a"] == {"status": "error", "error": "boom"}
+    assert outcomes["b"]["status"] == outcomes["c"]["status"] == "skipped"
+    assert outcomes["d"]["status"] == "success"
+
+
+def test_scheduler_process_executor():
+    outcomes = DAGScheduler(max_workers=2, executor="process").run([Job("3"), Job("4", ["3"])], _square)
+    assert outcomes["3"]["result"] == 9
+    assert outcomes["4"]["result"] == 16
@@ -0,0 +1,37 @@
+import json
+
+from src.models.schema_definition import IBGE_STATE_SCHEMA
+from src.models.schema_validator import SchemaValidator
+from src.services.dead_letter_service import DeadLetterService
+
+
+def test_validator_splits_valid_and_invalid_rows():
+    validator = SchemaValidator(IBGE_STATE_SCHEMA)
+    records = [
+        {"id": 11, "nome": "Rondônia", "sigla": "RO", "regiao": {"id": 1, "nome": "Norte", "sigla": "N"}},
+        {"id": "12", "nome": "Acre"},
+        {"nome": "Sem id"},
+        {"id": 13, "nome": "Amazonas", "regiao": {"id": "um"}},
+        {"id": 14, "nome": {"nested": True}, "regiao": "Norte"},
+    ]
+
+    valid, rejected = validator.validate_batch(records)
+
+    assert [r.get("id") for r in valid] == [11, "12"]
+    assert [r["errors"] for r in rejected] == [
+        ["id: campo obrigatório ausente"],
+        ["regiao.id: esperado INT64, recebido str"],
+        ["nome: esperado STRING, recebido dict", "regiao: esperado objeto, recebido str"],
+    ]
+
+
+def test_dead_letter_service_appends_ndjson(tmp_path):
+    path = tmp_path / "dead" / "letters.ndjson"
+    service = DeadLetterService(str(path), source="https://fake.com")
+
+    service.write([{"record": {"nome": "Sem id"}, "errors": ["id: campo obrigatório ausente"]}])
+    service.write([{"record": {"id": "x"}, "errors": ["nome: campo obrigatório ausente"]}])
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["record"] for line in lines] == [{"nome": "Sem id"}, {"id": "x"}]
+    assert lines[0]["source"] == "https://fake.com"
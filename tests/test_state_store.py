@@ -0,0 +1,67 @@
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.exceptions import ConfigError
+from src.services.state_store import BigQueryStateStore, FileStateStore, SQLiteStateStore, create_state_store
+
+
+@pytest.mark.parametrize("store_cls, name", [(FileStateStore, "state.json"), (SQLiteStateStore, "state.db")])
+def test_state_store_round_trip(tmp_path, store_cls, name):
+    store = store_cls(str(tmp_path / name))
+    assert store.get("source") is None
+
+    store.set("source", {"value": "2024-01-01T00:00:00"})
+    store.set("other", {"value": 7})
+    store.set("source", {"value": "2024-02-01T00:00:00"})
+
+    reopened = store_cls(str(tmp_path / name))
+    assert reopened.get("source") == {"value": "2024-02-01T00:00:00"}
+    assert reopened.get("other") == {"value": 7}
+
+
+
+def test_file_state_stores_on_one_path_keep_each_others_keys(tmp_path):
+    path = str(tmp_path / "state.json")
+    errors = []
+
+    def writer(name):
+        store = FileStateStore(path)
+        try:
+            for i in range(50):
+                store.set(name, {"value": i})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(f"job{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    store = FileStateStore(path)
+    assert [store.get(f"job{n}") for n in range(4)] == [{"value": 49}] * 4
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+
+
+def test_bigquery_state_store_uses_parameterized_queries():
+    bq = MagicMock(project_id="project")
+    bq.run_query.return_value = [{"state": json.dumps({"value": 3})}]
+    store = BigQueryStateStore(bq, "dataset")
+
+    assert store.get("source") == {"value": 3}
+    store.set("source", {"value": 4})
+
+    bq.create_table_if_not_exists.assert_called_once()
+    merge_sql = bq.run_query.call_args.args[0]
+    assert merge_sql.startswith("MERGE `project.dataset.etl_state`")
+    params = {p.name: p.value for p in bq.run_query.call_args.kwargs["job_config"].query_parameters}
+    assert params == {"key": "source", "state": '{"value": 4}'}
+
+
+def test_create_state_store_rejects_unknown_backend(tmp_path):
+    with pytest.raises(ConfigError):
+        create_state_store("redis", str(tmp_path / "state"))
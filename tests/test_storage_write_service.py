@@ -0,0 +1,84 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+from unittest.mock import patch
+
+from src.services.storage_write_service import (
+    FakeWriteBackend,
+    OffsetOutOfRange,
+    StorageWriteService,
+    WriteBackend,
+)
+from src.etl.loader import Loader
+
+
+def test_committed_stream_appends_all_batches():
+    backend = FakeWriteBackend()
+    service = StorageWriteService("project", backend=backend, max_batch_rows=2)
+
+    result = service.append_rows(pa.table({"id": [1, 2, 3]}), "dataset", "table")
+
+    assert result["rows"] == 3
+    assert backend.read_rows(service.table_path("dataset", "table")) == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
+def test_pending_stream_rows_are_invisible_until_commit():
+    backend = FakeWriteBackend()
+    path = "projects/p/datasets/d/tables/t"
+    stream = backend.create_stream(path, "PENDING")
+
+    backend.append(stream, pa.record_batch({"id": [1]}), offset=0)
+    assert backend.read_rows(path) == []
+
+    backend.finalize(stream)
+    backend.commit(path, [stream])
+    assert backend.read_rows(path) == [{"id": 1}]
+
+
+def test_retried_append_is_written_exactly_once():
+    backend = FakeWriteBackend()
+    service = StorageWriteService("project", backend=backend, backoff_factor=0)
+    original_append = backend.append
+    calls = []
+
+    def flaky_append(stream_name, batch, offset):
+        calls.append(offset)
+        original_append(stream_name, batch, offset)
+        if len(calls) == 1:
+            raise ConnectionError("ack lost")
+
+    backend.append = flaky_append
+
+    service.append_rows(pd.DataFrame({"id": [1, 2]}), "dataset", "table")
+
+    assert calls == [0, 0]
+    assert backend.read_rows(service.table_path("dataset", "table")) == [{"id": 1}, {"id": 2}]
+
+
+def test_out_of_range_offset_is_rejected():
+    backend = FakeWriteBackend()
+    stream = backend.create_stream("projects/p/datasets/d/tables/t", "COMMITTED")
+
+    with pytest.raises(OffsetOutOfRange):
+        backend.append(stream, pa.record_batch({"id": [1]}), offset=5)
+
+
+@patch("google.cloud.bigquery.Client")
+def test_loader_stream_mode_uses_storage_write(mock_client):
+    backend = FakeWriteBackend()
+    loader = Loader(project_id="project", mode="stream", write_backend=backend)
+
+    result = loader.load(df=pd.DataFrame({"id": [7]}), dataset_id="dataset", table_id="table", create_dataset=False)
+
+    assert result["status"] == "success"
+    assert backend.read_rows("projects/project/datasets/dataset/tables/table") == [{"id": 7}]
+    assert not mock_client.return_value.load_table_from_dataframe.called
+
+
+def test_write_backend_requires_every_operation():
+    class AppendOnly(WriteBackend):
+        def append(self, stream_name, batch, offset):
+            pass
+
+    with pytest.raises(TypeError):
+        AppendOnly()
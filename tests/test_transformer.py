@@ -1,5 +1,12 @@
 import pandas as pd
-from src.etl.transformer import Transformer
+import pyarrow as pa
+import pytest
+from unittest.mock import patch
+from src.etl.transformer import Transformer, config_transformer
+from src.core.exceptions import TransformError
+from src.models.schema_definition import IBGE_STATE_SCHEMA
+from src.utils.serializers import serialize_region
+from src.utils.validators import validate_int, validate_string
 
 
 def test_transformer_to_dataframe():
@@ -20,3 +27,100 @@ def test_clean_columns():
 
     assert "nome_completo" in df2.columns
     assert "id_estado" in df2.columns
+
+
+def test_transformer_arrow_builds_struct_columns():
+    raw = [
+        {"id": 11, "nome": "Rondônia", "sigla": "RO", "regiao": {"id": 1, "nome": "Norte", "sigla": "N"}},
+        {"id": 12, "nome": "Acre", "extra": "ignored"},
+    ]
+    transformer = Transformer(output_format="arrow", schema=IBGE_STATE_SCHEMA)
+
+    table = transformer.run(raw)
+
+    assert isinstance(table, pa.Table)
+    assert table.column_names == ["id", "nome", "sigla", "regiao"]
+    assert pa.types.is_struct(table.schema.field("regiao").type)
+    assert table.column("regiao").to_pylist()[0] == {"id": 1, "nome": "Norte", "sigla": "N"}
+
+
+def test_transformer_arrow_rejects_missing_required_field():
+    transformer = Transformer(output_format="arrow", schema=IBGE_STATE_SCHEMA)
+
+    with pytest.raises(TransformError):
+        transformer.run([{"nome": "Sem id"}])
+
+
+def test_normalize_matches_scalar_helpers():
+    raw = [
+        {"id": "11", "nome": " Rondônia ", "sigla": "RO", "regiao": {"id": "1", "nome": " Norte ", "sigla": "N"}},
+        {"id": 12.9, "nome": "Acre", "sigla": None, "regiao": {}},
+        {"id": "x", "nome": 13, "regiao": None},
+    ]
+    transformer = Transformer(schema=IBGE_STATE_SCHEMA)
+
+    df = transformer.run(raw)
+
+    assert df["id"].tolist() == [validate_int(r["id"]) if validate_int(r["id"]) is not None else pd.NA for r in raw]
+    assert df["nome"].tolist() == [validate_string(r["nome"]) for r in raw]
+    assert pa.array(df["regiao"]).to_pylist() == [serialize_region(r["regiao"]) for r in raw]
+
+
+def test_normalize_flattens_structs():
+    raw = [{"id": 1, "nome": "A", "regiao": {"id": "2", "nome": "Sul"}}, {"id": 2, "nome": "B"}]
+    transformer = Transformer(schema=IBGE_STATE_SCHEMA, flatten_structs=True)
+
+    df = transformer.run(raw)
+
+    assert "regiao" not in df.columns
+    assert df["regiao_id"].tolist() == [2, pd.NA]
+    assert df["regiao_nome"].tolist() == ["Sul", pd.NA]
+
+
+def _arrow_types(table: pa.Table) -> dict:
+    # pandas strings convert to large_string; both load as BigQuery STRING
+    return {field.name: str(field.type).replace("large_string", "string") for field in table.schema}
+
+
+def test_pandas_and_arrow_outputs_match():
+    raw = [
+        {"ID": 11, "Nome": "Rondônia", "sigla": "RO", "regiao": {"id": 1, "nome": "Norte", "sigla": "N"}},
+        {"ID": 12, "Nome": "Acre", "sigla": None, "regiao": None},
+    ]
+
+    df = Transformer(schema=IBGE_STATE_SCHEMA).run(raw)
+    table = Transformer(output_format="arrow", schema=IBGE_STATE_SCHEMA).run(raw)
+
+    converted = pa.Table.from_pandas(df, preserve_index=False)
+    assert converted.column_names == table.column_names == ["id", "nome", "sigla", "regiao"]
+    assert _arrow_types(converted) == _arrow_types(table)
+    assert converted.to_pylist() == table.to_pylist()
+
+
+def test_config_transformer_uses_the_table_schema():
+    with patch("src.core.config.Config.TRANSFORM_WORKERS", 1):
+        transformer = config_transformer("arrow")
+
+    assert transformer.schema == IBGE_STATE_SCHEMA
+    with pytest.raises(TransformError):
+        transformer.run([{"id": None, "nome": "Sem id"}])
+
+
+def test_normalize_matches_scalar_helpers_with_nulls():
+    # a missing value makes pandas store both ints and floats as float64; strings must still match validate_string
+    raw = [
+        {"id": 11, "nome": 11, "sigla": 2.0, "regiao": {"id": 1, "sigla": 7}},
+        {"id": None, "nome": None, "sigla": None, "regiao": {"id": 2, "sigla": None}},
+        {"id": 13, "nome": 13, "sigla": 3.5, "regiao": {"id": 3, "sigla": 2.5}},
+    ]
+    transformer = Transformer(schema=IBGE_STATE_SCHEMA)
+
+    df = transformer.run(raw)
+
+    def scalar(validator, values):
+        return [pd.NA if validator(v) is None else validator(v) for v in values]
+
+    assert df["id"].tolist() == scalar(validate_int, [r["id"] for r in raw])
+    assert df["nome"].tolist() == scalar(validate_string, [r["nome"] for r in raw]) == ["11", pd.NA, "13"]
+    assert df["sigla"].tolist() == scalar(validate_string, [r["sigla"] for r in raw]) == ["2.0", pd.NA, "3.5"]
+    assert [r["sigla"] for r in pa.array(df["regiao"]).to_pylist()] == ["7", None, "2.5"]